@@ -0,0 +1,139 @@
+"""
+Asset cache - Bewaart procedureel gegenereerde surfaces op schijf
+Een volgende start laadt de ruwe pixels via mmap in plaats van alles
+opnieuw te tekenen. De sleutel bevat een hash van het bronbestand van de
+generator, dus een wijziging in textures.py of sprites.py maakt de oude
+bestanden automatisch ongeldig.
+"""
+import os
+import mmap
+import shutil
+import struct
+import hashlib
+import inspect
+import threading
+import pygame
+from settings import *
+
+# Header van een cache bestand: magic, versie, breedte, hoogte, pixel formaat
+HEADER = struct.Struct('<4sHHH4s')
+MAGIC = b'DMAC'
+VERSION = 1
+
+
+class AssetCache:
+    """Content-addressed opslag van surfaces: <module>-<bron hash>/<parameter hash>.surf"""
+
+    def __init__(self, directory=ASSET_CACHE_DIR, enabled=ASSET_CACHE_ENABLED):
+        self.directory = directory
+        self.enabled = enabled
+        self.module_dirs = {}  # bronbestand -> cache map voor die generator module
+        self.lock = threading.Lock()  # Thema's kunnen in een worker thread gebouwd worden
+        self.hits = 0
+        self.misses = 0
+
+    def get_surface(self, builder, *args):
+        """
+        Haal de surface van builder(*args) uit de cache of bouw en bewaar hem
+        builder moet deterministisch zijn (zelfde argumenten = zelfde pixels)
+        """
+        if not self.enabled:
+            return builder(*args)
+
+        path = self._asset_path(builder, args)
+        if path:
+            surface = self._load(path)
+            if surface is not None:
+                self.hits += 1
+                return surface
+
+        self.misses += 1
+        surface = builder(*args)
+        if path:
+            self._store(path, surface)
+        return surface
+
+    def _asset_path(self, builder, args):
+        """Bestandsnaam voor een builder aanroep (None als de cache map niet bruikbaar is)"""
+        module_dir = self._module_dir(inspect.getsourcefile(builder))
+        if module_dir is None:
+            return None
+
+        params = repr((builder.__qualname__, args, pygame.version.ver)).encode()
+        return os.path.join(module_dir, hashlib.sha1(params).hexdigest() + '.surf')
+
+    def _module_dir(self, source_file):
+        """Cache map voor een generator module, oude versies worden opgeruimd"""
+        with self.lock:
+            return self._find_module_dir(source_file)
+
+    def _find_module_dir(self, source_file):
+        if source_file in self.module_dirs:
+            return self.module_dirs[source_file]
+
+        module_dir = None
+        try:
+            with open(source_file, 'rb') as f:
+                source_hash = hashlib.sha1(f.read()).hexdigest()[:16]
+            prefix = os.path.splitext(os.path.basename(source_file))[0] + '-'
+            module_dir = os.path.join(self.directory, prefix + source_hash)
+
+            if not os.path.isdir(module_dir):
+                # Bron is veranderd: bestanden van vorige versies weggooien
+                if os.path.isdir(self.directory):
+                    for name in os.listdir(self.directory):
+                        if name.startswith(prefix):
+                            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+                os.makedirs(module_dir, exist_ok=True)
+        except OSError as e:
+            print(f"Asset cache uitgeschakeld voor {source_file}: {e}")
+            module_dir = None
+
+        self.module_dirs[source_file] = module_dir
+        return module_dir
+
+    def _load(self, path):
+        """Laad een surface via mmap, None als het bestand ontbreekt of ongeldig is"""
+        try:
+            with open(path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)  # Schrijven raakt het bestand niet
+        except (OSError, ValueError):
+            return None
+
+        if len(data) < HEADER.size:
+            return None
+        magic, version, width, height, pixel_format = HEADER.unpack_from(data)
+        pixel_format = pixel_format.rstrip(b'\0').decode('ascii', 'replace')
+        if magic != MAGIC or version != VERSION or pixel_format not in ('RGB', 'RGBA'):
+            return None
+        if len(data) != HEADER.size + width * height * len(pixel_format):
+            return None
+
+        # frombuffer leest direct uit de gemapte pagina's (surface houdt de mmap vast);
+        # convert() / convert_alpha() bij de aanroeper maakt er een eigen kopie van
+        pixels = memoryview(data)[HEADER.size:]
+        return pygame.image.frombuffer(pixels, (width, height), pixel_format)
+
+    def _store(self, path, surface):
+        """Schrijf een surface als header + ruwe pixels (atomisch via rename)"""
+        pixel_format = 'RGBA' if surface.get_flags() & pygame.SRCALPHA else 'RGB'
+        width, height = surface.get_size()
+        header = HEADER.pack(MAGIC, VERSION, width, height, pixel_format.encode().ljust(4, b'\0'))
+
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(header)
+                f.write(pygame.image.tobytes(surface, pixel_format))
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Kon asset niet cachen ({path}): {e}")
+
+
+# Gedeelde cache voor texturen en sprites
+asset_cache = AssetCache()
+
+
+def cached_surface(builder, *args):
+    """Korte vorm van asset_cache.get_surface"""
+    return asset_cache.get_surface(builder, *args)
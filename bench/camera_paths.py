@@ -0,0 +1,169 @@
+"""
+Camera paden voor de benchmark - Vaste routes per level, afgeleid van de map
+Per level drie soorten paden: een rondje in de opste hal, een route door
+de dichtstbijzijnde deuren, en een baan rond de boss. Dezelfde level data
+geeft altijd dezelfde poses, zodat resultaten tussen commits vergelijkbaar
+zijn.
+"""
+import math
+from collections import deque
+from map import TILE_DOOR
+
+STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+def _walkable(tile_map, x, y):
+    """Vloer of deur (deuren op het pad worden opengezet)"""
+    value = tile_map.value(x, y)
+    return value == 0 or bool(tile_map.flags_at(x, y) & TILE_DOOR)
+
+
+def open_distance(tile_map):
+    """Per vloer tile het aantal stappen tot de dichtstbijzijnde muur of deur"""
+    distance = {}
+    queue = deque()
+    for y in range(tile_map.height):
+        for x in range(tile_map.width):
+            if tile_map.value(x, y) != 0:
+                distance[(x, y)] = 0
+                queue.append((x, y))
+    while queue:
+        x, y = queue.popleft()
+        for step_x, step_y in STEPS:
+            neighbour = (x + step_x, y + step_y)
+            if neighbour in distance:
+                continue
+            if 0 <= neighbour[0] < tile_map.width and 0 <= neighbour[1] < tile_map.height:
+                distance[neighbour] = distance[(x, y)] + 1
+                queue.append(neighbour)
+    return distance
+
+
+def tile_path(tile_map, start, goal):
+    """Kortste pad van tiles (BFS, deuren passeerbaar), of [] als er geen is"""
+    previous = {start: None}
+    queue = deque([start])
+    while queue:
+        tile = queue.popleft()
+        if tile == goal:
+            break
+        for step_x, step_y in STEPS:
+            neighbour = (tile[0] + step_x, tile[1] + step_y)
+            if neighbour not in previous and _walkable(tile_map, *neighbour):
+                previous[neighbour] = tile
+                queue.append(neighbour)
+    if goal not in previous:
+        return []
+    path = []
+    tile = goal
+    while tile is not None:
+        path.append(tile)
+        tile = previous[tile]
+    return path[::-1]
+
+
+def poses_along(tiles, frames):
+    """frames poses (x, y, hoek) gelijkmatig over een pad door tile middens"""
+    points = [(x + 0.5, y + 0.5) for x, y in tiles]
+    if len(points) < 2:
+        return [(points[0][0], points[0][1], 0.0)] * frames if points else []
+
+    lengths = [math.dist(a, b) for a, b in zip(points, points[1:])]
+    total = sum(lengths)
+    poses = []
+    segment = 0
+    walked = 0.0
+    for frame in range(frames):
+        target = total * frame / max(1, frames - 1)
+        while segment < len(lengths) - 1 and walked + lengths[segment] < target:
+            walked += lengths[segment]
+            segment += 1
+        (x0, y0), (x1, y1) = points[segment], points[segment + 1]
+        t = (target - walked) / lengths[segment] if lengths[segment] else 0.0
+        t = min(1.0, max(0.0, t))
+        poses.append((x0 + (x1 - x0) * t, y0 + (y1 - y0) * t, math.atan2(y1 - y0, x1 - x0)))
+    return poses
+
+
+def hall_path(tile_map, frames):
+    """Volledige draai op een kleine cirkel in het midden van de opste ruimte"""
+    distance = open_distance(tile_map)
+    floor = (tile_map.values == 0)
+
+    def openness(item):
+        # Diepste tile; bij gelijke diepte die met de meeste vloer in een 7x7 blok eromheen
+        (x, y), depth = item
+        return depth, int(floor[max(0, y - 3):y + 4, max(0, x - 3):x + 4].sum()), -y, -x
+
+    (x, y), depth = max(distance.items(), key=openness)
+    radius = 0.5 if depth > 1 else 0.0
+    poses = []
+    for frame in range(frames):
+        angle = 2 * math.pi * frame / frames
+        poses.append((x + 0.5 + math.cos(angle) * radius, y + 0.5 + math.sin(angle) * radius, angle))
+    return poses
+
+
+def door_path(tile_map, door_manager, start, frames, door_count=3):
+    """Route vanaf de start door de dichtstbijzijnde deuren (die daarvoor opengaan)"""
+    doors = tile_map.tiles_with_flag(TILE_DOOR)
+    if not doors:
+        return []
+
+    tiles = [start]
+    remaining = list(doors)
+    for _ in range(min(door_count, len(doors))):
+        # Dichtstbijzijnde bereikbare deur vanaf het einde van de route
+        best = None
+        for door in remaining:
+            path = tile_path(tile_map, tiles[-1], door)
+            if path and (best is None or len(path) < len(best)):
+                best = path
+        if best is None:
+            break
+        remaining.remove(best[-1])
+        tiles.extend(best[1:])
+
+        # Een tile voorbij de deur, in de looprichting
+        (px, py), (dx, dy) = best[-2] if len(best) > 1 else best[-1], best[-1]
+        beyond = (2 * dx - px, 2 * dy - py)
+        if _walkable(tile_map, *beyond):
+            tiles.append(beyond)
+
+    for x, y in tiles:
+        door = door_manager.get_door(x, y)
+        if door:
+            door.is_open = True
+            door.is_moving = False
+            door.open_amount = 0.9
+            door.close_delay = float('inf')
+    return poses_along(tiles, frames)
+
+
+def boss_path(tile_map, center, frames):
+    """Baan rond de boss, met de camera op de boss gericht"""
+    distance = open_distance(tile_map)
+    depth = distance.get((int(center[0]), int(center[1])), 1)
+    radius = max(1.5, min(4.0, depth - 1.0))
+    poses = []
+    x, y = center
+    for frame in range(frames):
+        angle = 2 * math.pi * frame / frames
+        orbit_x = center[0] + math.cos(angle) * radius
+        orbit_y = center[1] + math.sin(angle) * radius
+        if tile_map.value(orbit_x, orbit_y) == 0:
+            x, y = orbit_x, orbit_y  # Achter een pilaar: op de vorige plek blijven
+        poses.append((x, y, math.atan2(center[1] - y, center[0] - x)))
+    return poses
+
+
+def camera_paths(level_data, tile_map, door_manager, frames):
+    """Alle paden voor een level: {naam: [(x, y, hoek), ...]} (lege paden weggelaten)"""
+    start_x, start_y = level_data.get('player_start', (1.5, 1.5))
+    paths = {
+        'hall': hall_path(tile_map, frames),
+        'doors': door_path(tile_map, door_manager, (int(start_x), int(start_y)), frames),
+    }
+    if level_data.get('boss_position'):
+        paths['boss'] = boss_path(tile_map, level_data['boss_position'], frames)
+    return {name: poses for name, poses in paths.items() if poses}
@@ -0,0 +1,209 @@
+"""
+Render benchmark - Tijd per render stage over vaste camera paden
+Loopt voor elk level uit levels.py de camera paden uit camera_paths.py af
+en meet RayCaster.raycast, RayCaster.render, SpriteRenderer.render,
+EnemyManager.update, draw_minimap en draw_hud los, offscreen (headless).
+Elke resolutie draait in een eigen subprocess, omdat de resolutie bij het
+importeren van settings vastligt. Resultaten (p50/p95/p99 in ms) gaan als
+JSON naar --out, om tussen commits te vergelijken met --compare.
+
+Gebruik:
+    python bench/run_bench.py
+    python bench/run_bench.py --resolutions 720p --levels 1,2 --frames 120
+    python bench/run_bench.py --out na.json --compare voor.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import platform
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESOLUTIONS = {
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    '1440p': (2560, 1440),
+}
+
+# Volgorde van de stages in de output; 'frame' is de hele frame inclusief sprites verzamelen
+STAGES = ('enemy_update', 'raycast', 'walls', 'sprites', 'minimap', 'hud', 'frame')
+PERCENTILES = (50, 95, 99)
+SEED = 1234  # Vaste seed: vijanden spawnen en bewegen elke run hetzelfde
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    stats = {}
+    for percentile in PERCENTILES:
+        # Nearest-rank percentiel
+        index = max(0, math.ceil(percentile / 100 * len(ordered)) - 1)
+        stats[f'p{percentile}'] = round(ordered[index], 4)
+    stats['mean'] = round(sum(ordered) / len(ordered), 4)
+    return stats
+
+
+def run_worker(levels, frames, warmup):
+    """Meet alle levels en paden in dit proces (resolutie staat al in de environment)"""
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from settings import SIM_DT, WIDTH, HEIGHT
+    from main import Game
+    from levels import get_total_levels
+    from camera_paths import camera_paths
+
+    game = Game(seed=SEED, deterministic=True)
+    clock = time.perf_counter
+    results = {}
+    for level in levels or range(1, get_total_levels() + 1):
+        game._load_level(level)
+        player = game.player
+        paths = camera_paths(game.level_data, game.tile_map, game.door_manager, frames + warmup)
+
+        level_results = {}
+        for name, poses in paths.items():
+            samples = {stage: [] for stage in STAGES}
+            for index, (x, y, angle) in enumerate(poses):
+                player.x, player.y, player.angle = x, y, angle
+                game.game_clock.advance(SIM_DT)
+                view_target = game.view_surface or game.screen
+
+                frame_start = clock()
+                game.enemy_manager.update(SIM_DT, player, game.door_manager)
+                t1 = clock()
+                game.raycaster.raycast(player)
+                t2 = clock()
+                game.raycaster.render(view_target)
+                t3 = clock()
+                game.sprite_renderer.clear()
+                game.enemy_manager.render(game.sprite_renderer)
+                game.quest.render_health_packs(game.sprite_renderer)
+                game.quest.render_ammo_packs(game.sprite_renderer)
+                t4 = clock()
+                game.sprite_renderer.render(view_target, player, game.raycaster)
+                t5 = clock()
+                game.draw_minimap()
+                t6 = clock()
+                game.draw_hud()
+                frame_end = clock()
+
+                if index < warmup:
+                    continue
+                samples['enemy_update'].append((t1 - frame_start) * 1000)
+                samples['raycast'].append((t2 - t1) * 1000)
+                samples['walls'].append((t3 - t2) * 1000)
+                samples['sprites'].append((t5 - t4) * 1000)
+                samples['minimap'].append((t6 - t5) * 1000)
+                samples['hud'].append((frame_end - t6) * 1000)
+                samples['frame'].append((frame_end - frame_start) * 1000)
+
+            level_results[name] = {
+                'frames': len(samples['frame']),
+                'stages': {stage: _percentiles(values) for stage, values in samples.items()},
+            }
+        results[f'level_{level}'] = level_results
+    return {'width': WIDTH, 'height': HEIGHT, 'levels': results}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(resolutions, levels, frames, warmup):
+    """Start een worker per resolutie en voeg de resultaten samen"""
+    report = {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'frames': frames,
+        'warmup': warmup,
+        'results': {},
+    }
+    for name in resolutions:
+        width, height = RESOLUTIONS[name]
+        print(f"Benchmarking {name} ({width}x{height})...")
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+            worker_out = f.name
+        env = dict(os.environ, DOOMIE_HEADLESS='1', DOOMIE_RESOLUTION=f'{width}x{height}')
+        command = [sys.executable, os.path.abspath(__file__), '--worker', worker_out,
+                   '--frames', str(frames), '--warmup', str(warmup)]
+        if levels:
+            command += ['--levels', ','.join(str(level) for level in levels)]
+        # De game print veel tijdens het laden; alleen bij een fout tonen
+        process = subprocess.run(command, env=env, cwd=ROOT, capture_output=True, text=True)
+        if process.returncode != 0:
+            print(process.stdout[-2000:], process.stderr[-4000:])
+            raise SystemExit(f"Benchmark worker for {name} failed")
+        with open(worker_out) as f:
+            report['results'][name] = json.load(f)
+        os.unlink(worker_out)
+    return report
+
+
+def print_summary(report, baseline=None):
+    """Tabel met p50/p95/p99 van de hele frame, en het verschil in p95 met een baseline"""
+    for resolution, result in report['results'].items():
+        print(f"\n{resolution} ({result['width']}x{result['height']})")
+        for level, paths in result['levels'].items():
+            for path, data in paths.items():
+                frame = data['stages']['frame']
+                line = (f"  {level:<8} {path:<6} frame p50 {frame['p50']:7.2f}  "
+                        f"p95 {frame['p95']:7.2f}  p99 {frame['p99']:7.2f} ms")
+                if baseline:
+                    try:
+                        before = baseline['results'][resolution]['levels'][level][path]['stages']['frame']['p95']
+                        line += f"  (p95 {100 * (frame['p95'] - before) / before:+.1f}%)"
+                    except (KeyError, ZeroDivisionError):
+                        pass
+                print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DOOMIE render benchmark")
+    parser.add_argument('--resolutions', default=','.join(RESOLUTIONS),
+                        help="Komma gescheiden: " + ', '.join(RESOLUTIONS))
+    parser.add_argument('--levels', help="Komma gescheiden level nummers (standaard alle)")
+    parser.add_argument('--frames', type=int, default=240, help="Gemeten frames per pad")
+    parser.add_argument('--warmup', type=int, default=30, help="Frames per pad die niet meetellen")
+    parser.add_argument('--out', default='bench_results.json', help="JSON output")
+    parser.add_argument('--compare', help="Eerder JSON resultaat om mee te vergelijken")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.levels.split(',')] if args.levels else None
+
+    if args.worker:
+        result = run_worker(levels, args.frames, args.warmup)
+        with open(args.worker, 'w') as f:
+            json.dump(result, f)
+        return 0
+
+    resolutions = [name.strip() for name in args.resolutions.split(',')]
+    unknown = [name for name in resolutions if name not in RESOLUTIONS]
+    if unknown:
+        parser.error(f"unknown resolution(s): {', '.join(unknown)}")
+
+    report = run_suite(resolutions, levels, args.frames, args.warmup)
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_summary(report, baseline)
+    print(f"\nWrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
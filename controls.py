@@ -0,0 +1,133 @@
+"""
+Input bronnen - Toetsen, muis en events per frame, los van pygame
+De game leest elke frame een InputFrame uit een input bron. LiveInput haalt
+die uit pygame (toetsenbord, muis, venster events); ScriptedInput speelt
+een vast script af, zodat een headless simulatie de speler kan besturen
+zonder display.
+"""
+import json
+import pygame
+from settings import *
+
+# Events in een InputFrame
+KEYDOWN = 'keydown'  # Waarde: pygame key code
+MOUSEDOWN = 'mousedown'  # Waarde: muisknop (1 = links)
+QUIT = 'quit'  # Waarde: None
+
+
+class HeldKeys(frozenset):
+    """Set van ingedrukte key codes, te indexeren als pygame.key.get_pressed()"""
+
+    def __getitem__(self, key):
+        return key in self
+
+
+class InputFrame:
+    """Alle input van een frame"""
+
+    def __init__(self, keys=None, mouse_rel=(0, 0), mouse_buttons=(False, False, False), events=None):
+        self.keys = keys if keys is not None else HeldKeys()
+        self.mouse_rel = mouse_rel
+        self.mouse_buttons = mouse_buttons
+        self.events = events if events is not None else []  # Lijst van (soort, waarde)
+
+
+class LiveInput:
+    """Input van toetsenbord en muis via pygame"""
+
+    def poll(self, dt):
+        """Lees de input van deze frame en zet de muis terug in het midden"""
+        events = []
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                events.append((QUIT, None))
+            elif event.type == pygame.KEYDOWN:
+                events.append((KEYDOWN, event.key))
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                events.append((MOUSEDOWN, event.button))
+
+        # Warp muis terug naar centrum voor oneindige rotatie
+        mouse_rel = pygame.mouse.get_rel()
+        pygame.mouse.set_pos(HALF_WIDTH, HALF_HEIGHT)
+
+        return InputFrame(pygame.key.get_pressed(), mouse_rel, pygame.mouse.get_pressed(), events)
+
+    def reset_mouse(self):
+        """Centreer de muis en vergeet de beweging tot nu toe"""
+        pygame.mouse.set_pos(HALF_WIDTH, HALF_HEIGHT)
+        pygame.mouse.get_rel()
+
+
+def _key_code(name):
+    """pygame key code voor een naam als 'w', 'space' of 'UP'"""
+    for candidate in (name, name.lower(), name.upper()):
+        code = getattr(pygame, 'K_' + candidate, None)
+        if code is not None:
+            return code
+    raise ValueError(f"Unknown key in input script: {name}")
+
+
+class ScriptedInput:
+    """
+    Speelt een script van stappen af; elke stap is een dict:
+        ms      - duur van de stap in milliseconden (speltijd)
+        keys    - ingedrukte toetsen, bijv. ['w', 'a']
+        turn    - muis dx per frame (draaien)
+        look    - muis dy per frame (omhoog/omlaag kijken)
+        fire    - linker muisknop ingedrukt
+        press   - toetsen die aan het begin van de stap een keer worden aangeslagen
+    Na de laatste stap blijft de input leeg, tenzij loop aan staat.
+    """
+
+    def __init__(self, steps=None, loop=False):
+        self.steps = [self._parse_step(step) for step in (steps or [])]
+        self.loop = loop
+        self.index = 0
+        self.elapsed = 0  # Tijd in de huidige stap
+        self.started = False  # Zijn de press events van de huidige stap al verstuurd
+
+    @classmethod
+    def from_file(cls, path, loop=False):
+        """Laad een script uit een JSON bestand (lijst van stappen)"""
+        with open(path) as f:
+            return cls(json.load(f), loop)
+
+    @staticmethod
+    def _parse_step(step):
+        return {
+            'ms': step.get('ms', 0),
+            'keys': HeldKeys(_key_code(name) for name in step.get('keys', ())),
+            'turn': step.get('turn', 0),
+            'look': step.get('look', 0),
+            'fire': bool(step.get('fire', False)),
+            'press': [_key_code(name) for name in step.get('press', ())],
+        }
+
+    @property
+    def finished(self):
+        return not self.loop and self.index >= len(self.steps)
+
+    def poll(self, dt):
+        """Input van de huidige stap; schuift door naar de volgende als de stap om is"""
+        if self.loop and self.steps and self.index >= len(self.steps):
+            self.index = 0
+        if self.index >= len(self.steps):
+            return InputFrame()
+
+        step = self.steps[self.index]
+        events = []
+        if not self.started:
+            events = [(KEYDOWN, key) for key in step['press']]
+            self.started = True
+
+        frame = InputFrame(step['keys'], (step['turn'], step['look']), (step['fire'], False, False), events)
+
+        self.elapsed += dt
+        if self.elapsed >= step['ms']:
+            self.elapsed -= step['ms']
+            self.index += 1
+            self.started = False
+        return frame
+
+    def reset_mouse(self):
+        pass
@@ -1,8 +1,9 @@
 """
 Deur systeem - Interactieve deuren met open/sluit animatie
 """
-import pygame
 from settings import *
+from map import TILE_DOOR
+from game_clock import get_ticks
 
 
 class Door:
@@ -27,7 +28,7 @@ class Door:
                 if self.open_amount >= 0.9:
                     self.open_amount = 0.9
                     self.is_moving = False
-                    self.open_time = pygame.time.get_ticks()
+                    self.open_time = get_ticks()
             else:
                 # Deur sluiten
                 self.open_amount -= self.open_speed * dt
@@ -37,7 +38,7 @@ class Door:
                     
         # Auto-close na delay
         elif self.is_open and not self.is_moving:
-            if pygame.time.get_ticks() - self.open_time > self.close_delay:
+            if get_ticks() - self.open_time > self.close_delay:
                 self.close()
                 
     def open(self):
@@ -71,21 +72,23 @@ class Door:
 class DoorManager:
     """Beheert alle deuren in het level"""
     
-    def __init__(self, game_map):
+    def __init__(self, tile_map):
         self.doors = {}
-        self.find_doors(game_map)
+        self.epoch = 0  # Telt op als een deur passeerbaar wordt of dicht gaat (voor zichtlijn memo)
+        self.find_doors(tile_map)
         
-    def find_doors(self, game_map):
-        """Vind alle deuren in de map (waarde 9 = deur)"""
-        for y, row in enumerate(game_map):
-            for x, tile in enumerate(row):
-                if tile == 9:  # Deur tile
-                    self.doors[(x, y)] = Door(x, y)
+    def find_doors(self, tile_map):
+        """Vind alle deuren in de TileMap (waarde 9 = deur)"""
+        for x, y in tile_map.tiles_with_flag(TILE_DOOR):
+            self.doors[(x, y)] = Door(x, y)
                     
     def update(self, dt):
         """Update alle deuren"""
         for door in self.doors.values():
+            was_passable = door.can_pass()
             door.update(dt)
+            if door.can_pass() != was_passable:
+                self.epoch += 1
             
     def get_door(self, x, y):
         """Haal deur op positie"""
@@ -15,9 +15,18 @@ import pygame
 import math
 import random
 from settings import *
-from map import is_wall, is_door
-from sprites import create_enemy_walk_frames, create_dead_enemy_sprite, create_hurt_enemy_sprite
-from sprites import create_boss_walk_frames, create_dead_boss_sprite
+from map import get_active_tiles, TILE_SOLID, TILE_DOOR
+from sprites import get_enemy_walk_frames, get_dead_enemy_sprite, get_hurt_enemy_sprite
+from sprites import get_boss_walk_frames, get_dead_boss_sprite, get_drop_sprite, get_font
+from visibility import line_of_sight
+from world import World
+from scheduler import AIScheduler
+from projectiles import ProjectileSystem, BULLET, FIREBALL
+from pools import ObjectPool
+from game_clock import get_ticks
+
+# Zoekradius in de spatial index voor treffers op de speler
+MELEE_QUERY_RADIUS = 1.5  # Ruim boven min_attack_range + 0.3 van een charger
 
 
 # ============================================
@@ -44,67 +53,6 @@ class BehaviorType:
     BOSS = 'boss'           # Boss specifiek gedrag
 
 
-class EnemyBullet:
-    """Een kogel geschoten door een vijand"""
-    
-    def __init__(self, x, y, target_x, target_y, damage=10, speed=0.015, color=(255, 200, 50)):
-        self.x = x
-        self.y = y
-        self.damage = damage
-        self.speed = speed
-        self.color = color
-        self.alive = True
-        self.hit_range = 0.35  # Kleinere hit range voor eerlijkere gameplay
-        self.lifetime = 0
-        self.max_lifetime = 5000
-        
-        # Bereken richting naar target
-        dx = target_x - x
-        dy = target_y - y
-        dist = math.sqrt(dx*dx + dy*dy)
-        if dist > 0:
-            self.dir_x = dx / dist
-            self.dir_y = dy / dist
-        else:
-            self.dir_x = 0
-            self.dir_y = 1
-            
-        self.sprite = self._create_sprite()
-        
-    def _create_sprite(self):
-        """Maak kogel sprite"""
-        size = 16
-        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
-        cx, cy = size // 2, size // 2
-        
-        # Glow
-        pygame.draw.circle(sprite, (*self.color[:3], 80), (cx, cy), 6)
-        # Core
-        pygame.draw.circle(sprite, self.color, (cx, cy), 4)
-        pygame.draw.circle(sprite, (255, 255, 255), (cx, cy), 2)
-        
-        return sprite
-        
-    def update(self, dt):
-        """Beweeg kogel"""
-        if not self.alive:
-            return
-            
-        self.lifetime += dt
-        if self.lifetime > self.max_lifetime:
-            self.alive = False
-            return
-            
-        self.x += self.dir_x * self.speed * dt
-        self.y += self.dir_y * self.speed * dt
-            
-        if is_wall(int(self.x), int(self.y)):
-            self.alive = False
-        
-    def get_sprite(self):
-        return self.sprite if self.alive else None
-
-
 class Enemy:
     """
     Verbeterde vijand met state machine en gedragstypes
@@ -128,11 +76,14 @@ class Enemy:
         'orange': (255, 180, 80),
     }
     
-    def __init__(self, x, y, enemy_type=None):
+    def __init__(self, x, y, enemy_type=None, tile_map=None):
         self.x = x
         self.y = y
         self.spawn_x = x
         self.spawn_y = y
+        self.prev_x = x  # Positie voor de laatste simulatie stap (render interpolatie)
+        self.prev_y = y
+        self.tile_map = tile_map if tile_map is not None else get_active_tiles()
         
         if enemy_type is None:
             enemy_type = random.choice(self.ENEMY_TYPES)
@@ -167,7 +118,7 @@ class Enemy:
         self.min_attack_range = 2.0 if self.behavior != BehaviorType.CHARGER else 0.8
         self.attack_cooldown = self.fire_rate
         self.last_attack = 0
-        self.projectiles = []
+        self.projectile_system = None  # Gedeelde kogel arrays, gezet door EnemyManager
         self.bullet_speed = 0.018
         self.bullet_color = self.BULLET_COLORS.get(self.color, (255, 200, 50))
         
@@ -208,15 +159,12 @@ class Enemy:
         self.alive = True
         
         # Animatie systeem
-        self.walk_frames = create_enemy_walk_frames(self.color)
+        self._load_sprites()
         self.current_frame = 0
         self.animation_timer = 0
         self.animation_speed = 150
         self.is_moving = False
         
-        self.sprite_hurt = create_hurt_enemy_sprite()
-        self.sprite_dead = create_dead_enemy_sprite(self.color)
-        
         self.target_x = x
         self.target_y = y
         self.path_update_time = 0
@@ -230,6 +178,14 @@ class Enemy:
         self.detection_range = 12.0
         self.last_known_player_x = None
         self.last_known_player_y = None
+        self.visibility = None  # Gedeelde zichtlijn service, gezet door EnemyManager
+        self.flow_field = None  # Gedeeld pad naar de speler, gezet door EnemyManager
+        
+    def _load_sprites(self):
+        """Haal de gedeelde sprite frames op (worden niet per vijand gegenereerd)"""
+        self.walk_frames = get_enemy_walk_frames(self.color)
+        self.sprite_hurt = get_hurt_enemy_sprite()
+        self.sprite_dead = get_dead_enemy_sprite(self.color)
         
     def _generate_patrol_points(self):
         """Genereer willekeurige patrol punten rond spawn positie (alleen op geldige posities)"""
@@ -244,7 +200,7 @@ class Enemy:
             new_y = self.spawn_y + offset_y
             
             # Check of dit punt geldig is (geen muur)
-            if not is_wall(int(new_x), int(new_y)):
+            if not self.tile_map.is_solid(int(new_x), int(new_y)):
                 points.append((new_x, new_y))
             attempts += 1
             
@@ -268,9 +224,6 @@ class Enemy:
                 
     def update(self, dt, player, door_manager=None, enemy_manager=None):
         """Update vijand met state machine"""
-        # Update projectielen altijd
-        self._update_projectiles(dt)
-        
         # Check of echt dood
         if self.state == EnemyState.DEAD:
             return
@@ -290,7 +243,7 @@ class Enemy:
         dy = player.y - self.y
         distance = math.sqrt(dx*dx + dy*dy)
         
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         # Check voor speler detectie
         can_see_player = distance < self.detection_range and self._has_line_of_sight(player.x, player.y)
@@ -400,8 +353,9 @@ class Enemy:
         if distance > self.attack_range:
             # Te ver - kom dichterbij
             if distance > 0:
-                move_x = (dx / distance) * self.speed * dt
-                move_y = (dy / distance) * self.speed * dt
+                dir_x, dir_y = self._chase_direction(player, dx, dy, distance)
+                move_x = dir_x * self.speed * dt
+                move_y = dir_y * self.speed * dt
                 
                 new_x = self.x + move_x
                 new_y = self.y + move_y
@@ -433,6 +387,14 @@ class Enemy:
                 if self._has_line_of_sight(player.x, player.y):
                     self._start_attack(player.x, player.y)
                     
+    def _chase_direction(self, player, dx, dy, distance):
+        """Richting naar de speler: recht erop af bij zicht, anders via het flow field"""
+        if self.flow_field and not self._has_line_of_sight(player.x, player.y):
+            dir_x, dir_y = self.flow_field.direction(self.x, self.y)
+            if dir_x or dir_y:
+                return dir_x, dir_y
+        return dx / distance, dy / distance
+        
     def _chase_charger(self, dt, player, distance, door_manager, current_time):
         """Charger vijand - rent naar speler voor melee"""
         dx = player.x - self.x
@@ -487,8 +449,9 @@ class Enemy:
             # Normale beweging naar speler
             if distance > self.min_attack_range:
                 if distance > 0:
-                    move_x = (dx / distance) * self.speed * dt
-                    move_y = (dy / distance) * self.speed * dt
+                    dir_x, dir_y = self._chase_direction(player, dx, dy, distance)
+                    move_x = dir_x * self.speed * dt
+                    move_y = dir_y * self.speed * dt
                     
                     new_x = self.x + move_x
                     new_y = self.y + move_y
@@ -617,7 +580,7 @@ class Enemy:
                 if hasattr(self, '_scheduled_attack_target'):
                     target = self._scheduled_attack_target
                     self._fire_bullet(target[0], target[1])
-                    self.last_attack = pygame.time.get_ticks()
+                    self.last_attack = get_ticks()
                     delattr(self, '_scheduled_attack_target')
         
         if self.is_moving:
@@ -630,27 +593,10 @@ class Enemy:
             self.animation_timer = 0
             
     def _has_line_of_sight(self, target_x, target_y):
-        """Check of er een vrije zichtlijn naar het doel is"""
-        dx = target_x - self.x
-        dy = target_y - self.y
-        distance = math.sqrt(dx*dx + dy*dy)
-        
-        if distance < 0.1:
-            return True
-            
-        steps = int(distance * 2)
-        if steps < 1:
-            steps = 1
-            
-        for i in range(1, steps):
-            t = i / steps
-            check_x = self.x + dx * t
-            check_y = self.y + dy * t
-            
-            if is_wall(int(check_x), int(check_y)):
-                return False
-                
-        return True
+        """Check of er een vrije zichtlijn naar het doel is (via de gedeelde zichtlijn service)"""
+        if self.visibility:
+            return self.visibility.has_line_of_sight(self.x, self.y, target_x, target_y)
+        return line_of_sight(self.x, self.y, target_x, target_y, self.tile_map)
         
     def _fire_bullet(self, target_x, target_y):
         """Schiet een kogel naar de speler"""
@@ -663,24 +609,15 @@ class Enemy:
         target_x += random.uniform(-spread, spread)
         target_y += random.uniform(-spread, spread)
         
-        bullet = EnemyBullet(
-            self.x, self.y, target_x, target_y,
-            self.damage, self.bullet_speed, self.bullet_color
+        self.projectile_system.spawn(
+            self, self.x, self.y, target_x, target_y,
+            self.damage, self.bullet_speed, BULLET, self.bullet_color
         )
-        self.projectiles.append(bullet)
         
-    def _update_projectiles(self, dt):
-        """Update alle kogels"""
-        for proj in self.projectiles[:]:
-            if proj.alive:
-                proj.update(dt)
-            else:
-                self.projectiles.remove(proj)
-                
     def _alert_nearby_enemies(self, enemy_manager):
         """Waarschuw vijanden in de buurt"""
         alert_range = 6.0
-        for enemy in enemy_manager.enemies:
+        for enemy in enemy_manager.spatial.query_radius('enemy', self.x, self.y, alert_range):
             if enemy is self or not enemy.alive:
                 continue
             if enemy.state in [EnemyState.DEAD, EnemyState.DYING]:
@@ -697,19 +634,6 @@ class Enemy:
                     enemy.last_known_player_x = self.last_known_player_x
                     enemy.last_known_player_y = self.last_known_player_y
                 
-    def get_bullet_damage(self, player_x, player_y):
-        """Check of een kogel de speler raakt, return damage"""
-        total_damage = 0
-        for proj in self.projectiles[:]:
-            if proj.alive:
-                dx = player_x - proj.x
-                dy = player_y - proj.y
-                dist = math.sqrt(dx*dx + dy*dy)
-                if dist < proj.hit_range:
-                    proj.alive = False
-                    total_damage += proj.damage
-        return total_damage
-        
     def get_melee_damage(self, player_x, player_y):
         """Check melee damage voor charger vijanden"""
         if self.behavior != BehaviorType.CHARGER:
@@ -730,27 +654,18 @@ class Enemy:
         # Collision radius - hoe breed de vijand is
         collision_radius = 0.3
         
-        # Check meerdere punten rond de vijand voor betere collision
-        check_points = [
-            (x, y),  # Midden
-            (x - collision_radius, y),  # Links
-            (x + collision_radius, y),  # Rechts
-            (x, y - collision_radius),  # Boven
-            (x, y + collision_radius),  # Onder
-            (x - collision_radius, y - collision_radius),  # Links-boven
-            (x + collision_radius, y - collision_radius),  # Rechts-boven
-            (x - collision_radius, y + collision_radius),  # Links-onder
-            (x + collision_radius, y + collision_radius),  # Rechts-onder
-        ]
-        
-        for check_x, check_y in check_points:
-            if is_wall(int(check_x), int(check_y)):
+        # Alle tiles die de collision box raakt in een region query (max 2x2 tiles)
+        tiles = self.tile_map
+        x0, y0 = x - collision_radius, y - collision_radius
+        x1, y1 = x + collision_radius, y + collision_radius
+        flags = tiles.region_flags(x0, y0, x1, y1)
+        if flags & TILE_SOLID:
+            return False
+        if flags & TILE_DOOR:
+            if not door_manager:
                 return False
-            if is_door(int(check_x), int(check_y)):
-                if door_manager:
-                    if not door_manager.can_pass(check_x, check_y):
-                        return False
-                else:
+            for check_x, check_y in ((x0, y0), (x1, y0), (x0, y1), (x1, y1)):
+                if tiles.is_door(check_x, check_y) and not door_manager.can_pass(check_x, check_y):
                     return False
         return True
         
@@ -786,11 +701,11 @@ class Enemy:
         roll = random.random()
         
         if roll < 0.10:  # 10% health pack
-            return EnemyDrop(self.x, self.y, 'health_pack')
+            return drop_pool.acquire(self.x, self.y, 'health_pack')
         elif roll < 0.35:  # 25% health
-            return EnemyDrop(self.x, self.y, 'health')
+            return drop_pool.acquire(self.x, self.y, 'health')
         elif roll < 0.70:  # 35% ammo
-            return EnemyDrop(self.x, self.y, 'ammo')
+            return drop_pool.acquire(self.x, self.y, 'ammo')
         else:
             return None  # 30% geen drop
             
@@ -832,7 +747,7 @@ class Enemy:
         if self.is_telegraphing:
             # Rode glow tijdens telegraph
             telegraph_sprite = base_sprite.copy()
-            pulse = (math.sin(pygame.time.get_ticks() * 0.03) + 1) * 0.5
+            pulse = (math.sin(get_ticks() * 0.03) + 1) * 0.5
             overlay = pygame.Surface(telegraph_sprite.get_size(), pygame.SRCALPHA)
             overlay.fill((255, int(50 + pulse * 100), 50, int(100 + pulse * 50)))
             telegraph_sprite.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
@@ -939,91 +854,14 @@ class Enemy:
         return (self.x, self.y)
 
 
-class Projectile:
-    """Een projectiel geschoten door de boss - snel en dodelijk"""
-    
-    def __init__(self, x, y, target_x, target_y, damage=15, speed=0.025):
-        self.x = x
-        self.y = y
-        self.damage = damage
-        self.speed = speed
-        self.alive = True
-        self.hit_range = 0.5  # Kleinere hit range voor eerlijkere gameplay
-        self.lifetime = 0
-        self.max_lifetime = 8000
-        
-        dx = target_x - x
-        dy = target_y - y
-        dist = math.sqrt(dx*dx + dy*dy)
-        if dist > 0:
-            self.dir_x = dx / dist
-            self.dir_y = dy / dist
-        else:
-            self.dir_x = 0
-            self.dir_y = 1
-            
-        self.sprite = self._create_sprite()
-        self.glow_pulse = 0
-        
-    def _create_sprite(self):
-        """Maak grote vuurbal sprite"""
-        size = 64
-        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
-        cx, cy = size // 2, size // 2
-        
-        for r in range(6, 0, -1):
-            alpha = 80 - r * 10
-            pygame.draw.circle(sprite, (255, 80, 0, alpha), (cx, cy), 20 + r * 4)
-        
-        pygame.draw.circle(sprite, (255, 150, 30), (cx, cy), 18)
-        pygame.draw.circle(sprite, (255, 200, 50), (cx, cy), 14)
-        pygame.draw.circle(sprite, (255, 255, 100), (cx, cy), 10)
-        pygame.draw.circle(sprite, (255, 255, 200), (cx, cy), 6)
-        pygame.draw.circle(sprite, (255, 255, 255), (cx, cy), 3)
-        
-        return sprite
-        
-    def update(self, dt):
-        if not self.alive:
-            return
-            
-        self.lifetime += dt
-        if self.lifetime > self.max_lifetime:
-            self.alive = False
-            return
-            
-        self.x += self.dir_x * self.speed * dt
-        self.y += self.dir_y * self.speed * dt
-        
-        self.glow_pulse = (math.sin(pygame.time.get_ticks() * 0.02) + 1) * 0.5
-            
-        if is_wall(int(self.x), int(self.y)):
-            self.alive = False
-            
-        return False
-        
-    def get_sprite(self):
-        if not self.alive:
-            return None
-        
-        size = 64
-        animated = pygame.Surface((size, size), pygame.SRCALPHA)
-        
-        glow_alpha = int(50 + self.glow_pulse * 60)
-        pygame.draw.circle(animated, (255, 100, 0, glow_alpha), (size//2, size//2), 28)
-        
-        animated.blit(self.sprite, (0, 0))
-        return animated
-
-
 class Boss(Enemy):
     """De eindbaas - verbeterde versie met fases en betere aanvallen"""
     
     # Boss fases met verschillende gedragingen
     PHASE_THRESHOLDS = [0.75, 0.50, 0.25]  # Health percentages voor fase transitions
     
-    def __init__(self, x, y, is_final=False):
-        super().__init__(x, y)
+    def __init__(self, x, y, is_final=False, tile_map=None):
+        super().__init__(x, y, tile_map=tile_map)
         
         self.color = 'boss'
         self.is_final_boss = is_final
@@ -1053,19 +891,14 @@ class Boss(Enemy):
         self.ranged_attack_range = 15.0
         self.ranged_cooldown = 1500
         self.last_ranged_attack = 0
-        self.projectiles = []
         
         self.is_boss = True
         self.activation_range = 12.0
         self.detection_range = 15.0
         
-        # Boss animatie
-        self.walk_frames = create_boss_walk_frames()
+        # Boss animatie (frames komen uit _load_sprites)
         self.animation_speed = 200
         
-        self.sprite_hurt = create_hurt_enemy_sprite(128)
-        self.sprite_dead = create_dead_boss_sprite()
-        
         # Fase systeem
         self.current_phase = 1
         self.phase_transition_timer = 0
@@ -1093,17 +926,21 @@ class Boss(Enemy):
         # Telegraph voor boss attacks
         self.boss_telegraph_duration = 400
         
+    def _load_sprites(self):
+        """Boss frames in plaats van de humanoid frames van Enemy"""
+        self.walk_frames = get_boss_walk_frames()
+        self.sprite_hurt = get_hurt_enemy_sprite(128)
+        self.sprite_dead = get_dead_boss_sprite()
+        
     def update(self, dt, player, door_manager=None, enemy_manager=None):
         if self.state == EnemyState.DEAD:
-            self._update_projectiles(dt)
             return
             
         if self.state == EnemyState.DYING:
-            self._update_projectiles(dt)
             self._update_dying(dt)
             return
             
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         # Check fase transitie
         self._check_phase_transition()
@@ -1111,7 +948,6 @@ class Boss(Enemy):
         # Update spin attack
         if self.is_spinning:
             self._update_spin_attack(dt, player)
-            self._update_projectiles(dt)
             return
             
         # Afstand tot speler
@@ -1133,8 +969,6 @@ class Boss(Enemy):
         if distance > self.attack_range and distance < self.ranged_attack_range:
             if self._has_line_of_sight(player.x, player.y):
                 self._execute_phase_attack(player, distance, current_time)
-        
-        self._update_projectiles(dt)
             
         # Normale enemy update voor beweging
         super().update(dt, player, door_manager, enemy_manager)
@@ -1237,15 +1071,13 @@ class Boss(Enemy):
             ty = self.y + math.sin(angle) * 10
             
             speed = self.projectile_speed * random.uniform(0.8, 1.2)
-            proj = Projectile(self.x, self.y, tx, ty, self.projectile_damage, speed)
-            self.projectiles.append(proj)
+            self.projectile_system.spawn(self, self.x, self.y, tx, ty, self.projectile_damage, speed, FIREBALL)
         
     def _fire_projectile(self, target_x, target_y):
         """Schiet een vuurbal"""
         speed = self.projectile_speed if not self.rage_mode else self.projectile_speed * 1.3
-        proj = Projectile(self.x, self.y, target_x, target_y, 
-                         self.projectile_damage, speed)
-        self.projectiles.append(proj)
+        self.projectile_system.spawn(self, self.x, self.y, target_x, target_y,
+                                     self.projectile_damage, speed, FIREBALL)
         
     def _fire_multi_shot(self, target_x, target_y):
         """Schiet meerdere vuurballen in een spread"""
@@ -1263,30 +1095,8 @@ class Boss(Enemy):
             ty = self.y + math.sin(angle) * 10
             
             speed = self.projectile_speed if not self.rage_mode else self.projectile_speed * 1.3
-            proj = Projectile(self.x, self.y, tx, ty, 
-                             self.projectile_damage, speed)
-            self.projectiles.append(proj)
-        
-    def _update_projectiles(self, dt):
-        """Update alle projectielen"""
-        for proj in self.projectiles[:]:
-            if proj.alive:
-                proj.update(dt)
-            else:
-                self.projectiles.remove(proj)
-                
-    def get_projectile_damage(self, player_x, player_y):
-        """Check of een projectiel de speler raakt"""
-        total_damage = 0
-        for proj in self.projectiles[:]:
-            if proj.alive:
-                dx = player_x - proj.x
-                dy = player_y - proj.y
-                dist = math.sqrt(dx*dx + dy*dy)
-                if dist < proj.hit_range:
-                    proj.alive = False
-                    total_damage += proj.damage
-        return total_damage
+            self.projectile_system.spawn(self, self.x, self.y, tx, ty,
+                                         self.projectile_damage, speed, FIREBALL)
         
     def get_sprite(self):
         if self.state == EnemyState.DEAD:
@@ -1305,7 +1115,7 @@ class Boss(Enemy):
         # Rage mode visual
         if self.rage_mode:
             rage_sprite = base_sprite.copy()
-            pulse = (math.sin(pygame.time.get_ticks() * 0.01) + 1) * 0.5
+            pulse = (math.sin(get_ticks() * 0.01) + 1) * 0.5
             overlay = pygame.Surface(rage_sprite.get_size(), pygame.SRCALPHA)
             overlay.fill((255, int(50 + pulse * 50), 0, int(80 + pulse * 40)))
             rage_sprite.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
@@ -1367,16 +1177,20 @@ class Boss(Enemy):
         """Boss dropt altijd goede items"""
         drops = []
         # Boss dropt health pack + veel ammo
-        drops.append(EnemyDrop(self.x - 0.3, self.y, 'health_pack'))
-        drops.append(EnemyDrop(self.x + 0.3, self.y, 'ammo'))
-        drops.append(EnemyDrop(self.x, self.y - 0.3, 'health'))
+        drops.append(drop_pool.acquire(self.x - 0.3, self.y, 'health_pack'))
+        drops.append(drop_pool.acquire(self.x + 0.3, self.y, 'ammo'))
+        drops.append(drop_pool.acquire(self.x, self.y - 0.3, 'health'))
         return drops  # Return list voor boss
 
 
 class DamageNumber:
-    """Floating damage number voor visual feedback"""
+    """Floating damage number voor visual feedback (via damage_number_pool)"""
     
     def __init__(self, x, y, damage, is_crit=False):
+        self.reset(x, y, damage, is_crit)
+        
+    def reset(self, x, y, damage, is_crit=False):
+        """Zet een (hergebruikte) instance klaar voor een nieuwe treffer"""
         self.x = x
         self.y = y
         self.damage = damage
@@ -1386,8 +1200,8 @@ class DamageNumber:
         self.alive = True
         self.velocity_y = -0.002  # Float upward
         
-        # Sprite
-        self.font = pygame.font.Font(None, 36 if not is_crit else 48)
+        # Sprite (gedeeld font, niet per treffer een nieuw Font)
+        self.font = get_font(36 if not is_crit else 48)
         self.color = (255, 255, 100) if not is_crit else (255, 50, 50)
         
     def update(self, dt):
@@ -1405,7 +1219,7 @@ class DamageNumber:
 
 
 class EnemyDrop:
-    """Item dat een vijand dropt bij dood"""
+    """Item dat een vijand dropt bij dood (via drop_pool)"""
     
     DROP_TYPES = {
         'health': {'color': (50, 255, 50), 'value': 15, 'chance': 0.25},
@@ -1414,6 +1228,10 @@ class EnemyDrop:
     }
     
     def __init__(self, x, y, drop_type='ammo'):
+        self.reset(x, y, drop_type)
+        
+    def reset(self, x, y, drop_type='ammo'):
+        """Zet een (hergebruikte) instance klaar voor een nieuwe drop"""
         self.x = x
         self.y = y
         self.drop_type = drop_type
@@ -1427,36 +1245,10 @@ class EnemyDrop:
         self.color = drop_data['color']
         self.value = drop_data['value']
         
-        self.sprite = self._create_sprite()
-        
-    def _create_sprite(self):
-        """Maak drop sprite"""
-        size = 24
-        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
-        cx, cy = size // 2, size // 2
-        
-        if self.drop_type == 'health':
-            # Groen kruis
-            pygame.draw.rect(sprite, self.color, (cx - 2, cy - 8, 4, 16))
-            pygame.draw.rect(sprite, self.color, (cx - 8, cy - 2, 16, 4))
-            pygame.draw.rect(sprite, (100, 255, 100), (cx - 1, cy - 7, 2, 14))
-        elif self.drop_type == 'ammo':
-            # Gele kogels
-            pygame.draw.ellipse(sprite, self.color, (cx - 6, cy - 8, 5, 16))
-            pygame.draw.ellipse(sprite, self.color, (cx + 1, cy - 8, 5, 16))
-            pygame.draw.ellipse(sprite, (255, 255, 150), (cx - 5, cy - 7, 3, 10))
-        elif self.drop_type == 'health_pack':
-            # Rode doos met kruis
-            pygame.draw.rect(sprite, (200, 50, 50), (cx - 8, cy - 6, 16, 12))
-            pygame.draw.rect(sprite, (255, 255, 255), (cx - 2, cy - 4, 4, 8))
-            pygame.draw.rect(sprite, (255, 255, 255), (cx - 6, cy - 1, 12, 2))
-            
-        # Glow effect
-        glow = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(glow, (*self.color, 50), (cx, cy), 10)
-        sprite.blit(glow, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
-        
-        return sprite
+        # Gedeelde sprites: normaal en half doorzichtig voor het knipperen
+        self.sprite = get_drop_sprite(drop_type, self.color)
+        self.faded_sprite = get_drop_sprite(drop_type, self.color, faded=True)
+        self.is_faded = False
         
     def update(self, dt):
         """Update drop"""
@@ -1468,10 +1260,7 @@ class EnemyDrop:
         # Fade out in laatste 3 seconden
         if self.lifetime > self.max_lifetime - 3000:
             # Knipperen
-            if int(self.lifetime / 200) % 2 == 0:
-                self.sprite.set_alpha(128)
-            else:
-                self.sprite.set_alpha(255)
+            self.is_faded = int(self.lifetime / 200) % 2 == 0
         
         if self.lifetime >= self.max_lifetime:
             self.alive = False
@@ -1492,7 +1281,14 @@ class EnemyDrop:
         return None
         
     def get_sprite(self):
-        return self.sprite if self.alive else None
+        if not self.alive:
+            return None
+        return self.faded_sprite if self.is_faded else self.sprite
+
+
+# Pools voor kortlevende entities
+damage_number_pool = ObjectPool(DamageNumber)
+drop_pool = ObjectPool(EnemyDrop)
 
 
 class KillCombo:
@@ -1608,7 +1404,8 @@ class DamageIndicator:
 class EnemyManager:
     """Beheert alle vijanden met verbeterde feedback"""
     
-    def __init__(self, level=1, custom_positions=None, boss_position=None, game_map=None, is_final_boss=False):
+    def __init__(self, level=1, custom_positions=None, boss_position=None, game_map=None, is_final_boss=False,
+                 world=None, ai_budget_ms=AI_FRAME_BUDGET_MS):
         self.enemies = []
         self.boss = None
         self.boss_spawned = False
@@ -1622,14 +1419,38 @@ class EnemyManager:
         self.kill_combo = KillCombo()
         self.damage_indicator = DamageIndicator()
         
+        # Per-level context; zonder World (bijv. los testen) een eigen voor game_map
+        self.world = world if world is not None else World(game_map)
+        self.tile_map = self.world.tile_map
+        
+        # Gedeelde spatial index (vijanden en drops)
+        self.spatial = self.world.spatial
+        
+        # Gedeelde zichtlijn service (memo per tick)
+        self.visibility = self.world.visibility
+        
+        # Gedeeld flow field naar de speler voor achtervolgende vijanden
+        self.flow_field = self.world.flow_field
+        
+        # Level-of-detail: verre of rustige vijanden minder vaak updaten
+        self.scheduler = AIScheduler(ai_budget_ms)  # None = geen budget (deterministisch)
+        
+        # Alle kogels en vuurballen in een gedeelde pool
+        self.projectile_system = ProjectileSystem(tile_map=self.tile_map)
+        
         self.spawn_enemies(custom_positions, boss_position)
+        for enemy in self.enemies:
+            self.spatial.insert(enemy, 'enemy')
+            enemy.visibility = self.visibility
+            enemy.flow_field = self.flow_field
+            enemy.projectile_system = self.projectile_system
         
     def spawn_enemies(self, custom_positions=None, boss_position=None):
         """Spawn vijanden op aangegeven of standaard posities met difficulty scaling"""
         if custom_positions is not None:
             for i, (x, y) in enumerate(custom_positions):
                 enemy_type = Enemy.ENEMY_TYPES[i % len(Enemy.ENEMY_TYPES)]
-                enemy = Enemy(x, y, enemy_type)
+                enemy = Enemy(x, y, enemy_type, self.tile_map)
                 # Apply difficulty scaling
                 enemy.apply_difficulty_scaling(self.level)
                 self.enemies.append(enemy)
@@ -1640,7 +1461,8 @@ class EnemyManager:
                 self._spawn_boss_level()
                 
         if boss_position:
-            self.boss = Boss(boss_position[0], boss_position[1], is_final=self.is_final_boss)
+            self.boss = Boss(boss_position[0], boss_position[1], is_final=self.is_final_boss,
+                             tile_map=self.tile_map)
             self.enemies.append(self.boss)
             
     def _spawn_level1_enemies(self):
@@ -1653,7 +1475,7 @@ class EnemyManager:
         
         for i, (x, y) in enumerate(spawn_positions):
             enemy_type = Enemy.ENEMY_TYPES[i % len(Enemy.ENEMY_TYPES)]
-            self.enemies.append(Enemy(x, y, enemy_type))
+            self.enemies.append(Enemy(x, y, enemy_type, self.tile_map))
             
     def _spawn_boss_level(self):
         """Boss level (fallback)"""
@@ -1664,40 +1486,56 @@ class EnemyManager:
         
         for i, (x, y) in enumerate(guard_positions):
             enemy_type = Enemy.ENEMY_TYPES[3 if i % 2 == 0 else 4]
-            self.enemies.append(Enemy(x, y, enemy_type))
+            self.enemies.append(Enemy(x, y, enemy_type, self.tile_map))
             
-        self.boss = Boss(11.5, 11.5)
+        self.boss = Boss(11.5, 11.5, tile_map=self.tile_map)
         self.enemies.append(self.boss)
         
     def update(self, dt, player, door_manager=None):
         """Update alle vijanden en systemen"""
-        for enemy in self.enemies:
+        self.visibility.begin_tick()
+        self.flow_field.update(player.x, player.y)
+        
+        # Projectielen altijd op volle snelheid, los van de AI planning
+        self.projectile_system.update(dt)
+        
+        for enemy, enemy_dt in self.scheduler.schedule(self.enemies, dt, player):
             # Check of enemy net doodging voor drop
             was_dying = enemy.state == EnemyState.DYING
-            enemy.update(dt, player, door_manager, self)
+            enemy.update(enemy_dt, player, door_manager, self)
             
             # Check of vijand net dood is gegaan (state changed to DEAD)
             if was_dying and enemy.state == EnemyState.DEAD:
+                # Dode vijanden hoeven niet meer in de index, hun kogels verdwijnen
+                self.spatial.remove(enemy)
+                self.projectile_system.remove_owner(enemy)
+                    
                 # Genereer drop(s)
                 drop_result = enemy.get_drop()
                 if drop_result:
                     # Boss returns list, normale vijanden single drop
-                    if isinstance(drop_result, list):
-                        self.drops.extend(drop_result)
-                    else:
-                        self.drops.append(drop_result)
+                    if not isinstance(drop_result, list):
+                        drop_result = [drop_result]
+                    for drop in drop_result:
+                        self.drops.append(drop)
+                        self.spatial.insert(drop, 'drop')
+            elif enemy.state != EnemyState.DEAD:
+                self.spatial.move(enemy)
             
         # Update damage numbers
         for dn in self.damage_numbers[:]:
             dn.update(dt)
             if not dn.alive:
                 self.damage_numbers.remove(dn)
+                damage_number_pool.release(dn)
                 
         # Update drops
         for drop in self.drops[:]:
             drop.update(dt)
             if not drop.alive:
                 self.drops.remove(drop)
+                self.spatial.remove(drop)
+                drop_pool.release(drop)
                 
         # Update kill combo
         self.kill_combo.update(dt)
@@ -1705,9 +1543,25 @@ class EnemyManager:
         # Update damage indicator
         self.damage_indicator.update(dt)
                 
+    def save_render_state(self):
+        """Onthoud de posities van voor de volgende simulatie stap"""
+        for enemy in self.enemies:
+            enemy.prev_x = enemy.x
+            enemy.prev_y = enemy.y
+            
+    def release_entities(self):
+        """Geef alle damage numbers en drops terug aan hun pool (bij het verlaten van het level)"""
+        for dn in self.damage_numbers:
+            damage_number_pool.release(dn)
+        for drop in self.drops:
+            self.spatial.remove(drop)
+            drop_pool.release(drop)
+        self.damage_numbers = []
+        self.drops = []
+        
     def add_damage_number(self, x, y, damage, is_crit=False):
         """Voeg damage number toe"""
-        self.damage_numbers.append(DamageNumber(x, y, damage, is_crit))
+        self.damage_numbers.append(damage_number_pool.acquire(x, y, damage, is_crit))
         
     def register_kill(self):
         """Registreer een kill voor combo systeem"""
@@ -1716,10 +1570,11 @@ class EnemyManager:
     def check_drop_pickups(self, player_x, player_y):
         """Check of speler drops oppakt"""
         pickups = []
-        for drop in self.drops[:]:
+        for drop in self.spatial.query_radius('drop', player_x, player_y, PICKUP_QUERY_RADIUS):
             result = drop.try_pickup(player_x, player_y)
             if result:
                 pickups.append(result)
+                self.spatial.remove(drop)
         return pickups
         
     def add_damage_indicator(self, player_x, player_y, player_angle, damage_x, damage_y, damage_amount):
@@ -1728,11 +1583,10 @@ class EnemyManager:
             
     def get_enemy_at_ray(self, player_x, player_y, angle, max_distance=MAX_DEPTH):
         """Vind vijand in schietrichting met line-of-sight check"""
-        sin_a = math.sin(angle)
-        cos_a = math.cos(angle)
-        
+        # Alleen vijanden in een smalle strook langs de schietlijn (al op afstand gesorteerd)
+        # Hit radius is 0.5 / distance rad, dus nooit meer dan 0.5 tiles naast de lijn
         sorted_enemies = []
-        for enemy in self.enemies:
+        for enemy in self.spatial.query_ray('enemy', player_x, player_y, angle, max_distance, 0.5):
             if not enemy.alive or enemy.state in [EnemyState.DEAD, EnemyState.DYING]:
                 continue
             dx = enemy.x - player_x
@@ -1740,8 +1594,6 @@ class EnemyManager:
             distance = math.sqrt(dx*dx + dy*dy)
             sorted_enemies.append((enemy, distance))
         
-        sorted_enemies.sort(key=lambda x: x[1])
-        
         for enemy, distance in sorted_enemies:
             if distance > max_distance or distance < 0.5:
                 continue
@@ -1766,66 +1618,39 @@ class EnemyManager:
         return None, 0
     
     def _has_clear_line_of_sight(self, start_x, start_y, end_x, end_y):
-        """Check of er geen muren zijn tussen twee punten"""
-        dx = end_x - start_x
-        dy = end_y - start_y
-        distance = math.sqrt(dx*dx + dy*dy)
-        
-        if distance < 0.1:
-            return True
-            
-        # Meer stappen voor nauwkeurigere check
-        steps = int(distance * 4)
-        if steps < 2:
-            steps = 2
-            
-        for i in range(1, steps):
-            t = i / steps
-            check_x = start_x + dx * t
-            check_y = start_y + dy * t
-            
-            if is_wall(int(check_x), int(check_y)):
-                return False
-                
-        return True
+        """Check of er geen muren zijn tussen twee punten (exact, zonder memo)"""
+        return self.visibility.trace(start_x, start_y, end_x, end_y)
         
     def check_player_damage(self, player):
         """Check schade van alle vijandelijke aanvallen met damage indicator"""
-        total_damage = 0
+        # Schade per aanvaller verzamelen (een indicator per vijand)
+        damage_by_enemy = {}
         
-        for enemy in self.enemies:
+        # Kogels en boss projectielen: een vectorized hit test over de hele pool
+        damage_by_enemy = self.projectile_system.hit_test(player.x, player.y)
+                
+        # Melee damage (chargers)
+        for enemy in self.spatial.query_radius('enemy', player.x, player.y, MELEE_QUERY_RADIUS):
             if not enemy.alive or enemy.state in [EnemyState.DEAD, EnemyState.DYING]:
                 continue
                 
-            enemy_damage = 0
-                
-            # Kogel damage
-            if hasattr(enemy, 'get_bullet_damage'):
-                bullet_damage = enemy.get_bullet_damage(player.x, player.y)
-                enemy_damage += bullet_damage
-                
-            # Melee damage (chargers)
-            if hasattr(enemy, 'get_melee_damage'):
-                melee_damage = enemy.get_melee_damage(player.x, player.y)
-                enemy_damage += melee_damage
-                    
-            # Boss projectile damage
-            if hasattr(enemy, 'is_boss') and hasattr(enemy, 'get_projectile_damage'):
-                proj_damage = enemy.get_projectile_damage(player.x, player.y)
-                enemy_damage += proj_damage
+            melee_damage = enemy.get_melee_damage(player.x, player.y)
+            if melee_damage > 0:
+                damage_by_enemy[enemy] = damage_by_enemy.get(enemy, 0) + melee_damage
                 
-            # Voeg damage indicator toe als er schade is
-            if enemy_damage > 0:
-                self.add_damage_indicator(
-                    player.x, player.y, player.angle,
-                    enemy.x, enemy.y, enemy_damage
-                )
-                total_damage += enemy_damage
+        # Voeg damage indicators toe
+        total_damage = 0
+        for enemy, enemy_damage in damage_by_enemy.items():
+            self.add_damage_indicator(
+                player.x, player.y, player.angle,
+                enemy.x, enemy.y, enemy_damage
+            )
+            total_damage += enemy_damage
                     
         return total_damage
         
-    def render(self, sprite_renderer):
-        """Render alle vijanden met health bars en drops"""
+    def render(self, sprite_renderer, alpha=1.0):
+        """Render alle vijanden met health bars en drops (alpha: tussen vorige en huidige stap)"""
         # Render drops eerst (achtergrond)
         for drop in self.drops:
             if drop.alive:
@@ -1848,14 +1673,6 @@ class EnemyManager:
                 else:
                     scale = 0.4
                     y_offset = 0.5
-                    
-                # Boss projectielen
-                if hasattr(enemy, 'projectiles'):
-                    for proj in enemy.projectiles:
-                        if proj.alive:
-                            proj_sprite = proj.get_sprite()
-                            if proj_sprite:
-                                sprite_renderer.add_sprite(proj_sprite, proj.x, proj.y, 0.4, 0.0)
             else:
                 if enemy.state != EnemyState.DYING:
                     scale = 0.3
@@ -1864,16 +1681,12 @@ class EnemyManager:
                     scale = 0.2
                     y_offset = 0.4
                     
-            # Kogels van alle vijanden
-            if hasattr(enemy, 'projectiles'):
-                for proj in enemy.projectiles:
-                    if proj.alive:
-                        proj_sprite = proj.get_sprite()
-                        if proj_sprite:
-                            bullet_scale = 0.15 if not hasattr(enemy, 'is_boss') else 0.4
-                            sprite_renderer.add_sprite(proj_sprite, proj.x, proj.y, bullet_scale, 0.0)
-                            
-            sprite_renderer.add_sprite(sprite, enemy.x, enemy.y, scale, y_offset)
+            render_x = enemy.prev_x + (enemy.x - enemy.prev_x) * alpha
+            render_y = enemy.prev_y + (enemy.y - enemy.prev_y) * alpha
+            sprite_renderer.add_sprite(sprite, render_x, render_y, scale, y_offset)
+            
+        # Kogels van alle vijanden en boss vuurballen
+        self.projectile_system.render(sprite_renderer, alpha)
             
     @property
     def alive_count(self):
@@ -6,6 +6,8 @@ import math
 import pygame
 from sprites import create_friendly_bot_sprite, create_friendly_bot_used_sprite
 from settings import WIDTH, HEIGHT, HALF_WIDTH, HALF_HEIGHT
+from spatial import SpatialHash
+from game_clock import get_ticks
 
 
 class FriendlyBot:
@@ -33,7 +35,7 @@ class FriendlyBot:
         
     def update(self, dt, player):
         """Update animatie en range check"""
-        self.float_offset = math.sin(pygame.time.get_ticks() * 0.003 + self.float_phase) * 0.12
+        self.float_offset = math.sin(get_ticks() * 0.003 + self.float_phase) * 0.12
         
         if self.helped:
             self.in_range = False
@@ -92,9 +94,11 @@ class FriendlyBot:
 class FriendlyBotManager:
     """Beheert alle vriendelijke bots in een level"""
     
-    def __init__(self, bot_data=None, level_number=1):
+    def __init__(self, bot_data=None, level_number=1, spatial=None):
         self.bots = []
         self.show_interact_prompt = False
+        self.spatial = spatial if spatial is not None else SpatialHash()
+        self.max_interaction_range = 0.0
         
         if not bot_data:
             return
@@ -110,7 +114,10 @@ class FriendlyBotManager:
                 continue
             message = entry.get('message')
             help_data = entry.get('help', {})
-            self.bots.append(FriendlyBot(position[0], position[1], level_number, message, help_data))
+            bot = FriendlyBot(position[0], position[1], level_number, message, help_data)
+            self.bots.append(bot)
+            self.spatial.insert(bot, 'bot')
+            self.max_interaction_range = max(self.max_interaction_range, bot.interaction_range)
             
     def update(self, dt, player):
         """Update alle bots en check voor interact prompt"""
@@ -121,8 +128,9 @@ class FriendlyBotManager:
                 self.show_interact_prompt = True
                 
     def try_interact(self, game):
-        """Probeer te interacteren met een bot in range"""
-        for bot in self.bots:
+        """Probeer te interacteren met een bot in range (dichtstbijzijnde eerst)"""
+        player = game.player
+        for bot in self.spatial.query_radius('bot', player.x, player.y, self.max_interaction_range):
             if bot.try_interact(game):
                 return True
         return False
@@ -137,7 +145,7 @@ class FriendlyBotManager:
         if not self.show_interact_prompt:
             return
             
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         # Pulserende achtergrond
         pulse = abs(math.sin(current_time * 0.005))
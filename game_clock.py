@@ -0,0 +1,76 @@
+"""
+Game klok - De speltijd in milliseconden, gedreven door de dt van de game loop
+Cooldowns, animaties en timers vragen de tijd op via get_ticks() in plaats
+van pygame.time.get_ticks(). De GameClock van de game loop telt alleen de
+dt op die de simulatie echt gekregen heeft: pauzeren, vertragen/versnellen,
+losse stappen en sneller dan real-time (headless) lopen zo vanzelf goed, en
+een tijd opvragen kost geen syscall.
+"""
+import pygame
+from settings import *
+
+
+class SystemClock:
+    """Wandklok van pygame (ms sinds pygame.init)"""
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+
+class GameClock:
+    """Speltijd die alleen vooruit gaat met de dt die de simulatie krijgt"""
+
+    def __init__(self, start_ms=GAME_CLOCK_START, time_scale=TIME_SCALE, max_dt=GAME_CLOCK_MAX_DT):
+        self.ticks = start_ms
+        self.time_scale = time_scale
+        self.max_dt = max_dt  # Langere frames (hapering, breakpoint) tellen als max_dt
+        self.paused = False
+        self.step_requested = False
+
+    def frame_dt(self, real_dt):
+        """Speltijd voor een frame van real_dt ms wandtijd (0 als gepauzeerd)"""
+        if self.paused:
+            if self.step_requested:
+                # Een losse simulatie stap, ongeacht de time scale
+                self.step_requested = False
+                return SIM_DT
+            return 0
+        return min(real_dt, self.max_dt) * self.time_scale
+
+    def advance(self, dt):
+        """Zet de klok dt milliseconden vooruit (aangeroepen per simulatie stap)"""
+        self.ticks += dt
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+        self.step_requested = False
+
+    def request_step(self):
+        """Laat de volgende gepauzeerde frame een stap doen"""
+        if self.paused:
+            self.step_requested = True
+
+    def set_time_scale(self, time_scale):
+        self.time_scale = max(0.0, time_scale)
+
+    def get_ticks(self):
+        return int(self.ticks)
+
+
+_clock = SystemClock()
+
+
+def set_clock(clock):
+    """Gebruik deze klok voor alle get_ticks() aanroepen"""
+    global _clock
+    _clock = clock
+
+
+def get_clock():
+    """De actieve klok"""
+    return _clock
+
+
+def get_ticks():
+    """Speltijd in milliseconden volgens de actieve klok"""
+    return _clock.get_ticks()
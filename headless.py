@@ -0,0 +1,101 @@
+"""
+Headless simulatie - De game logica zonder venster, zo snel als de CPU kan
+Draait Game.update (speler input uit een script, deuren, vijanden, quest,
+pickups) met een vaste dt op de speltijd klok, zonder display. Bedoeld
+voor soak tests, balans sweeps en benchmarks op servers zonder scherm.
+
+Gebruik:
+    python headless.py --level 3 --seconds 120
+    python headless.py --script run.json --render
+"""
+import os
+import sys
+import time
+import argparse
+
+# Moet gezet zijn voordat settings pygame initialiseert
+os.environ.setdefault('DOOMIE_HEADLESS', '1')
+
+from settings import *
+from controls import ScriptedInput
+from main import Game
+from replay import Recorder
+import instrument
+
+
+def run_headless(script=None, level=1, seconds=60.0, frame_ms=1000 / FPS, render=False, loop_script=False,
+                 seed=None, record=None):
+    """
+    Simuleer seconds speltijd in render frames van frame_ms (elk in vaste stappen van SIM_DT)
+    Stopt eerder bij game over of victory; record: pad voor een replay log (zie replay.py)
+    script: lijst van stappen (zie ScriptedInput) of pad naar een JSON bestand
+    Geeft een dict met de resultaten van de run terug
+    """
+    if isinstance(script, str):
+        input_source = ScriptedInput.from_file(script, loop_script)
+    else:
+        input_source = ScriptedInput(script, loop_script)
+
+    game = Game(input_source, seed=seed, deterministic=record is not None)
+    if level != game.current_level:
+        game._load_level(level)
+    if record:
+        game.recorder = Recorder(record, game)
+
+    frames = int(seconds * 1000 / frame_ms)
+    start = time.perf_counter()
+    frame = 0
+    for frame in range(1, frames + 1):
+        alpha = game.advance(frame_ms)
+        if render:
+            game.draw(alpha)
+        if not game.running or game.game_over or game.victory:
+            break
+    wall_time = time.perf_counter() - start
+    if game.recorder:
+        game.recorder.close(game)
+
+    sim_time = frame * frame_ms / 1000
+    return {
+        'frames': frame,
+        'sim_seconds': sim_time,
+        'wall_seconds': wall_time,
+        'speedup': sim_time / wall_time if wall_time > 0 else 0.0,
+        'level': game.current_level,
+        'player_health': game.player_health,
+        'enemies_alive': game.enemy_manager.alive_count,
+        'game_over': game.game_over,
+        'victory': game.victory,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DOOMIE headless simulation")
+    parser.add_argument('--level', type=int, default=1, help="Level om mee te starten")
+    parser.add_argument('--seconds', type=float, default=60.0, help="Speltijd om te simuleren")
+    parser.add_argument('--frame-ms', type=float, default=1000 / FPS, help="Lengte van een render frame in ms")
+    parser.add_argument('--script', help="JSON input script (lijst van stappen)")
+    parser.add_argument('--loop', action='store_true', help="Script herhalen tot de tijd op is")
+    parser.add_argument('--render', action='store_true', help="Ook offscreen renderen")
+    parser.add_argument('--seed', type=int, help="Seed voor alle toeval in de simulatie")
+    parser.add_argument('--record', metavar='PATH', help="Neem de run op voor replay.py")
+    parser.add_argument('--instrument', metavar='TARGET',
+                        help="Telemetrie naar file:PAD of udp://HOST:PORT (zie instrument.py)")
+    args = parser.parse_args()
+    if args.instrument:
+        instrument.enable(args.instrument)
+
+    result = run_headless(args.script, args.level, args.seconds, args.frame_ms, args.render, args.loop,
+                          args.seed, args.record)
+    instrument.disable()  # Laatste waarden flushen
+    print(f"\nSimulated {result['sim_seconds']:.1f}s in {result['wall_seconds']:.2f}s "
+          f"({result['speedup']:.1f}x real time, {result['frames']} frames)")
+    print(f"Level {result['level']}: health {result['player_health']}, "
+          f"{result['enemies_alive']} enemies alive"
+          + (", GAME OVER" if result['game_over'] else "")
+          + (", VICTORY" if result['victory'] else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
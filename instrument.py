@@ -0,0 +1,266 @@
+"""
+Instrumentatie - Timers, tellers en gauges voor hot paths, met export
+Uit (de standaard) kost het niets: incr(), gauge(), timer() en tick() zijn
+dan lege functies, en de hot paths (HOT_PATHS) zijn de originele methodes.
+enable() vervangt bij het opstarten die functies en methodes door versies
+die meten; er zit dus geen flag check in de aanroepen zelf. Elke
+INSTRUMENT_FLUSH_MS gaan de opgetelde waarden naar een JSON lines bestand
+of als statsd regels over UDP naar een lokale listener.
+
+Gebruik:
+    DOOMIE_INSTRUMENT=file:stats.jsonl python main.py
+    python headless.py --instrument udp://127.0.0.1:8125
+Aanroepen altijd via de module (instrument.incr), niet met from-import:
+anders blijft de lege versie hangen.
+"""
+import json
+import time
+import socket
+import functools
+import importlib
+from settings import *
+
+# Methodes die enable() met een timer omwikkelt: (module, klasse, methode)
+HOT_PATHS = (
+    ('raycasting', 'RayCaster', 'cast_ray'),
+    ('textures', 'TextureManager', 'get_texture_column'),
+    ('enemy', 'Enemy', 'can_move_to'),
+    ('enemy', 'Enemy', '_has_line_of_sight'),
+    ('sprites', 'SpriteRenderer', 'render_sprite'),
+)
+
+_timers = {}  # naam -> [aantal, totaal s, max s]
+_counters = {}
+_gauges = {}
+_gauge_sources = []  # Functies die bij een flush een dict met gauges teruggeven
+_originals = []  # (klasse, methode, originele functie) om disable() te kunnen doen
+_exporter = None
+_last_flush = 0.0
+
+
+class _NullTimer:
+    """Lege context manager (timer() als instrumentatie uit staat)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def _null_timer(name):
+    return _NULL_TIMER
+
+
+# Publieke API; enable() zet hier de meetende versies neer
+incr = _noop
+gauge = _noop
+timer = _null_timer
+tick = _noop
+
+
+class _Timer:
+    """Context manager die de tijd van een blok bij een timer optelt"""
+
+    def __init__(self, name):
+        self.stat = _timers.setdefault(name, [0, 0.0, 0.0])
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _add_time(self.stat, time.perf_counter() - self.start)
+        return False
+
+
+def _add_time(stat, elapsed):
+    stat[0] += 1
+    stat[1] += elapsed
+    if elapsed > stat[2]:
+        stat[2] = elapsed
+
+
+def _incr(name, amount=1):
+    _counters[name] = _counters.get(name, 0) + amount
+
+
+def _gauge(name, value):
+    _gauges[name] = value
+
+
+def _tick():
+    """Flush als het interval om is (een keer per frame aanroepen)"""
+    if (time.perf_counter() - _last_flush) * 1000 >= INSTRUMENT_FLUSH_MS:
+        flush()
+
+
+def _timed(name, func):
+    """Wrapper die elke aanroep van func bij timer name optelt"""
+    stat = _timers.setdefault(name, [0, 0.0, 0.0])
+    clock = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        result = func(*args, **kwargs)
+        _add_time(stat, clock() - start)
+        return result
+    return wrapper
+
+
+class FileExporter:
+    """Een JSON regel per flush, achteraan het bestand"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'a')
+
+    def send(self, snapshot):
+        self.file.write(json.dumps(snapshot) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class StatsdExporter:
+    """statsd regels over UDP (tellers als |c, timers en gauges als |g)"""
+
+    MAX_PACKET = 1400  # Onder de MTU blijven, anders valt een datagram weg
+
+    def __init__(self, host, port, prefix=INSTRUMENT_PREFIX):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(self, snapshot):
+        lines = []
+        for name, stats in snapshot['timers'].items():
+            lines.append(f"{self.prefix}.{name}.calls:{stats['count']}|c")
+            lines.append(f"{self.prefix}.{name}.total_ms:{stats['total_ms']}|g")
+            lines.append(f"{self.prefix}.{name}.mean_ms:{stats['mean_ms']}|g")
+            lines.append(f"{self.prefix}.{name}.max_ms:{stats['max_ms']}|g")
+        for name, value in snapshot['counters'].items():
+            lines.append(f"{self.prefix}.{name}:{value}|c")
+        for name, value in snapshot['gauges'].items():
+            lines.append(f"{self.prefix}.{name}:{value}|g")
+
+        packet = ''
+        for line in lines:
+            if packet and len(packet) + len(line) + 1 > self.MAX_PACKET:
+                self._send_packet(packet)
+                packet = ''
+            packet = f"{packet}\n{line}" if packet else line
+        if packet:
+            self._send_packet(packet)
+
+    def _send_packet(self, packet):
+        try:
+            self.socket.sendto(packet.encode(), self.address)
+        except OSError:
+            pass  # Geen listener of netwerk weg: telemetrie mag het spel niet stoppen
+
+    def close(self):
+        self.socket.close()
+
+
+def make_exporter(target):
+    """Exporter voor 'file:PAD', 'udp://host:port' of 'statsd://host:port'"""
+    if target.startswith('file:'):
+        return FileExporter(target[len('file:'):])
+    for scheme in ('udp://', 'statsd://'):
+        if target.startswith(scheme):
+            host, _, port = target[len(scheme):].rpartition(':')
+            if not host or not port.isdigit():
+                break
+            return StatsdExporter(host, int(port))
+    raise ValueError(f"Unknown instrumentation target: {target} (use file:PATH or udp://HOST:PORT)")
+
+
+def enabled():
+    return _exporter is not None
+
+
+def enable(target):
+    """Zet instrumentatie aan: meetende API, timers om de hot paths, exporter naar target"""
+    global _exporter, _last_flush, incr, gauge, timer, tick
+    if enabled():
+        return
+    _exporter = make_exporter(target)
+    _last_flush = time.perf_counter()
+    incr, gauge, timer, tick = _incr, _gauge, _Timer, _tick
+
+    for module_name, class_name, method_name in HOT_PATHS:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        original = cls.__dict__[method_name]
+        _originals.append((cls, method_name, original))
+        setattr(cls, method_name, _timed(f"{class_name}.{method_name}", original))
+    print(f"Instrumentation enabled, exporting to {target}")
+
+
+def disable():
+    """Flush de laatste waarden en zet alles terug naar de originele functies"""
+    global _exporter, incr, gauge, timer, tick
+    if not enabled():
+        return
+    flush()
+    _exporter.close()
+    _exporter = None
+    incr, gauge, timer, tick = _noop, _noop, _null_timer, _noop
+    for cls, method_name, original in reversed(_originals):
+        setattr(cls, method_name, original)
+    _originals.clear()
+
+
+def add_gauge_source(source):
+    """source() geeft bij elke flush een dict {naam: waarde} (alleen aangeroepen als het aan staat)"""
+    _gauge_sources.append(source)
+
+
+def remove_gauge_source(source):
+    if source in _gauge_sources:
+        _gauge_sources.remove(source)
+
+
+def snapshot():
+    """Opgetelde waarden sinds de vorige flush als dict"""
+    timers = {}
+    for name, (calls, total, peak) in _timers.items():
+        if calls:
+            timers[name] = {
+                'count': calls,
+                'total_ms': round(total * 1000, 4),
+                'mean_ms': round(total * 1000 / calls, 5),
+                'max_ms': round(peak * 1000, 4),
+            }
+    gauges = dict(_gauges)
+    for source in _gauge_sources:
+        gauges.update(source())
+    return {
+        'time': round(time.time(), 3),
+        'interval_ms': round((time.perf_counter() - _last_flush) * 1000, 1),
+        'timers': timers,
+        'counters': dict(_counters),
+        'gauges': gauges,
+    }
+
+
+def flush():
+    """Stuur de waarden naar de exporter en begin opnieuw te tellen (gauges blijven staan)"""
+    global _last_flush
+    if not enabled():
+        return
+    _exporter.send(snapshot())
+    _last_flush = time.perf_counter()
+    for stat in _timers.values():
+        stat[0] = 0
+        stat[1] = stat[2] = 0.0
+    _counters.clear()
@@ -12,6 +12,7 @@ Besturing:
     E           - Open/sluit deur
     H           - Gebruik Health Pack
     M           - Minimap toggle
+    P           - Pauze (. = een frame verder)
     ESC         - Afsluiten
 
 Levels:
@@ -30,26 +31,72 @@ from settings import *
 from player import Player
 from raycasting import RayCaster
 from textures import TextureManager
-from door import DoorManager
 from sprites import SpriteRenderer
 from enemy import EnemyManager, EnemyState
 from weapon import WeaponManager
-from map import MINIMAP_TILE_SIZE
+from map import MINIMAP_TILE_SIZE, TILE_DOOR
 from quest import QuestManager
 from friendly_bot import FriendlyBotManager
 from levels import get_level_data, get_total_levels
+from resolution import RenderView, DynamicResolution
+from world import World
+from controls import InputFrame, LiveInput, ScriptedInput, KEYDOWN, MOUSEDOWN, QUIT
+from game_clock import GameClock, set_clock, get_ticks
+from pools import pool_stats
+from profiler import FrameProfiler
+import instrument
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, input_source=None, seed=None, deterministic=False, skip_story=None):
         pygame.init()
-        pygame.mouse.set_visible(False)
-        pygame.event.set_grab(True)  # Vang de muis
+        self.headless = HEADLESS
+        self.skip_story = HEADLESS if skip_story is None else skip_story
         
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
-        pygame.display.set_caption("DOOMIE - A DOOM-like Game")
+        # Alle toeval in de simulatie komt uit de globale random, met een bekende seed
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2**32)
+        random.seed(self.seed)
+        
+        # Deterministisch (opnemen/afspelen): geen AI budget op wandtijd
+        self.deterministic = deterministic
+        self.recorder = None  # replay.Recorder die de input van elke stap opslaat
+        
+        if self.headless:
+            # Offscreen (dummy video driver): geen venster, muis niet vangen
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        else:
+            pygame.mouse.set_visible(False)
+            pygame.event.set_grab(True)  # Vang de muis
+            
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
+            pygame.display.set_caption("DOOMIE - A DOOM-like Game")
+        
+        # Input bron: toetsenbord en muis, of een script in headless modus
+        if input_source is None:
+            input_source = ScriptedInput() if self.headless else LiveInput()
+        self.input = input_source
+        self.input_frame = InputFrame()
         
         self.clock = pygame.time.Clock()
+        
+        # Speltijd voor alle cooldowns en timers, gedreven door de dt van de loop
+        self.game_clock = GameClock()
+        set_clock(self.game_clock)
+        
+        # Vaste simulatie stap: opgespaarde speltijd die nog niet gesimuleerd is
+        self.sim_accumulator = 0.0
+        self.sim_steps = 0  # Aantal stappen in de laatste render frame
+        self.prev_player_pos = PLAYER_POS  # Positie voor de laatste stap (render interpolatie)
+        
+        # Tijd per stage van elke frame (F3 overlay, F4 trace dump)
+        self.profiler = FrameProfiler()
+        
+        # Telemetrie van de hot paths (alleen als DOOMIE_INSTRUMENT of --instrument gezet is)
+        if INSTRUMENT:
+            instrument.enable(INSTRUMENT)
+        if instrument.enabled():
+            instrument.add_gauge_source(self._instrument_gauges)
+        
         self.running = True
         self.show_minimap = True
         self.friendly_bot_manager = None
@@ -59,6 +106,10 @@ class Game:
         self.total_levels = get_total_levels()
         self.level_data = None
         self.current_map = None
+        self.world = None  # Map, deuren en indexen van het huidige level
+        self.tile_map = None
+        self.minimap_layer = None  # Vaste tiles van de minimap, een keer getekend per level
+        self.minimap_doors = []
         self.transitioning = False
         self.transition_time = 0
         self.transition_duration = 3000  # 3 seconden transitie
@@ -84,6 +135,11 @@ class Game:
         self._load_level(1)
         self._start_story()
         
+        # Interne render resolutie van de 3D view (HUD blijft native)
+        self.view_surface = None
+        self.dynamic_resolution = DynamicResolution() if DYNAMIC_RESOLUTION else None
+        self.set_render_scale(RENDER_SCALE)
+        
         # Wapens
         self.weapons = WeaponManager()
         
@@ -126,9 +182,26 @@ class Game:
         self.max_damage_per_hit = 25  # Maximum schade per keer
         
         # Centreer muis en reset relatieve beweging
-        pygame.mouse.set_pos(HALF_WIDTH, HALF_HEIGHT)
-        pygame.mouse.get_rel()  # Reset de relatieve beweging buffer
+        self.input.reset_mouse()
         
+    def set_render_scale(self, render_scale):
+        """Render de 3D view op een fractie van de native resolutie"""
+        view = RenderView(render_scale)
+        self.raycaster.set_view(view)
+        
+        if view.is_native:
+            # Direct op het scherm, geen upscale nodig
+            self.view_surface = None
+        else:
+            # Offscreen surface in het pixel formaat van het scherm
+            self.view_surface = pygame.Surface(view.size, 0, self.screen)
+            
+    def _prefetch_next_theme(self):
+        """Genereer het thema van het volgende level alvast op de achtergrond"""
+        next_level_data = get_level_data(self.current_level + 1)
+        if next_level_data:
+            self.textures.prefetch_theme(next_level_data.get('theme', 'dungeon'))
+            
     def _load_level(self, level_num):
         """Laad een specifiek level"""
         self.level_data = get_level_data(level_num)
@@ -139,12 +212,17 @@ class Game:
         self.current_level = level_num
         self.current_map = self.level_data['map']
         
+        # Per-level context: map, deuren en gedeelde indexen voor alle systemen
+        self.world = World(self.current_map)
+        self.tile_map = self.world.tile_map
+        self.door_manager = self.world.door_manager
+        self._build_minimap_layer()
+        
         # Wissel naar juiste thema
         theme = self.level_data.get('theme', 'dungeon')
         self.textures.set_theme(theme)
+        self._prefetch_next_theme()
         
-        # Door manager voor dit level
-        self.door_manager = DoorManager(self.current_map)
         print(f"\n{'='*50}")
         print(f"  LEVEL {level_num}: {self.level_data['name']}")
         print(f"  {self.level_data['subtitle']}")
@@ -161,14 +239,14 @@ class Game:
         self.player.y = start_pos[1]
         self.player.angle = 0.8
         self.player.set_door_manager(self.door_manager)
-        self.player.set_map(self.current_map)
+        self.player.set_map(self.tile_map)
         
         # Raycaster
         if not hasattr(self, 'raycaster') or self.raycaster is None:
             self.raycaster = RayCaster(self)
         self.raycaster.set_textures(self.textures)
         self.raycaster.set_door_manager(self.door_manager)
-        self.raycaster.set_map(self.current_map)
+        self.raycaster.set_map(self.tile_map)
         
         # Sprite renderer
         if not hasattr(self, 'sprite_renderer') or self.sprite_renderer is None:
@@ -180,12 +258,18 @@ class Game:
         has_boss = self.level_data.get('has_boss', False)
         is_final_boss = self.level_data.get('is_final_boss', False)
         
+        # Damage numbers en drops van het vorige level terug naar hun pool
+        if getattr(self, 'enemy_manager', None):
+            self.enemy_manager.release_entities()
+        
         self.enemy_manager = EnemyManager(
             level=level_num, 
             custom_positions=enemy_positions,
             boss_position=boss_position if has_boss else None,
             game_map=self.current_map,
-            is_final_boss=is_final_boss
+            is_final_boss=is_final_boss,
+            world=self.world,
+            ai_budget_ms=None if self.deterministic else AI_FRAME_BUDGET_MS
         )
         print(f"Spawned {len(self.enemy_manager.enemies)} enemies" + 
               (" (including BOSS!)" if has_boss else ""))
@@ -201,7 +285,8 @@ class Game:
             crystal_positions = self.level_data.get('crystal_positions', None)
             self.quest = QuestManager(
                 crystal_positions, health_pack_positions, ammo_pack_positions,
-                key_position, exit_door_position, is_boss_level
+                key_position, exit_door_position, is_boss_level,
+                spatial=self.world.spatial
             )
             print(f"Quest: Collect {self.quest.total_crystals} Crystals + Key!")
         else:
@@ -210,34 +295,37 @@ class Game:
                 crystal_positions=[], 
                 health_pack_positions=health_pack_positions, 
                 ammo_pack_positions=ammo_pack_positions,
-                is_boss_level=True
+                is_boss_level=True,
+                spatial=self.world.spatial
             )
             
         # Friendly help bot
         bot_data = self.level_data.get('bot', None)
-        self.friendly_bot_manager = FriendlyBotManager(bot_data, level_num)
+        self.friendly_bot_manager = FriendlyBotManager(bot_data, level_num, spatial=self.world.spatial)
         self.bot_dialogue_active = False
         self.bot_dialogue_message = ""
         self.bot_dialogue_bonus = ""
             
         # Reset muis
-        pygame.mouse.set_pos(HALF_WIDTH, HALF_HEIGHT)
-        pygame.mouse.get_rel()
+        self.input.reset_mouse()
+        
+        # Nieuwe posities: niet interpoleren vanaf het vorige level
+        self._save_render_state()
         
     def _start_story(self):
         """Start de story intro voor het huidige level"""
-        self.showing_story = True
+        self.showing_story = not self.skip_story  # Headless: direct spelen
         self.story_complete = False
         self.story_skip_requested = False
         self.story_current_line = 0
         self.story_current_char = 0
-        self.story_char_timer = pygame.time.get_ticks()
+        self.story_char_timer = get_ticks()
         self.story_waiting = False
         self.story_wait_timer = 0
         
         # Haal story uit level data
         story = self.level_data.get('story', [])
-        if not story:
+        if not story or self.skip_story:
             # Geen story, skip
             self.showing_story = False
             return
@@ -249,7 +337,7 @@ class Game:
         if not self.showing_story or self.story_complete:
             return
             
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         # Skip check - toon alles direct
         if self.story_skip_requested:
@@ -289,13 +377,12 @@ class Game:
         # Donkere achtergrond
         self.screen.fill((5, 5, 15))
         
-        # Sterren effect op achtergrond
-        import random
-        random.seed(42)
+        # Sterren effect op achtergrond (vaste eigen generator, raakt de simulatie niet)
+        rng = random.Random(42)
         for _ in range(100):
-            x = random.randint(0, WIDTH)
-            y = random.randint(0, HEIGHT)
-            brightness = random.randint(30, 100)
+            x = rng.randint(0, WIDTH)
+            y = rng.randint(0, HEIGHT)
+            brightness = rng.randint(30, 100)
             pygame.draw.circle(self.screen, (brightness, brightness, brightness), (x, y), 1)
         
         # Level titel bovenaan
@@ -376,7 +463,7 @@ class Game:
             hint = "Press SPACE or CLICK to begin"
             hint_color = (100, 255, 100)
             # Pulseren
-            pulse = (math.sin(pygame.time.get_ticks() * 0.005) + 1) * 0.5
+            pulse = (math.sin(get_ticks() * 0.005) + 1) * 0.5
             hint_alpha = int(150 + pulse * 105)
         else:
             hint = "Press SPACE to skip"
@@ -402,20 +489,26 @@ class Game:
         self.bot_dialogue_active = True
         self.bot_dialogue_message = message
         self.bot_dialogue_bonus = bonus_text
-        self.bot_dialogue_start_time = pygame.time.get_ticks()
+        self.bot_dialogue_start_time = get_ticks()
         
     def handle_events(self):
-        """Verwerk input events"""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        """Verwerk input events van deze frame"""
+        for event_type, value in self.input_frame.events:
+            if event_type == QUIT:
                 self.running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+            elif event_type == KEYDOWN:
+                if value == pygame.K_ESCAPE:
                     self.running = False
                     
+                # Profiler (werkt ook tijdens story en pauze)
+                elif value == pygame.K_F3:
+                    self.profiler.toggle()
+                elif value == pygame.K_F4:
+                    self.profiler.dump_trace()
+                    
                 # Story intro handling
                 elif self.showing_story:
-                    if event.key == pygame.K_SPACE or event.key == pygame.K_RETURN:
+                    if value == pygame.K_SPACE or value == pygame.K_RETURN:
                         if self.story_complete:
                             # Start het level
                             self.showing_story = False
@@ -423,32 +516,40 @@ class Game:
                             # Skip de animatie
                             self.story_skip_requested = True
                             
+                # Pauze en losse stappen (speltijd staat stil)
+                elif value == pygame.K_p:
+                    self.game_clock.toggle_pause()
+                elif value == pygame.K_PERIOD:
+                    self.game_clock.request_step()
+                    
                 # Normale game controls
-                elif event.key == pygame.K_m:
+                elif self.game_clock.paused:
+                    continue
+                elif value == pygame.K_m:
                     self.show_minimap = not self.show_minimap
-                elif event.key == pygame.K_e:
+                elif value == pygame.K_e:
                     # Probeer eerst bot interactie, dan deur
                     if self.friendly_bot_manager:
                         self.friendly_bot_manager.try_interact(self)
                     self.door_manager.interact(self.player.x, self.player.y, self.player.angle)
-                elif event.key == pygame.K_SPACE:
+                elif value == pygame.K_SPACE:
                     self.shoot()
-                elif event.key == pygame.K_1:
+                elif value == pygame.K_1:
                     self.weapons.switch_to(0)  # Pistol
-                elif event.key == pygame.K_2:
+                elif value == pygame.K_2:
                     self.weapons.switch_to(1)  # MachineGun
-                elif event.key == pygame.K_3:
+                elif value == pygame.K_3:
                     self.weapons.switch_to(2)  # Shotgun
-                elif event.key == pygame.K_q:
+                elif value == pygame.K_q:
                     self.weapons.next_weapon()
-                elif event.key == pygame.K_h:
+                elif value == pygame.K_h:
                     self.use_health_pack()
-                elif event.key == pygame.K_i:
+                elif value == pygame.K_i:
                     if self.friendly_bot_manager:
                         self.friendly_bot_manager.try_interact(self.player, self)
                     
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # Left click
+            elif event_type == MOUSEDOWN:
+                if value == 1:  # Left click
                     # Story handling
                     if self.showing_story:
                         if self.story_complete:
@@ -460,7 +561,7 @@ class Game:
                     
     def shoot(self):
         """Schiet met wapen"""
-        if self.game_over or self.victory or self.transitioning:
+        if self.game_over or self.victory or self.transitioning or self.game_clock.paused:
             return
             
         if self.weapons.fire():
@@ -487,7 +588,7 @@ class Game:
                 # Damage number feedback
                 self.enemy_manager.add_damage_number(enemy.x, enemy.y, damage, is_crit)
                 
-                self.hit_marker_time = pygame.time.get_ticks()
+                self.hit_marker_time = get_ticks()
                 
                 if killed:
                     # Register kill voor combo
@@ -498,12 +599,12 @@ class Game:
                         self.kill_text = "DEMON LORD DEFEATED!"
                     else:
                         self.kill_text = "ENEMY KILLED!"
-                    self.kill_text_time = pygame.time.get_ticks()
+                    self.kill_text_time = get_ticks()
                     
                     # Combo bonus toepassen
                     if combo_bonus:
                         self.combo_bonus_text = combo_bonus['name']
-                        self.combo_bonus_time = pygame.time.get_ticks()
+                        self.combo_bonus_time = get_ticks()
                         # Bonus rewards
                         self.player_health = min(self.player_max_health, 
                                                 self.player_health + combo_bonus['health_bonus'])
@@ -515,14 +616,14 @@ class Game:
                             self.victory = True
                         else:
                             self.transitioning = True
-                            self.transition_time = pygame.time.get_ticks()
+                            self.transition_time = get_ticks()
                 else:
                     # Hit feedback tekst
                     if is_crit:
                         self.kill_text = f"CRITICAL HIT! -{damage}"
                     else:
                         self.kill_text = f"HIT! -{damage}"
-                    self.kill_text_time = pygame.time.get_ticks()
+                    self.kill_text_time = get_ticks()
                         
     def use_health_pack(self):
         """Gebruik een health pack uit inventory"""
@@ -535,7 +636,7 @@ class Game:
             self.player_health = min(self.player_max_health, self.player_health + self.health_pack_heal)
             healed = self.player_health - old_health
             self.kill_text = f"+{healed} HP"
-            self.kill_text_time = pygame.time.get_ticks()
+            self.kill_text_time = get_ticks()
                     
     def update(self, dt):
         """Update game state"""
@@ -549,7 +650,7 @@ class Game:
             
         # Check level transitie
         if self.transitioning:
-            current_time = pygame.time.get_ticks()
+            current_time = get_ticks()
             if current_time - self.transition_time > self.transition_duration:
                 self._start_next_level()
             return
@@ -557,25 +658,27 @@ class Game:
         # Check of level compleet is via exit door
         if self.level_data.get('has_quest', False) and self.quest.level_complete and not self.transitioning:
             self.transitioning = True
-            self.transition_time = pygame.time.get_ticks()
+            self.transition_time = get_ticks()
+            self._prefetch_next_theme()
             return
             
-        # Muis beweging - warp muis terug naar centrum voor oneindige rotatie
-        mouse_rel = pygame.mouse.get_rel()
-        self.player.handle_mouse(mouse_rel)
-        pygame.mouse.set_pos(HALF_WIDTH, HALF_HEIGHT)
+        # Muis beweging (de input bron zet de muis terug in het centrum)
+        self.player.handle_mouse(self.input_frame.mouse_rel)
             
         # Speler beweging
-        keys = pygame.key.get_pressed()
+        keys = self.input_frame.keys
         is_moving = keys[pygame.K_w] or keys[pygame.K_s] or keys[pygame.K_a] or keys[pygame.K_d]
         is_moving = is_moving or keys[pygame.K_UP] or keys[pygame.K_DOWN]
         
-        self.player.movement(dt)
+        self.player.movement(dt, keys)
+        self.profiler.lap('player')
         self.door_manager.update(dt)
+        self.profiler.lap('doors')
         self.enemy_manager.update(dt, self.player, self.door_manager)
+        self.profiler.lap('enemies')
         self.weapons.update(dt, is_moving)
-        self.raycaster.raycast(self.player)
-        
+        self.profiler.lap('player')
+
         # Update quest en health packs
         self.quest.update(dt, self.player, self.enemy_manager)
         
@@ -588,14 +691,14 @@ class Game:
         if picked_up:
             self.health_packs_inventory += 1
             self.kill_text = "+1 HEALTH PACK!"
-            self.kill_text_time = pygame.time.get_ticks()
+            self.kill_text_time = get_ticks()
             
         # Check ammo pack pickup (automatisch oppakken)
         ammo_picked = self.quest.try_pickup_ammo_pack(self.player.x, self.player.y)
         if ammo_picked > 0:
             self.weapons.add_ammo_all(ammo_picked)
             self.kill_text = f"+{ammo_picked} AMMO!"
-            self.kill_text_time = pygame.time.get_ticks()
+            self.kill_text_time = get_ticks()
             
         # Check enemy drops pickup
         pickups = self.enemy_manager.check_drop_pickups(self.player.x, self.player.y)
@@ -604,23 +707,24 @@ class Game:
                 self.player_health = min(self.player_max_health, 
                                         self.player_health + pickup['value'])
                 self.kill_text = f"+{pickup['value']} HP!"
-                self.kill_text_time = pygame.time.get_ticks()
+                self.kill_text_time = get_ticks()
             elif pickup['type'] == 'ammo':
                 self.weapons.add_ammo_all(pickup['value'])
                 self.kill_text = f"+{pickup['value']} AMMO!"
-                self.kill_text_time = pygame.time.get_ticks()
+                self.kill_text_time = get_ticks()
             elif pickup['type'] == 'health_pack':
                 self.health_packs_inventory += pickup['value']
                 self.kill_text = "+1 HEALTH PACK!"
-                self.kill_text_time = pygame.time.get_ticks()
+                self.kill_text_time = get_ticks()
+        self.profiler.lap('quest')
         
         # Automatisch vuur (houd muis/spatie ingedrukt)
-        mouse_buttons = pygame.mouse.get_pressed()
+        mouse_buttons = self.input_frame.mouse_buttons
         if mouse_buttons[0] or keys[pygame.K_SPACE]:
             self.shoot()
         
         # Check vijand aanvallen (met invincibility frames)
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         # Alleen schade nemen als niet in invincibility periode
         if current_time - self.invincibility_time > self.invincibility_duration:
@@ -635,6 +739,7 @@ class Game:
                 if self.player_health <= 0:
                     self.player_health = 0
                     self.game_over = True
+        self.profiler.lap('player')
                 
     def _start_next_level(self):
         """Start het volgende level"""
@@ -664,7 +769,7 @@ class Game:
         overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
         
         # Pulserende achtergrond - kleur gebaseerd op volgend level thema
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         next_level_data = get_level_data(self.current_level + 1)
         
         # Thema kleuren
@@ -728,39 +833,57 @@ class Game:
         hint_rect = hint.get_rect(center=(HALF_WIDTH, HALF_HEIGHT + 140))
         self.screen.blit(hint, hint_rect)
         
+    def _build_minimap_layer(self):
+        """Teken achtergrond en muren van de minimap een keer voor het hele level"""
+        tiles = self.tile_map
+        minimap_size = tiles.height * MINIMAP_TILE_SIZE
+        layer = pygame.Surface((max(tiles.width, tiles.height) * MINIMAP_TILE_SIZE + 4, minimap_size + 4),
+                               pygame.SRCALPHA)
+        
+        # Achtergrond
+        pygame.draw.rect(layer, (20, 20, 20), (0, 0, minimap_size + 4, minimap_size + 4))
+        
+        # Muren en lava (deuren veranderen, die komen er elke frame bovenop)
+        for y in range(tiles.height):
+            for x in range(tiles.width):
+                tile = tiles.value(x, y)
+                if not tile or tiles.flags_at(x, y) & TILE_DOOR:
+                    continue
+                if tile == 6:
+                    # Lava/hazard - rood/oranje
+                    color = (200, 80, 30)
+                else:
+                    color = WALL_COLORS.get(tile, (100, 100, 100))
+                pygame.draw.rect(layer, color,
+                               (2 + x * MINIMAP_TILE_SIZE,
+                                2 + y * MINIMAP_TILE_SIZE,
+                                MINIMAP_TILE_SIZE - 1,
+                                MINIMAP_TILE_SIZE - 1))
+        
+        self.minimap_layer = layer
+        self.minimap_doors = tiles.tiles_with_flag(TILE_DOOR)
+        
     def draw_minimap(self):
         """Teken minimap in hoek"""
-        current_map = self.current_map
-        minimap_size = len(current_map) * MINIMAP_TILE_SIZE
+        minimap_size = self.tile_map.height * MINIMAP_TILE_SIZE
         offset_x = 10
         offset_y = HEIGHT - minimap_size - 10
         
-        # Achtergrond
-        pygame.draw.rect(self.screen, (20, 20, 20), 
-                        (offset_x - 2, offset_y - 2, 
-                         minimap_size + 4, minimap_size + 4))
-        
-        # Teken tiles
-        for y, row in enumerate(current_map):
-            for x, tile in enumerate(row):
-                if tile:
-                    if tile == 9:
-                        door = self.door_manager.get_door(x, y)
-                        if door and door.open_amount > 0.5:
-                            color = (100, 70, 45)
-                        else:
-                            color = (180, 120, 80)
-                    elif tile == 6:
-                        # Lava/hazard - rood/oranje
-                        color = (200, 80, 30)
-                    else:
-                        color = WALL_COLORS.get(tile, (100, 100, 100))
-                    
-                    pygame.draw.rect(self.screen, color,
-                                   (offset_x + x * MINIMAP_TILE_SIZE,
-                                    offset_y + y * MINIMAP_TILE_SIZE,
-                                    MINIMAP_TILE_SIZE - 1,
-                                    MINIMAP_TILE_SIZE - 1))
+        # Achtergrond en muren (voorgetekend)
+        self.screen.blit(self.minimap_layer, (offset_x - 2, offset_y - 2))
+        
+        # Deuren
+        for x, y in self.minimap_doors:
+            door = self.door_manager.get_door(x, y)
+            if door and door.open_amount > 0.5:
+                color = (100, 70, 45)
+            else:
+                color = (180, 120, 80)
+            pygame.draw.rect(self.screen, color,
+                           (offset_x + x * MINIMAP_TILE_SIZE,
+                            offset_y + y * MINIMAP_TILE_SIZE,
+                            MINIMAP_TILE_SIZE - 1,
+                            MINIMAP_TILE_SIZE - 1))
         
         # Teken vijanden op minimap met state-gebaseerde kleuren
         for enemy in self.enemy_manager.enemies:
@@ -865,7 +988,7 @@ class Game:
             
     def draw_hud(self):
         """Teken HUD elementen"""
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         # Health bar
         health_width = 200
@@ -1018,7 +1141,7 @@ class Game:
         
     def draw_damage_flash(self):
         """Teken rood flash als speler geraakt wordt + invincibility indicator"""
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         # Rode flash bij schade
         if current_time - self.damage_flash_time < 200:
@@ -1114,12 +1237,26 @@ class Game:
         sub_rect = sub_text.get_rect(center=(HALF_WIDTH, HALF_HEIGHT + 20))
         self.screen.blit(sub_text, sub_rect)
         
+    def draw_pause(self):
+        """Teken pauze scherm"""
+        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 120))
+        self.screen.blit(overlay, (0, 0))
+        
+        text = self.big_font.render("PAUSED", True, (255, 255, 255))
+        text_rect = text.get_rect(center=(HALF_WIDTH, HALF_HEIGHT - 50))
+        self.screen.blit(text, text_rect)
+        
+        sub_text = self.font.render("Press P to continue, . to step one frame", True, (200, 200, 200))
+        sub_rect = sub_text.get_rect(center=(HALF_WIDTH, HALF_HEIGHT + 20))
+        self.screen.blit(sub_text, sub_rect)
+        
     def draw_victory(self):
         """Teken victory scherm"""
         overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
         
         # Kleurrijke gradient effect
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         pulse = (math.sin(current_time * 0.003) + 1) * 0.5
         
         overlay.fill((0, int(40 + pulse * 20), 0, 200))
@@ -1147,22 +1284,65 @@ class Game:
         exit_rect = exit_text.get_rect(center=(HALF_WIDTH, HALF_HEIGHT + 120))
         self.screen.blit(exit_text, exit_rect)
         
-    def draw(self):
-        """Render alles naar scherm"""
+    def draw(self, alpha=1.0):
+        """Render alles naar scherm (alpha: tussen de vorige en huidige simulatie stap)"""
+        self.profiler.mark()
+        
         # Story intro
         if self.showing_story:
             self._draw_story()
-            pygame.display.flip()
+            self.profiler.lap('hud')
+            self._present()
             return
             
+        # Speler tijdelijk op de geïnterpoleerde positie voor camera en minimap
+        sim_x, sim_y = self.player.x, self.player.y
+        prev_x, prev_y = self.prev_player_pos
+        self.player.x = prev_x + (sim_x - prev_x) * alpha
+        self.player.y = prev_y + (sim_y - prev_y) * alpha
+        self._draw_scene(alpha)
+        self.player.x, self.player.y = sim_x, sim_y
+        
+        self._present()
+        
+    def _present(self):
+        """Profiler overlay erover en de frame naar het scherm"""
+        if self.profiler.visible:
+            self.profiler.draw(self.screen, self._profiler_lines())
+            self.profiler.mark()  # De overlay zelf telt niet mee
+        pygame.display.flip()
+        self.profiler.lap('flip')
+        self.profiler.end_frame()
+        
+    def _profiler_lines(self):
+        """Statistieken van AI, zichtlijn en pools voor de profiler overlay"""
+        scheduler = self.enemy_manager.scheduler
+        visibility = self.world.visibility
+        queries = visibility.hits + visibility.misses
+        hit_rate = 100 * visibility.hits / queries if queries else 0
+        lines = [
+            f"sim steps {self.sim_steps}  AI updates {scheduler.updates}  deferred {scheduler.deferred}",
+            f"LOS memo hits {hit_rate:.0f}% of {queries}",
+        ]
+        for stats in pool_stats() + [self.enemy_manager.projectile_system.stats()]:
+            lines.append(f"{stats['name']}: {stats['in_use']} in use, peak {stats['high_water']}, "
+                         f"created {stats['created']}")
+        return lines
+        
+    def _draw_scene(self, alpha):
+        """Render de 3D view, sprites en HUD voor de huidige camera"""
         self.screen.fill(BLACK)
         
-        # Render 3D view
-        self.raycaster.render(self.screen)
+        # Render 3D view (eventueel offscreen op lagere resolutie)
+        view_target = self.view_surface or self.screen
+        self.raycaster.raycast(self.player)
+        self.profiler.lap('raycast')
+        self.raycaster.render(view_target)
+        self.profiler.lap('walls')
         
         # Render sprites (vijanden, crystals en health packs)
         self.sprite_renderer.clear()
-        self.enemy_manager.render(self.sprite_renderer)
+        self.enemy_manager.render(self.sprite_renderer, alpha)
         if self.friendly_bot_manager:
             self.friendly_bot_manager.render(self.sprite_renderer)
         
@@ -1174,7 +1354,13 @@ class Game:
         # Health/ammo packs altijd
         self.quest.render_health_packs(self.sprite_renderer)
         self.quest.render_ammo_packs(self.sprite_renderer)
-        self.sprite_renderer.render(self.screen, self.player, self.raycaster)
+        self.sprite_renderer.render(view_target, self.player, self.raycaster)
+        self.profiler.lap('sprites')
+        
+        # 3D view opschalen naar native resolutie
+        if self.view_surface:
+            pygame.transform.scale(self.view_surface, (WIDTH, HEIGHT), self.screen)
+            self.profiler.lap('walls')
         
         # Damage flash
         self.draw_damage_flash()
@@ -1184,10 +1370,12 @@ class Game:
         
         # Wapen
         self.weapons.render(self.screen)
+        self.profiler.lap('hud')
         
         # Minimap
         if self.show_minimap:
             self.draw_minimap()
+            self.profiler.lap('minimap')
             
         # HUD
         self.draw_hud()
@@ -1215,13 +1403,75 @@ class Game:
         if self.transitioning:
             self.draw_transition()
         
+        if self.game_clock.paused:
+            self.draw_pause()
+        
         # Game over / Victory
         if self.game_over:
             self.draw_game_over()
         elif self.victory:
             self.draw_victory()
-        
-        pygame.display.flip()
+        self.profiler.lap('hud')
+        
+    def advance(self, frame_dt):
+        """
+        Simuleer de speltijd van een render frame in vaste stappen van SIM_DT
+        Geeft alpha terug: hoe ver de render tussen de vorige en huidige stap ligt
+        """
+        self.profiler.begin_frame()
+        instrument.tick()
+        if self.recorder:
+            self.recorder.record_frame(frame_dt)
+        self.sim_accumulator += frame_dt
+        steps = 0
+        while self.sim_accumulator >= SIM_DT:
+            if steps == MAX_SIM_STEPS:
+                # Te ver achter: de rest laten vallen, anders blijft elke frame inhalen
+                self.sim_accumulator %= SIM_DT
+                break
+            self._save_render_state()
+            self.step(SIM_DT)
+            self.sim_accumulator -= SIM_DT
+            steps += 1
+        self.sim_steps = steps
+        
+        # Gepauzeerd (of nog geen hele stap): events toch verwerken, anders blijft pauze hangen
+        if not steps and self.game_clock.paused:
+            self.step(0)
+        return self.sim_accumulator / SIM_DT
+        
+    def _instrument_gauges(self):
+        """Gauges die bij elke instrumentatie flush meegaan"""
+        frames = self.profiler.frame_history
+        gauges = {
+            'fps': round(self.clock.get_fps(), 1),
+            'frame_ms': round(sum(frames) / len(frames), 3) if frames else 0.0,
+            'level': self.current_level,
+            'sim_steps': self.sim_steps,
+            'enemies_alive': self.enemy_manager.alive_count,
+            'projectiles': self.enemy_manager.projectile_system.count,
+        }
+        for name, samples in self.profiler.counter_history.items():
+            if samples:
+                gauges[f'per_frame.{name}'] = round(sum(samples) / len(samples), 1)
+        return gauges
+        
+    def _save_render_state(self):
+        """Onthoud de posities van voor de volgende simulatie stap"""
+        self.prev_player_pos = (self.player.x, self.player.y)
+        self.enemy_manager.save_render_state()
+        
+    def step(self, dt):
+        """Een simulatie stap van dt ms speltijd: klok, input, events en game state"""
+        self.game_clock.advance(dt)
+        self.profiler.mark()
+        self.input_frame = self.input.poll(dt)
+        if self.recorder:
+            self.recorder.record_step(dt, self.input_frame)
+        self.handle_events()
+        self.profiler.lap('input')
+        if dt > 0:
+            self.update(dt)
         
     def run(self):
         """Main game loop"""
@@ -1239,6 +1489,8 @@ class Game:
         print("  H           - Gebruik Health Pack (+35 HP)")
         print("  E           - Open/sluit deur")
         print("  M           - Minimap toggle")
+        print("  P           - Pauze (. = een frame verder)")
+        print("  F3/F4       - Profiler overlay / trace opslaan")
         print("  ESC         - Afsluiten")
         print("\n" + "="*60)
         print(f"\n  LEVELS: {self.total_levels} realms to conquer!")
@@ -1250,16 +1502,37 @@ class Game:
         print("="*60 + "\n")
         
         while self.running:
-            dt = self.clock.tick(FPS)
+            # Wandtijd van de frame omzetten naar speltijd (pauze, time scale)
+            frame_dt = self.game_clock.frame_dt(self.clock.tick(FPS))
             
-            self.handle_events()
-            self.update(dt)
-            self.draw()
+            # Render schaal bijstellen op de werkelijke frame tijd (zonder wachttijd van tick)
+            if self.dynamic_resolution and not self.showing_story:
+                if self.dynamic_resolution.update(self.clock.get_rawtime()):
+                    self.set_render_scale(self.dynamic_resolution.render_scale)
+            
+            alpha = self.advance(frame_dt)
+            self.draw(alpha)
             
+        if self.recorder:
+            self.recorder.close(self)
+        instrument.disable()
         pygame.quit()
         sys.exit()
 
 
 if __name__ == "__main__":
-    game = Game()
+    import argparse
+    parser = argparse.ArgumentParser(description="DOOMIE - A DOOM-like Game")
+    parser.add_argument('--record', metavar='PATH', help="Neem de sessie op voor replay.py")
+    parser.add_argument('--seed', type=int, help="Seed voor alle toeval in de simulatie")
+    parser.add_argument('--instrument', metavar='TARGET',
+                        help="Telemetrie naar file:PAD of udp://HOST:PORT (zie instrument.py)")
+    args = parser.parse_args()
+    if args.instrument:
+        instrument.enable(args.instrument)
+    
+    game = Game(seed=args.seed, deterministic=args.record is not None)
+    if args.record:
+        from replay import Recorder
+        game.recorder = Recorder(args.record, game)
     game.run()
@@ -7,6 +7,8 @@
 # 5 = metalen muur / industrial
 # 6 = lava (hell thema)
 # 9 = deur
+import math
+import numpy as np
 
 # Mini map schaal
 MINIMAP_SCALE = 5
@@ -40,36 +42,135 @@ MAP = [
     [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
 ]
 
+# Tile flags (voorberekend per tile waarde)
+TILE_SOLID = 1  # Blokkeert beweging (muren en lava, 1-6)
+TILE_DOOR = 2  # Deur (9), passeerbaarheid hangt af van de DoorManager
+TILE_LAVA = 4  # Lava (6)
+TILE_BLOCKS_LOS = 8  # Blokkeert zicht (deuren alleen via de DoorManager)
+TILE_BLOCKS_PROJECTILE = 16  # Kogels en vuurballen stoppen hier (deuren niet)
+
+OUTSIDE_VALUE = 1  # Buiten de map = muur
+
+
+def _flags_for_value(value):
+    """Flag bits voor een tile waarde"""
+    flags = 0
+    if 1 <= value <= 6:
+        flags |= TILE_SOLID | TILE_BLOCKS_LOS | TILE_BLOCKS_PROJECTILE
+    if value == 6:
+        flags |= TILE_LAVA
+    if value == 9:
+        flags |= TILE_DOOR
+    return flags
+
+
+# Opzoektabel tile waarde -> flags
+TILE_FLAG_TABLE = np.array([_flags_for_value(value) for value in range(256)], dtype=np.uint8)
+OUTSIDE_FLAGS = _flags_for_value(OUTSIDE_VALUE)
+
+
+class TileMap:
+    """
+    Level map als platte uint8 arrays: tile waarden en voorberekende flags
+    values / flags zijn (hoogte, breedte) NumPy arrays voor bulk gebruik
+    (raycaster, projectielen, pathfinding); de scalaire accessors lezen uit
+    platte bytes zonder per aanroep de afmetingen te berekenen.
+    De map verandert niet na het laden (deuren bewegen via de DoorManager).
+    """
+    
+    def __init__(self, grid):
+        self.grid = grid  # Originele geneste lijst
+        self.height = len(grid)
+        self.width = len(grid[0]) if grid else 0
+        self.values = np.array(grid, dtype=np.uint8).reshape(self.height, self.width)
+        self.flags = TILE_FLAG_TABLE[self.values]
+        self._value_bytes = self.values.tobytes()
+        self._flag_bytes = self.flags.tobytes()
+        
+    def value(self, x, y):
+        """Tile waarde op (x, y), OUTSIDE_VALUE buiten de map"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self._value_bytes[int(y) * self.width + int(x)]
+        return OUTSIDE_VALUE
+    
+    def flags_at(self, x, y):
+        """Flag bits op (x, y), OUTSIDE_FLAGS buiten de map"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self._flag_bytes[int(y) * self.width + int(x)]
+        return OUTSIDE_FLAGS
+    
+    def is_solid(self, x, y):
+        return bool(self.flags_at(x, y) & TILE_SOLID)
+    
+    def is_door(self, x, y):
+        return bool(self.flags_at(x, y) & TILE_DOOR)
+    
+    def region_flags(self, x0, y0, x1, y1):
+        """OR van de flags van alle tiles die de rechthoek (x0, y0)-(x1, y1) raakt"""
+        flags = 0
+        for tile_y in range(math.floor(y0), math.floor(y1) + 1):
+            for tile_x in range(math.floor(x0), math.floor(x1) + 1):
+                flags |= self.flags_at(tile_x, tile_y)
+        return flags
+    
+    def region(self, x0, y0, x1, y1):
+        """Flags van een blok tiles als array (x1, y1 exclusief, geknipt op de map randen)"""
+        return self.flags[max(0, y0):max(0, y1), max(0, x0):max(0, x1)]
+    
+    def tiles_with_flag(self, flag):
+        """Alle (x, y) tiles met een flag, rij voor rij"""
+        return [(int(x), int(y)) for y, x in np.argwhere(self.flags & flag)]
+
+
 # Actieve map (kan dynamisch veranderd worden)
 _active_map = MAP
+_active_tiles = TileMap(MAP)
+
 
 MAP_WIDTH = len(MAP[0])
 MAP_HEIGHT = len(MAP)
 
 
 def set_active_map(new_map):
-    """Stel de actieve map in voor het huidige level"""
-    global _active_map, MAP_WIDTH, MAP_HEIGHT
+    """Stel de actieve map in voor het huidige level (geneste lijst of TileMap)"""
+    global _active_map, _active_tiles, MAP_WIDTH, MAP_HEIGHT
+    if isinstance(new_map, TileMap):
+        _active_tiles = new_map
+        new_map = new_map.grid
+    else:
+        _active_tiles = TileMap(new_map if new_map else MAP)
     _active_map = new_map
     MAP_WIDTH = len(new_map[0]) if new_map else 24
     MAP_HEIGHT = len(new_map) if new_map else 24
 
 
+def get_active_map():
+    """Geeft de actieve map terug"""
+    return _active_map
+
+
+def get_active_tiles():
+    """Geeft de TileMap van de actieve map terug"""
+    return _active_tiles
+
+
 def get_map_value(x, y, game_map=None):
-    """Geeft de waarde van een map tile terug"""
-    current_map = game_map if game_map else _active_map
-    width = len(current_map[0]) if current_map else 24
-    height = len(current_map) if current_map else 24
+    """Geeft de waarde van een map tile terug (game_map: TileMap, geneste lijst of None)"""
+    if not game_map:
+        return _active_tiles.value(x, y)
+    if isinstance(game_map, TileMap):
+        return game_map.value(x, y)
     
+    width = len(game_map[0])
+    height = len(game_map)
     if 0 <= x < width and 0 <= y < height:
-        return current_map[int(y)][int(x)]
-    return 1  # Buiten de map = muur
+        return game_map[int(y)][int(x)]
+    return OUTSIDE_VALUE  # Buiten de map = muur
 
 
 def is_wall(x, y, game_map=None):
     """Checkt of een positie een muur is (1-6, niet 0 en niet deur 9)"""
-    val = get_map_value(x, y, game_map)
-    return val >= 1 and val <= 6  # 1-6 = muur/lava types, 9 = deur
+    return bool(TILE_FLAG_TABLE[get_map_value(x, y, game_map)] & TILE_SOLID)  # 1-6 = muur/lava types
 
 
 def is_door(x, y, game_map=None):
@@ -0,0 +1,137 @@
+"""
+Flow field pathfinding - Een BFS veld vanaf de tile van de speler
+Elke tile weet welke buurtile een stap dichter bij de speler ligt, zodat
+elke achtervolgende vijand in O(1) een richting kan opvragen. Het veld
+wordt alleen opnieuw berekend als de speler van tile wisselt of als een
+deur open of dicht gaat.
+"""
+import math
+from collections import deque
+from settings import *
+from map import get_active_tiles, TILE_DOOR
+
+# Buren: eerst recht, dan diagonaal (diagonaal alleen zonder hoek af te snijden)
+STRAIGHT_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DIAGONAL_STEPS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class FlowField:
+    """Afstand- en richtingsveld naar de speler, gedeeld door alle vijanden"""
+
+    def __init__(self, tile_map=None, door_manager=None):
+        self.tile_map = tile_map
+        self.door_manager = door_manager
+        self.width = 0
+        self.height = 0
+        self.distance = []  # Stappen tot de speler per tile (-1 = onbereikbaar)
+        self.next_tile = []  # Index van de volgende tile richting speler (-1 = geen)
+        self.target_tile = None
+        self.door_epoch = None
+        self.rebuilds = 0
+
+    def update(self, target_x, target_y):
+        """Bereken het veld opnieuw als de speler van tile wisselt of een deur veranderde"""
+        target_tile = (int(target_x), int(target_y))
+        door_epoch = self.door_manager.epoch if self.door_manager else 0
+        if target_tile == self.target_tile and door_epoch == self.door_epoch:
+            return
+
+        self.target_tile = target_tile
+        self.door_epoch = door_epoch
+        self._rebuild()
+
+    def _walkable_tiles(self, tiles):
+        """Platte lijst: kan een vijand op deze tile staan (vloer, of een deur die open genoeg is)"""
+        walkable = (tiles.values == 0).ravel().tolist()
+        if self.door_manager is not None:
+            for x, y in tiles.tiles_with_flag(TILE_DOOR):
+                walkable[y * tiles.width + x] = self.door_manager.can_pass(x, y)
+        return walkable
+
+    def _rebuild(self):
+        """BFS vanaf de tile van de speler over het hele grid"""
+        self.rebuilds += 1
+        tiles = self.tile_map if self.tile_map else get_active_tiles()
+        width = tiles.width
+        height = tiles.height
+        self.width = width
+        self.height = height
+
+        walkable = self._walkable_tiles(tiles)
+        distance = [-1] * (width * height)
+        next_tile = [-1] * (width * height)
+
+        target_x, target_y = self.target_tile
+        if not (0 <= target_x < width and 0 <= target_y < height):
+            self.distance = distance
+            self.next_tile = next_tile
+            return
+
+        start = target_y * width + target_x
+        distance[start] = 0
+        queue = deque([(target_x, target_y)])
+        while queue:
+            x, y = queue.popleft()
+            current = y * width + x
+            for step_x, step_y in STRAIGHT_STEPS:
+                nx = x + step_x
+                ny = y + step_y
+                if 0 <= nx < width and 0 <= ny < height:
+                    neighbour = ny * width + nx
+                    if distance[neighbour] < 0 and (walkable[neighbour] or neighbour == start):
+                        distance[neighbour] = distance[current] + 1
+                        queue.append((nx, ny))
+
+        # Per tile de buur met de kleinste afstand (diagonaal als beide rechte buren vrij zijn)
+        for y in range(height):
+            for x in range(width):
+                index = y * width + x
+                if distance[index] <= 0:
+                    continue
+                best = -1
+                best_distance = distance[index]
+                for step_x, step_y in STRAIGHT_STEPS + DIAGONAL_STEPS:
+                    nx = x + step_x
+                    ny = y + step_y
+                    if not (0 <= nx < width and 0 <= ny < height):
+                        continue
+                    neighbour = ny * width + nx
+                    if distance[neighbour] < 0:
+                        continue
+                    if step_x and step_y:
+                        if distance[y * width + nx] < 0 or distance[ny * width + x] < 0:
+                            continue
+                    if distance[neighbour] < best_distance:
+                        best = neighbour
+                        best_distance = distance[neighbour]
+                next_tile[index] = best
+
+        self.distance = distance
+        self.next_tile = next_tile
+
+    def steps_to_target(self, x, y):
+        """Aantal tile stappen naar de speler (None als onbereikbaar)"""
+        tile_x, tile_y = int(x), int(y)
+        if not (0 <= tile_x < self.width and 0 <= tile_y < self.height):
+            return None
+        steps = self.distance[tile_y * self.width + tile_x]
+        return steps if steps >= 0 else None
+
+    def direction(self, x, y):
+        """
+        Eenheidsvector vanaf (x, y) naar het midden van de volgende tile op het pad
+        (0, 0) als er geen pad is of als (x, y) al op de tile van de speler staat
+        """
+        tile_x, tile_y = int(x), int(y)
+        if not (0 <= tile_x < self.width and 0 <= tile_y < self.height):
+            return 0.0, 0.0
+        next_index = self.next_tile[tile_y * self.width + tile_x]
+        if next_index < 0:
+            return 0.0, 0.0
+
+        dx = next_index % self.width + 0.5 - x
+        dy = next_index // self.width + 0.5 - y
+        length = math.sqrt(dx*dx + dy*dy)
+        if length < 0.0001:
+            return 0.0, 0.0
+        return dx / length, dy / length
@@ -1,7 +1,7 @@
 import pygame
 import math
 from settings import *
-from map import is_wall, is_door
+from map import get_active_tiles, TILE_SOLID, TILE_DOOR
 
 
 class Player:
@@ -10,7 +10,7 @@ class Player:
         self.angle = PLAYER_ANGLE
         self.pitch = 0  # Verticale kijkhoek (-200 tot 200 pixels offset)
         self.door_manager = None
-        self.game_map = None  # Dynamische map referentie
+        self.tile_map = None  # TileMap van het huidige level
         
         # Muis instellingen
         self.mouse_sensitivity = 0.003
@@ -21,12 +21,12 @@ class Player:
         """Stel door manager in voor collision checking"""
         self.door_manager = door_manager
         
-    def set_map(self, game_map):
-        """Stel de actieve map in voor collision detection"""
-        self.game_map = game_map
+    def set_map(self, tile_map):
+        """Stel de TileMap van het level in voor collision detection"""
+        self.tile_map = tile_map
         
-    def movement(self, dt):
-        """Verwerk speler beweging"""
+    def movement(self, dt, keys=None):
+        """Verwerk speler beweging (keys: ingedrukte toetsen, standaard van pygame)"""
         sin_a = math.sin(self.angle)
         cos_a = math.cos(self.angle)
         
@@ -37,7 +37,8 @@ class Player:
         
         dx, dy = 0, 0
         
-        keys = pygame.key.get_pressed()
+        if keys is None:
+            keys = pygame.key.get_pressed()
         
         # Vooruit/achteruit
         if keys[pygame.K_w] or keys[pygame.K_UP]:
@@ -92,12 +93,15 @@ class Player:
             
     def can_move_to(self, x, y):
         """Check of speler naar positie kan bewegen"""
+        tiles = self.tile_map or get_active_tiles()
+        flags = tiles.flags_at(x, y)
+        
         # Check muren
-        if is_wall(x, y, self.game_map):
+        if flags & TILE_SOLID:
             return False
             
         # Check deuren
-        if is_door(x, y, self.game_map):
+        if flags & TILE_DOOR:
             if self.door_manager:
                 return self.door_manager.can_pass(x, y)
             return False
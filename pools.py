@@ -0,0 +1,61 @@
+"""
+Object pools - Herbruikbare instances voor kortlevende entities
+Damage numbers en drops worden bij elke treffer of kill gemaakt en kort
+daarna weggegooid. Een pool bewaart losgelaten instances en zet ze via
+reset() opnieuw klaar, zodat er in drukke gevechten geen nieuwe objecten
+(en dus geen GC pieken) bij komen.
+"""
+from settings import *
+
+# Alle pools, voor statistieken (high-water marks)
+_pools = []
+
+
+class ObjectPool:
+    """
+    Pool voor een klasse met reset(*args) die dezelfde argumenten als __init__ neemt
+    acquire() geeft een klaargezette instance, release() geeft hem terug
+    """
+
+    def __init__(self, factory, name=None):
+        self.factory = factory
+        self.name = name or factory.__name__
+        self.free = []
+        self.in_use = 0
+        self.high_water = 0  # Meeste instances tegelijk in gebruik
+        self.created = 0  # Aantal keer dat de factory nodig was
+        _pools.append(self)
+
+    def acquire(self, *args):
+        """Haal een instance uit de pool (of maak er een) en reset hem met args"""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+        else:
+            obj = self.factory(*args)
+            self.created += 1
+
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        """Geef een instance terug; de aanroeper mag hem daarna niet meer gebruiken"""
+        self.in_use -= 1
+        self.free.append(obj)
+
+    def stats(self):
+        """Gebruik van de pool als dict"""
+        return {
+            'name': self.name,
+            'in_use': self.in_use,
+            'free': len(self.free),
+            'high_water': self.high_water,
+            'created': self.created,
+        }
+
+
+def pool_stats():
+    """Statistieken van alle pools"""
+    return [pool.stats() for pool in _pools]
@@ -0,0 +1,194 @@
+"""
+Frame profiler - Waar gaat de frame tijd heen, op de eigen hardware
+De game loop zet met lap() de wandtijd sinds het vorige punt op een stage
+(input, player, doors, ...). Per frame komen daar tellers bij (rays, kolom
+blits, sprites, surfaces, zichtlijn queries). De overlay (F3) toont het
+rollende gemiddelde per stage, een frame tijd grafiek en de tellers; F4
+schrijft de laatste seconden als Chrome trace (chrome://tracing, Perfetto).
+"""
+import json
+import time
+from collections import deque
+import pygame
+from settings import *
+
+# Volgorde van de stages in de overlay
+STAGES = ('input', 'player', 'doors', 'enemies', 'quest', 'raycast', 'walls',
+          'sprites', 'minimap', 'hud', 'flip')
+COUNTERS = ('rays', 'columns', 'sprites', 'surfaces', 'los')
+
+# Tellers van de huidige frame; count() is een dict increment, dus altijd aan
+_counts = dict.fromkeys(COUNTERS, 0)
+
+
+def count(name, amount=1):
+    """Tel amount op bij een teller van de huidige frame"""
+    _counts[name] += amount
+
+
+class FrameProfiler:
+    """Tijd per stage en tellers per frame, met overlay en trace export"""
+
+    def __init__(self, history=PROFILER_HISTORY, trace_seconds=PROFILER_TRACE_SECONDS):
+        self.visible = False
+        self.history = {stage: deque(maxlen=history) for stage in STAGES}
+        self.frame_history = deque(maxlen=history)  # Werktijd per frame in ms
+        self.counter_history = {name: deque(maxlen=history) for name in COUNTERS}
+        self.trace_seconds = trace_seconds
+        self.trace = deque()  # (naam, start, duur) in seconden perf_counter tijd
+        self.counter_trace = deque()  # (tijd, tellers)
+        self.stage_ms = dict.fromkeys(STAGES, 0.0)
+        self.frame_start = None
+        self.mark_time = time.perf_counter()
+        self.panel = None  # Gecachte overlay, ververst om de PROFILER_REFRESH_MS
+        self.panel_time = 0.0
+        self.last_trace_path = None
+
+    def begin_frame(self):
+        """Start een frame (sluit de vorige af als end_frame niet aangeroepen is)"""
+        if self.frame_start is not None:
+            self.end_frame()
+        self.frame_start = self.mark_time = time.perf_counter()
+
+    def mark(self):
+        """Begin een nieuw meetpunt zonder de tijd tot nu toe aan een stage te geven"""
+        self.mark_time = time.perf_counter()
+
+    def lap(self, stage):
+        """Tijd sinds het vorige meetpunt gaat naar stage (telt op binnen de frame)"""
+        now = time.perf_counter()
+        start = self.mark_time
+        self.stage_ms[stage] += (now - start) * 1000
+        self.trace.append((stage, start, now - start))
+        self.mark_time = now
+
+    def end_frame(self):
+        """Sluit de frame af: stage tijden en tellers naar de geschiedenis"""
+        if self.frame_start is None:
+            return
+        now = time.perf_counter()
+        self.trace.append(('frame', self.frame_start, now - self.frame_start))
+        self.frame_history.append((now - self.frame_start) * 1000)
+        for stage, ms in self.stage_ms.items():
+            self.history[stage].append(ms)
+            self.stage_ms[stage] = 0.0
+        self.counter_trace.append((now, dict(_counts)))
+        for name in COUNTERS:
+            self.counter_history[name].append(_counts[name])
+            _counts[name] = 0
+        self.frame_start = None
+
+        # Alleen de laatste trace_seconds bewaren
+        cutoff = now - self.trace_seconds
+        while self.trace and self.trace[0][1] < cutoff:
+            self.trace.popleft()
+        while self.counter_trace and self.counter_trace[0][0] < cutoff:
+            self.counter_trace.popleft()
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.panel = None
+
+    def dump_trace(self, path=None):
+        """Schrijf de laatste seconden als Chrome trace-event JSON; geeft het pad terug"""
+        if path is None:
+            path = time.strftime('doomie_trace_%Y%m%d_%H%M%S.json')
+        events = []
+        for name, start, duration in self.trace:
+            events.append({'name': name, 'cat': 'frame' if name == 'frame' else 'stage', 'ph': 'X',
+                           'ts': round(start * 1e6, 1), 'dur': round(duration * 1e6, 1),
+                           'pid': 1, 'tid': 1})
+        for timestamp, counts in self.counter_trace:
+            events.append({'name': 'counters', 'ph': 'C', 'ts': round(timestamp * 1e6, 1),
+                           'pid': 1, 'tid': 1, 'args': counts})
+        # Frames eerst bij gelijke start, zodat de viewer de stages eronder nest
+        events.sort(key=lambda event: (event['ts'], event['name'] != 'frame'))
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        self.last_trace_path = path
+        print(f"Wrote profiler trace ({len(events)} events) to {path}")
+        return path
+
+    def averages(self):
+        """Gemiddelde ms per stage over de geschiedenis"""
+        return {stage: sum(samples) / len(samples) if samples else 0.0
+                for stage, samples in self.history.items()}
+
+    def draw(self, screen, extra_lines=()):
+        """Teken de overlay (extra_lines: regels met statistieken van de game)"""
+        now = time.perf_counter()
+        if self.panel is None or (now - self.panel_time) * 1000 >= PROFILER_REFRESH_MS:
+            self.panel = self._build_panel(extra_lines)
+            self.panel_time = now
+        screen.blit(self.panel, (PROFILER_PANEL_X, PROFILER_PANEL_Y))
+
+    def _build_panel(self, extra_lines):
+        """Render de overlay naar een surface (niet elke frame: tekst renderen is duur)"""
+        from sprites import get_font  # Hier pas: sprites telt zelf met count() uit deze module
+        font = get_font(18)
+        line_height = 16
+        width = PROFILER_PANEL_WIDTH
+        graph_height = 60
+        rows = len(STAGES) + 3 + len(extra_lines)
+        panel = pygame.Surface((width, rows * line_height + graph_height + 24), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+
+        # Stages: gemiddelde en piek in ms, en een balk t.o.v. het frame budget
+        averages = self.averages()
+        y = 4
+        bar_x = 160
+        bar_width = width - bar_x - 8
+        for stage in STAGES:
+            average = averages[stage]
+            peak = max(self.history[stage], default=0.0)
+            panel.blit(font.render(stage, True, (220, 220, 220)), (6, y))
+            panel.blit(font.render(f"{average:.2f}", True, (220, 220, 220)), (70, y))
+            panel.blit(font.render(f"{peak:.2f}", True, (150, 150, 150)), (115, y))
+            fill = int(min(1.0, average / FRAME_BUDGET_MS) * bar_width)
+            pygame.draw.rect(panel, (60, 60, 60), (bar_x, y + 3, bar_width, line_height - 6))
+            pygame.draw.rect(panel, (100, 170, 255), (bar_x, y + 3, fill, line_height - 6))
+            y += line_height
+
+        # Frame werktijd
+        frames = self.frame_history
+        frame_average = sum(frames) / len(frames) if frames else 0.0
+        panel.blit(font.render('frame', True, (255, 255, 255)), (6, y))
+        panel.blit(font.render(f"{frame_average:.2f}", True, (255, 255, 255)), (70, y))
+        panel.blit(font.render(f"{max(frames, default=0.0):.2f}", True, (150, 150, 150)), (115, y))
+        panel.blit(font.render(f"budget {FRAME_BUDGET_MS:.1f} ms", True, (150, 150, 150)), (bar_x, y))
+        y += line_height
+
+        # Tellers (gemiddeld per frame)
+        counts = [f"{name} {sum(samples) / len(samples) if samples else 0:.0f}"
+                  for name, samples in self.counter_history.items()]
+        panel.blit(font.render('  '.join(counts), True, (180, 220, 255)), (6, y))
+        y += line_height + 4
+
+        # Frame tijd grafiek: een balk per frame, lijn op het budget
+        scale = graph_height / (FRAME_BUDGET_MS * 2)
+        graph_y = y + graph_height
+        pygame.draw.rect(panel, (30, 30, 30), (6, y, width - 12, graph_height))
+        bar = max(1, (width - 12) // max(1, frames.maxlen))
+        for index, ms in enumerate(frames):
+            height = min(graph_height, int(ms * scale))
+            pygame.draw.rect(panel, self._color(ms / FRAME_BUDGET_MS),
+                             (6 + index * bar, graph_y - height, bar, height))
+        budget_y = graph_y - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(panel, (255, 255, 255), (6, budget_y), (width - 7, budget_y))
+        y = graph_y + 4
+
+        for line in extra_lines:
+            panel.blit(font.render(line, True, (200, 200, 200)), (6, y))
+            y += line_height
+        if self.last_trace_path:
+            panel.blit(font.render(f"trace: {self.last_trace_path}", True, (150, 150, 150)), (6, y))
+        return panel
+
+    @staticmethod
+    def _color(load):
+        """Groen onder het budget, geel tot anderhalf keer, daarboven rood"""
+        if load <= 1.0:
+            return (80, 200, 80)
+        if load <= 1.5:
+            return (230, 200, 60)
+        return (230, 70, 60)
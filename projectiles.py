@@ -0,0 +1,214 @@
+"""
+Projectiel systeem - Alle vijandelijke kogels en vuurballen in NumPy arrays
+Posities, snelheden, levensduur, schade en eigenaar staan per slot in een
+array; vrije slots worden hergebruikt. Beweging, muur botsingen en de hit
+test tegen de speler gebeuren in een vectorized pass per frame in plaats
+van per object.
+"""
+import math
+import numpy as np
+from settings import *
+from map import get_active_tiles, TILE_BLOCKS_PROJECTILE
+from sprites import get_enemy_bullet_sprite, get_fireball_frames
+from game_clock import get_ticks
+
+# Soorten projectielen
+BULLET = 0  # Kogel van een gewone vijand
+FIREBALL = 1  # Vuurbal van de boss
+
+# Eigenschappen per soort (zelfde waarden als de oude EnemyBullet en Projectile)
+HIT_RANGE = {BULLET: 0.35, FIREBALL: 0.5}  # Kleinere hit range voor eerlijkere gameplay
+MAX_LIFETIME = {BULLET: 5000, FIREBALL: 8000}  # ms
+RENDER_SCALE_BY_KIND = {BULLET: 0.15, FIREBALL: 0.4}
+
+
+class ProjectileSystem:
+    """Pool van projectielen als structure-of-arrays, gedeeld door alle vijanden"""
+
+    def __init__(self, capacity=PROJECTILE_POOL_SIZE, tile_map=None):
+        self.tile_map = tile_map  # Map van het level (None = actieve map)
+        self.capacity = 0
+        self.count = 0  # Aantal levende projectielen
+        self.high_water = 0  # Meeste projectielen tegelijk
+        self.free_slots = []
+        self.owners = []  # Per slot de vijand die schoot (None = vrij)
+        self.wall_grid = None
+        self.wall_grid_source = None
+
+        # Gedeelde sprites: een per kogel kleur, vuurbal frames per glow stap
+        self.fireball_frames = get_fireball_frames()
+
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.prev_x = np.zeros(0)  # Positie voor de laatste stap (render interpolatie)
+        self.prev_y = np.zeros(0)
+        self.vx = np.zeros(0)
+        self.vy = np.zeros(0)
+        self.lifetime = np.zeros(0)
+        self.max_lifetime = np.zeros(0)
+        self.damage = np.zeros(0, dtype=np.int32)
+        self.hit_range = np.zeros(0)
+        self.kind = np.zeros(0, dtype=np.int8)
+        self.alive = np.zeros(0, dtype=bool)
+        self.colors = []  # Per slot de kogel kleur (sprite sleutel)
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        """Maak de arrays groter; nieuwe slots komen achteraan de vrije lijst"""
+        extra = capacity - self.capacity
+        self.x = np.concatenate([self.x, np.zeros(extra)])
+        self.y = np.concatenate([self.y, np.zeros(extra)])
+        self.prev_x = np.concatenate([self.prev_x, np.zeros(extra)])
+        self.prev_y = np.concatenate([self.prev_y, np.zeros(extra)])
+        self.vx = np.concatenate([self.vx, np.zeros(extra)])
+        self.vy = np.concatenate([self.vy, np.zeros(extra)])
+        self.lifetime = np.concatenate([self.lifetime, np.zeros(extra)])
+        self.max_lifetime = np.concatenate([self.max_lifetime, np.zeros(extra)])
+        self.damage = np.concatenate([self.damage, np.zeros(extra, dtype=np.int32)])
+        self.hit_range = np.concatenate([self.hit_range, np.zeros(extra)])
+        self.kind = np.concatenate([self.kind, np.zeros(extra, dtype=np.int8)])
+        self.alive = np.concatenate([self.alive, np.zeros(extra, dtype=bool)])
+        self.owners.extend([None] * extra)
+        self.colors.extend([None] * extra)
+
+        # Laagste slot eerst uitgeven (pop van het einde)
+        self.free_slots = list(range(capacity - 1, self.capacity - 1, -1)) + self.free_slots
+        self.capacity = capacity
+
+    def spawn(self, owner, x, y, target_x, target_y, damage, speed, kind=BULLET, color=None):
+        """Schiet een projectiel van (x, y) richting (target_x, target_y)"""
+        if not self.free_slots:
+            self._grow(self.capacity * 2)
+        slot = self.free_slots.pop()
+
+        dx = target_x - x
+        dy = target_y - y
+        dist = math.sqrt(dx*dx + dy*dy)
+        if dist > 0:
+            dir_x = dx / dist
+            dir_y = dy / dist
+        else:
+            dir_x = 0
+            dir_y = 1
+
+        self.x[slot] = x
+        self.y[slot] = y
+        self.prev_x[slot] = x
+        self.prev_y[slot] = y
+        self.vx[slot] = dir_x * speed
+        self.vy[slot] = dir_y * speed
+        self.lifetime[slot] = 0
+        self.max_lifetime[slot] = MAX_LIFETIME[kind]
+        self.damage[slot] = damage
+        self.hit_range[slot] = HIT_RANGE[kind]
+        self.kind[slot] = kind
+        self.alive[slot] = True
+        self.owners[slot] = owner
+        self.colors[slot] = color
+        self.count += 1
+        if self.count > self.high_water:
+            self.high_water = self.count
+        return slot
+
+    def _free(self, slots):
+        """Geef slots terug aan de pool"""
+        for slot in slots.tolist():
+            self.owners[slot] = None
+            self.colors[slot] = None
+            self.free_slots.append(slot)
+        self.alive[slots] = False
+        self.count -= len(slots)
+
+    def _get_wall_grid(self):
+        """Bool grid van tiles die projectielen stoppen, opnieuw gemaakt als de map wisselt"""
+        tiles = self.tile_map if self.tile_map is not None else get_active_tiles()
+        if tiles is not self.wall_grid_source:
+            self.wall_grid = (tiles.flags & TILE_BLOCKS_PROJECTILE) != 0
+            self.wall_grid_source = tiles
+        return self.wall_grid
+
+    def update(self, dt):
+        """Beweeg alle projectielen, verwijder verlopen en tegen een muur gebotste"""
+        if not self.count:
+            return
+        active = np.flatnonzero(self.alive)
+
+        self.lifetime[active] += dt
+        self.prev_x[active] = self.x[active]
+        self.prev_y[active] = self.y[active]
+        self.x[active] += self.vx[active] * dt
+        self.y[active] += self.vy[active] * dt
+
+        walls = self._get_wall_grid()
+        height, width = walls.shape
+        tile_x = np.floor(self.x[active]).astype(np.intp)
+        tile_y = np.floor(self.y[active]).astype(np.intp)
+        inside = (tile_x >= 0) & (tile_x < width) & (tile_y >= 0) & (tile_y < height)
+        hit_wall = ~inside  # Buiten de map = muur
+        hit_wall[inside] = walls[tile_y[inside], tile_x[inside]]
+
+        dead = hit_wall | (self.lifetime[active] > self.max_lifetime[active])
+        if dead.any():
+            self._free(active[dead])
+
+    def hit_test(self, player_x, player_y):
+        """
+        Projectielen die de speler raken in een pass: ze verdwijnen en de schade
+        wordt per schutter opgeteld ({vijand: schade}). Kogels van dode of
+        stervende vijanden doen geen schade meer.
+        """
+        if not self.count:
+            return {}
+        dx = self.x - player_x
+        dy = self.y - player_y
+        hits = np.flatnonzero(self.alive & (dx*dx + dy*dy < self.hit_range * self.hit_range))
+        if not len(hits):
+            return {}
+
+        damage_by_owner = {}
+        hit_slots = []
+        for slot in hits.tolist():
+            owner = self.owners[slot]
+            if not owner.alive or owner.state in ('dead', 'dying'):
+                continue
+            damage_by_owner[owner] = damage_by_owner.get(owner, 0) + int(self.damage[slot])
+            hit_slots.append(slot)
+        if hit_slots:
+            self._free(np.array(hit_slots, dtype=np.intp))
+        return damage_by_owner
+
+    def remove_owner(self, owner):
+        """Haal alle projectielen van een vijand weg (bijv. als hij dood is)"""
+        slots = [slot for slot in np.flatnonzero(self.alive).tolist() if self.owners[slot] is owner]
+        if slots:
+            self._free(np.array(slots, dtype=np.intp))
+
+    def stats(self):
+        """Gebruik van de pool als dict (zelfde velden als ObjectPool.stats)"""
+        return {
+            'name': 'Projectile',
+            'in_use': self.count,
+            'free': len(self.free_slots),
+            'high_water': self.high_water,
+            'created': self.capacity,
+        }
+
+    def _get_fireball_sprite(self):
+        """Vuurbal frame voor de huidige glow puls (zelfde voor alle vuurballen)"""
+        glow_pulse = (math.sin(get_ticks() * 0.02) + 1) * 0.5
+        return self.fireball_frames[int(round(glow_pulse * (FIREBALL_GLOW_STEPS - 1)))]
+
+    def render(self, sprite_renderer, alpha=1.0):
+        """Voeg alle levende projectielen toe aan de sprite renderer (alpha: tussen vorige en huidige stap)"""
+        if not self.count:
+            return
+        render_x = self.prev_x + (self.x - self.prev_x) * alpha
+        render_y = self.prev_y + (self.y - self.prev_y) * alpha
+        for slot in np.flatnonzero(self.alive).tolist():
+            kind = int(self.kind[slot])
+            if kind == FIREBALL:
+                sprite = self._get_fireball_sprite()
+            else:
+                sprite = get_enemy_bullet_sprite(self.colors[slot])
+            sprite_renderer.add_sprite(sprite, float(render_x[slot]), float(render_y[slot]),
+                                       RENDER_SCALE_BY_KIND[kind], 0.0)
@@ -6,6 +6,8 @@ Verzamel alle mystieke kristallen om de boss te verzwakken!
 import pygame
 import math
 from settings import *
+from spatial import SpatialHash
+from game_clock import get_ticks
 
 
 class Crystal:
@@ -103,9 +105,9 @@ class Crystal:
             return False
             
         # Animatie
-        self.float_offset = math.sin(pygame.time.get_ticks() * 0.003) * 0.1
+        self.float_offset = math.sin(get_ticks() * 0.003) * 0.1
         self.rotation += dt * 0.001
-        self.glow_pulse = (math.sin(pygame.time.get_ticks() * 0.005) + 1) * 0.5
+        self.glow_pulse = (math.sin(get_ticks() * 0.005) + 1) * 0.5
         
         # Check pickup
         dx = player_x - self.x
@@ -200,9 +202,9 @@ class LevelKey:
             return False
             
         # Animatie
-        self.float_offset = math.sin(pygame.time.get_ticks() * 0.003) * 0.12
+        self.float_offset = math.sin(get_ticks() * 0.003) * 0.12
         self.rotation += dt * 0.002
-        self.glow_pulse = (math.sin(pygame.time.get_ticks() * 0.004) + 1) * 0.5
+        self.glow_pulse = (math.sin(get_ticks() * 0.004) + 1) * 0.5
         
         # Check pickup
         dx = player_x - self.x
@@ -313,7 +315,7 @@ class ExitDoor:
         
     def update(self, dt, player_x, player_y, has_key, crystals_complete):
         """Update deur state"""
-        self.glow_pulse = (math.sin(pygame.time.get_ticks() * 0.005) + 1) * 0.5
+        self.glow_pulse = (math.sin(get_ticks() * 0.005) + 1) * 0.5
         
         if self.is_open:
             self.open_animation = min(1.0, self.open_animation + dt * 0.003)
@@ -413,8 +415,8 @@ class AmmoPack:
             return False
             
         # Animatie
-        self.float_offset = math.sin(pygame.time.get_ticks() * 0.004 + 1.5) * 0.08
-        self.pulse = (math.sin(pygame.time.get_ticks() * 0.005 + 0.5) + 1) * 0.5
+        self.float_offset = math.sin(get_ticks() * 0.004 + 1.5) * 0.08
+        self.pulse = (math.sin(get_ticks() * 0.005 + 0.5) + 1) * 0.5
         
         return False
         
@@ -498,8 +500,8 @@ class HealthPack:
             return False
             
         # Animatie
-        self.float_offset = math.sin(pygame.time.get_ticks() * 0.004) * 0.08
-        self.pulse = (math.sin(pygame.time.get_ticks() * 0.006) + 1) * 0.5
+        self.float_offset = math.sin(get_ticks() * 0.004) * 0.08
+        self.pulse = (math.sin(get_ticks() * 0.006) + 1) * 0.5
         
         # Check pickup
         dx = player_x - self.x
@@ -534,8 +536,11 @@ class QuestManager:
     """Beheert de crystal collection quest, sleutels en exit deuren"""
     
     def __init__(self, crystal_positions=None, health_pack_positions=None, ammo_pack_positions=None,
-                 key_position=None, exit_door_position=None, is_boss_level=False):
+                 key_position=None, exit_door_position=None, is_boss_level=False, spatial=None):
         self.crystals = []
+        
+        # Gedeelde spatial index voor pickups
+        self.spatial = spatial if spatial is not None else SpatialHash()
         self.collected_count = 0
         self.total_crystals = 0
         self.quest_complete = False
@@ -582,7 +587,9 @@ class QuestManager:
             ]
         
         for x, y in positions:
-            self.health_packs.append(HealthPack(x, y))
+            health_pack = HealthPack(x, y)
+            self.health_packs.append(health_pack)
+            self.spatial.insert(health_pack, 'health_pack')
             
     def _spawn_ammo_packs(self, positions=None):
         """Plaats ammo packs door het level"""
@@ -595,7 +602,9 @@ class QuestManager:
             ]
         
         for x, y in positions:
-            self.ammo_packs.append(AmmoPack(x, y))
+            ammo_pack = AmmoPack(x, y)
+            self.ammo_packs.append(ammo_pack)
+            self.spatial.insert(ammo_pack, 'ammo_pack')
             
     def _spawn_key(self, position=None):
         """Plaats de level sleutel"""
@@ -654,7 +663,7 @@ class QuestManager:
             if was_collected:
                 self.has_key = True
                 self.notification_text = "KEY COLLECTED! Find the Exit!"
-                self.notification_time = pygame.time.get_ticks()
+                self.notification_time = get_ticks()
                 
                 # Open de exit deur als crystals ook compleet zijn
                 if self.exit_door and self.quest_complete:
@@ -669,7 +678,7 @@ class QuestManager:
     
     def try_pickup_health_pack(self, player_x, player_y):
         """Probeer een health pack op te pakken, return True als opgepakt"""
-        for hp in self.health_packs:
+        for hp in self.spatial.query_radius('health_pack', player_x, player_y, PICKUP_QUERY_RADIUS):
             if not hp.collected:
                 dx = player_x - hp.x
                 dy = player_y - hp.y
@@ -678,12 +687,13 @@ class QuestManager:
                 # Grotere pickup range voor makkelijker oppakken
                 if distance < 1.2:
                     hp.collected = True
+                    self.spatial.remove(hp)
                     return True
         return False
         
     def try_pickup_ammo_pack(self, player_x, player_y):
         """Probeer een ammo pack op te pakken, return ammo_amount als opgepakt, anders 0"""
-        for ap in self.ammo_packs:
+        for ap in self.spatial.query_radius('ammo_pack', player_x, player_y, PICKUP_QUERY_RADIUS):
             if not ap.collected:
                 dx = player_x - ap.x
                 dy = player_y - ap.y
@@ -691,6 +701,7 @@ class QuestManager:
                 
                 if distance < ap.pickup_range:
                     ap.collected = True
+                    self.spatial.remove(ap)
                     return ap.ammo_amount
         return 0
                     
@@ -718,7 +729,7 @@ class QuestManager:
             if self.exit_door and self.has_key:
                 self.exit_door.unlock()
                 
-        self.notification_time = pygame.time.get_ticks()
+        self.notification_time = get_ticks()
         
     def render_crystals(self, sprite_renderer):
         """Voeg kristallen toe aan sprite renderer"""
@@ -764,7 +775,7 @@ class QuestManager:
                     
     def draw_hud(self, screen, font, small_font):
         """Teken quest HUD elementen"""
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         # Quest progress indicator (rechtsboven)
         quest_x = WIDTH - 220
@@ -874,7 +885,7 @@ class QuestManager:
             
     def draw_minimap_crystals(self, screen, offset_x, offset_y, tile_size):
         """Teken kristallen op de minimap"""
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         pulse = (math.sin(current_time * 0.005) + 1) * 0.5
         
         for i, crystal in enumerate(self.crystals):
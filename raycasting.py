@@ -3,20 +3,64 @@ Raycasting Engine met Texture Mapping, Deur Support en Pitch
 """
 import pygame
 import math
+import numpy as np
 from settings import *
-from map import get_map_value
+from map import get_active_tiles, TILE_SOLID, TILE_DOOR
+from resolution import RenderView
+from profiler import count
+
+
+class RayBuffer:
+    """
+    Herbruikbare kolom-buffer voor ray resultaten (een array per veld)
+    Wordt elk frame in-place overschreven in plaats van NUM_RAYS dicts te maken
+    """
+    
+    def __init__(self, num_rays):
+        self.depth = np.zeros(num_rays)
+        self.wall_type = np.zeros(num_rays, dtype=np.uint8)
+        self.tex_offset = np.zeros(num_rays)
+        self.is_door = np.zeros(num_rays, dtype=bool)
+        self.is_vertical = np.zeros(num_rays, dtype=bool)
+        self.ray_angle = np.zeros(num_rays)
+        self.count = 0  # Aantal geldige rays (0 tot de eerste raycast)
+        
+    def __len__(self):
+        return self.count
 
 
 class RayCaster:
     def __init__(self, game):
         self.game = game
-        self.ray_results = []
+        self.view = RenderView(RENDER_SCALE)
+        self.ray_results = RayBuffer(self.view.num_rays)
+        self._init_depth_buffer()
         self.textures = None
         self.door_manager = None
         self.pitch = 0  # Verticale kijkhoek offset
-        self.game_map = None
-        self.map_width = 24
-        self.map_height = 24
+        self.backend = RAYCAST_BACKEND
+        self.set_map(get_active_tiles())
+        
+        # Cache voor de surfarray renderer
+        self._texel_table = None
+        self._texel_atlas = None
+        self._texel_key = None
+        
+    def set_view(self, view):
+        """Stel de interne render resolutie in (RenderView)"""
+        self.view = view
+        self.ray_results = RayBuffer(view.num_rays)
+        self._init_depth_buffer()
+        
+    def _init_depth_buffer(self):
+        """
+        Muur afstand per scherm kolom van de view (z-buffer voor sprites)
+        Elke kolom hoort bij de ray int(col / width * num_rays); tot de eerste
+        raycast is alles 0, dus geen sprite zichtbaar
+        """
+        view = self.view
+        self.column_rays = np.arange(view.width) * view.num_rays // view.width
+        self.depth_buffer = np.zeros(view.width)
         
     def set_textures(self, texture_manager):
         """Stel texture manager in"""
@@ -26,22 +70,32 @@ class RayCaster:
         """Stel door manager in"""
         self.door_manager = door_manager
         
-    def set_map(self, game_map):
-        """Stel de actieve map in"""
-        self.game_map = game_map
-        if game_map:
-            self.map_width = len(game_map[0])
-            self.map_height = len(game_map)
+    def set_map(self, tile_map):
+        """Stel de TileMap van het level in"""
+        self.tile_map = tile_map
+        self.map_width = tile_map.width
+        self.map_height = tile_map.height
+        self.door_offsets = np.zeros(tile_map.values.shape)
         
     def raycast(self, player):
         """Voer raycasting uit vanuit speler positie"""
-        self.ray_results = []
-        self.pitch = player.pitch  # Krijg pitch van speler
+        if self.backend == 'numpy':
+            self.raycast_numpy(player)
+        else:
+            self.raycast_python(player)
+        np.take(self.ray_results.depth, self.column_rays, out=self.depth_buffer)
+        count('rays', self.ray_results.count)
+            
+    def raycast_python(self, player):
+        """Cast alle rays een voor een (referentie implementatie)"""
+        rays = self.ray_results
+        view = self.view
+        self.pitch = player.pitch * view.pitch_scale  # Krijg pitch van speler
         
         ox, oy = player.x, player.y
         ray_angle = player.angle - HALF_FOV
         
-        for ray in range(NUM_RAYS):
+        for ray in range(view.num_rays):
             sin_a = math.sin(ray_angle)
             cos_a = math.cos(ray_angle)
             
@@ -52,17 +106,136 @@ class RayCaster:
             # Fix fisheye effect
             depth *= math.cos(player.angle - ray_angle)
             
-            self.ray_results.append({
-                'depth': depth,
-                'wall_type': wall_type,
-                'tex_offset': tex_offset,
-                'is_vertical': is_vertical,
-                'is_door': is_door,
-                'ray_angle': ray_angle
-            })
+            rays.depth[ray] = depth
+            rays.wall_type[ray] = wall_type
+            rays.tex_offset[ray] = tex_offset
+            rays.is_vertical[ray] = is_vertical
+            rays.is_door[ray] = is_door
+            rays.ray_angle[ray] = ray_angle
+            
+            ray_angle += view.delta_angle
+            
+        rays.count = view.num_rays
+            
+    def raycast_numpy(self, player):
+        """Cast alle rays tegelijk als numpy arrays (zelfde output als raycast_python)"""
+        view = self.view
+        self.pitch = player.pitch * view.pitch_scale
+        
+        ox, oy = player.x, player.y
+        
+        # Zelfde opgetelde hoeken als de per-ray loop
+        rays = self.ray_results
+        ray_angles = rays.ray_angle
+        ray_angles.fill(view.delta_angle)
+        ray_angles[0] = player.angle - HALF_FOV
+        np.cumsum(ray_angles, out=ray_angles)
+        sin_a = np.sin(ray_angles)
+        cos_a = np.cos(ray_angles)
+        
+        # Deur open-offsets van dit frame in een grid zetten
+        if self.door_manager:
+            self.door_offsets.fill(0)
+            for (door_x, door_y), door in self.door_manager.doors.items():
+                self.door_offsets[door_y, door_x] = door.open_amount
+        
+        h_depth, h_type, h_tex, h_door = self._cast_axis_numpy(ox, oy, sin_a, cos_a, False)
+        v_depth, v_type, v_tex, v_door = self._cast_axis_numpy(ox, oy, sin_a, cos_a, True)
+        
+        # Kies kortste afstand, direct in de buffer
+        is_vertical = rays.is_vertical
+        np.logical_not(h_depth < v_depth, out=is_vertical)
+        np.copyto(rays.depth, np.where(is_vertical, v_depth, h_depth))
+        np.copyto(rays.wall_type, np.where(is_vertical, v_type, h_type))
+        np.copyto(rays.tex_offset, np.where(is_vertical, v_tex, h_tex))
+        np.copyto(rays.is_door, np.where(is_vertical, v_door, h_door))
+        
+        # Fix fisheye effect
+        rays.depth *= np.cos(player.angle - ray_angles)
+        rays.count = view.num_rays
+        
+    def _cast_axis_numpy(self, ox, oy, sin_a, cos_a, vertical):
+        """
+        Gevectoriseerde versie van cast_horizontal / cast_vertical
+        vertical=False: stap per horizontale gridlijn (y), True: per verticale (x)
+        """
+        # Primaire as = de as waarlangs we per tile stappen
+        if vertical:
+            main_dir, side_dir, main_origin, side_origin = cos_a, sin_a, ox, oy
+        else:
+            main_dir, side_dir, main_origin, side_origin = sin_a, cos_a, oy, ox
+            
+        num_rays = main_dir.shape[0]
+        depth_out = np.full(num_rays, float(MAX_DEPTH))
+        type_out = np.zeros(num_rays, dtype=np.uint8)
+        tex_out = np.zeros(num_rays)
+        door_out = np.zeros(num_rays, dtype=bool)
+        
+        # Rays parallel aan de gridlijnen raken nooit iets
+        active = main_dir != 0
+        positive = main_dir > 0
+        safe_dir = np.where(active, main_dir, 1.0)
+        
+        step = np.where(positive, 1.0, -1.0)
+        main_intercept = np.where(positive, int(main_origin) + 1, int(main_origin)).astype(float)
+        
+        # Eerste intersectie en delta
+        depth = (main_intercept - main_origin) / safe_dir
+        side_intercept = side_origin + depth * side_dir
+        delta_depth = step / safe_dir
+        side_delta = delta_depth * side_dir
+        abs_delta = np.abs(delta_depth)
+        
+        map_values = self.tile_map.values
+        map_flags = self.tile_map.flags
+        door_offsets = self.door_offsets
+        height, width = map_values.shape
+        has_doors = self.door_manager is not None
+        
+        # March alle rays tegelijk
+        for _ in range(MAX_DEPTH):
+            if not active.any():
+                break
+                
+            main_tile = main_intercept.astype(np.int64) - (~positive)
+            side_tile = side_intercept.astype(np.int64)
+            if vertical:
+                tile_x, tile_y = main_tile, side_tile
+            else:
+                tile_x, tile_y = side_tile, main_tile
+                
+            in_bounds = active & (tile_x >= 0) & (tile_x < width) & (tile_y >= 0) & (tile_y < height)
+            safe_x = np.clip(tile_x, 0, width - 1)
+            safe_y = np.clip(tile_y, 0, height - 1)
+            wall_type = map_values[safe_y, safe_x]
+            tile_flags = np.where(in_bounds, map_flags[safe_y, safe_x], 0)
+            
+            tex_offset = side_intercept % 1
+            wall_hit = (tile_flags & TILE_SOLID) != 0
+            
+            if has_doors:
+                # Als deur open genoeg is, ga door
+                door_offset = door_offsets[safe_y, safe_x]
+                door_hit = ((tile_flags & TILE_DOOR) != 0) & ~(tex_offset < door_offset)
+                safe_span = np.where(door_offset < 1, 1 - door_offset, 1.0)
+                door_tex = np.where(door_offset < 1, (tex_offset - door_offset) / safe_span, 0.0)
+                tex_offset = np.where(door_hit, door_tex, tex_offset)
+            else:
+                door_hit = np.zeros(num_rays, dtype=bool)
+                
+            hit = wall_hit | door_hit
+            depth_out[hit] = depth[hit]
+            type_out[hit] = wall_type[hit]
+            tex_out[hit] = tex_offset[hit]
+            door_out[hit] = door_hit[hit]
+            active &= ~hit
             
-            ray_angle += DELTA_ANGLE
+            side_intercept += side_delta
+            main_intercept += step
+            depth += abs_delta
             
+        return depth_out, type_out, tex_out, door_out
+        
     def cast_ray(self, ox, oy, sin_a, cos_a):
         """Cast een enkele ray en return resultaat"""
         # Horizontale intersecties
@@ -104,7 +277,7 @@ class RayCaster:
             tile_y = int(y_intercept) if sin_a > 0 else int(y_intercept) - 1
             
             if 0 <= tile_x < self.map_width and 0 <= tile_y < self.map_height:
-                wall_type = get_map_value(tile_x, tile_y, self.game_map)
+                wall_type = self.tile_map.value(tile_x, tile_y)
                 
                 # Check voor deur
                 if wall_type == 9 and self.door_manager:
@@ -161,7 +334,7 @@ class RayCaster:
             tile_y = int(y_intercept)
             
             if 0 <= tile_x < self.map_width and 0 <= tile_y < self.map_height:
-                wall_type = get_map_value(tile_x, tile_y, self.game_map)
+                wall_type = self.tile_map.value(tile_x, tile_y)
                 
                 # Check voor deur
                 if wall_type == 9 and self.door_manager:
@@ -189,33 +362,41 @@ class RayCaster:
         return (MAX_DEPTH, 0, 0, False)
         
     def render(self, screen):
-        """Render de 3D view met texturen en pitch"""
+        """Render de 3D view met texturen en pitch (screen heeft de grootte van self.view)"""
+        view = self.view
+        
         # Bereken horizon positie gebaseerd op pitch
-        horizon = HALF_HEIGHT + self.pitch
+        horizon = view.half_height + self.pitch
         
+        if WALL_RENDER_MODE == 'surfarray' and self.textures:
+            self.render_surfarray(screen, horizon)
+            return
+            
         # Teken plafond (boven horizon)
         if horizon > 0:
-            pygame.draw.rect(screen, CEILING_COLOR, (0, 0, WIDTH, horizon))
+            pygame.draw.rect(screen, CEILING_COLOR, (0, 0, view.width, horizon))
         
         # Teken vloer (onder horizon)
-        if horizon < HEIGHT:
-            pygame.draw.rect(screen, FLOOR_COLOR, (0, horizon, WIDTH, HEIGHT - horizon))
-        
-        # Teken muren met texturen
-        for ray_idx, ray_data in enumerate(self.ray_results):
-            depth = ray_data['depth']
-            wall_type = ray_data['wall_type']
-            tex_offset = ray_data['tex_offset']
-            is_vertical = ray_data['is_vertical']
-            is_door = ray_data['is_door']
-            
+        if horizon < view.height:
+            pygame.draw.rect(screen, FLOOR_COLOR, (0, horizon, view.width, view.height - horizon))
+        
+        # Teken muren met texturen (een keer per frame naar lists, geen dicts)
+        rays = self.ray_results
+        columns = zip(
+            rays.depth[:rays.count].tolist(),
+            rays.wall_type[:rays.count].tolist(),
+            rays.tex_offset[:rays.count].tolist(),
+            rays.is_vertical[:rays.count].tolist(),
+            rays.is_door[:rays.count].tolist(),
+        )
+        for ray_idx, (depth, wall_type, tex_offset, is_vertical, is_door) in enumerate(columns):
             if depth <= 0:
                 depth = 0.0001
                 
             # Bereken muur hoogte
-            wall_height = SCREEN_DIST / depth
+            wall_height = view.screen_dist / depth
             
-            x = ray_idx * SCALE
+            x = ray_idx * view.scale
             # Y positie aangepast voor pitch
             y = horizon - wall_height // 2
             
@@ -227,19 +408,12 @@ class RayCaster:
                 else:
                     tex_id = wall_type
                     
-                # Haal textuur kolom
+                # Haal textuur kolom (fog zit al in de gecachte kolom)
                 darken = not is_vertical  # Horizontale muren donkerder
-                column = self.textures.get_texture_column(tex_id, tex_offset, wall_height, darken)
+                fog_factor = min(1, depth / MAX_DEPTH)
+                column = self.textures.get_texture_column(tex_id, tex_offset, wall_height, darken, fog_factor, view.scale)
                 
                 if column:
-                    # Distance fog
-                    fog_factor = min(1, depth / MAX_DEPTH)
-                    if fog_factor > 0.1:
-                        fog_surface = pygame.Surface(column.get_size())
-                        fog_surface.fill((0, 0, 0))
-                        fog_surface.set_alpha(int(fog_factor * 180))
-                        column.blit(fog_surface, (0, 0))
-                    
                     screen.blit(column, (x, y))
             else:
                 # Fallback naar kleuren
@@ -253,4 +427,94 @@ class RayCaster:
                 fog_factor = min(1, depth / MAX_DEPTH)
                 color = tuple(int(c * (1 - fog_factor * 0.7)) for c in color)
                 
-                pygame.draw.rect(screen, color, (x, y, SCALE, wall_height))
+                pygame.draw.rect(screen, color, (x, y, view.scale, wall_height))
+        count('columns', rays.count)
+                
+    def render_surfarray(self, screen, horizon):
+        """
+        Render plafond, vloer en muren als een numpy pixel buffer en zet die
+        in een keer op het scherm (geen blit per kolom)
+        """
+        textures = self.textures
+        view = self.view
+        rays = self.ray_results
+        count = rays.count
+        _, fog_steps, num_textures, tex_w, tex_h, _ = textures.shaded_atlas.shape
+        column_len = tex_h + 2  # [plafond, texels..., vloer] per textuur kolom
+        texel_table = self._get_texel_table(screen)
+        
+        depth = np.maximum(rays.depth[:count], 0.0001)
+        wall_type = rays.wall_type[:count]
+        is_vertical = rays.is_vertical[:count]
+        
+        # Muur hoogte en bovenkant per ray (zelfde afronding als de blit renderer)
+        wall_height = view.screen_dist / depth
+        heights = np.maximum(1, wall_height.astype(np.int32))
+        tops = np.floor(horizon - wall_height // 2)
+        
+        # Begin van de juiste kolom in de texel tabel per ray
+        tex_index = np.where(rays.is_door[:count], textures.atlas_door_index, textures.atlas_lookup[wall_type])
+        tex_x = (rays.tex_offset[:count] * tex_w).astype(np.int32) % tex_w
+        fog = np.minimum(1, depth / MAX_DEPTH)
+        fog_bucket = np.where(fog > 0.1, (fog * FOG_LEVELS).astype(np.int32), 0)
+        darken = (~is_vertical).astype(np.int32)
+        column_base = (((darken * fog_steps + fog_bucket) * num_textures + tex_index) * tex_w + tex_x) * column_len
+        
+        # Ray zonder hit: grijze fallback kolom achteraan de tabel
+        miss_base = 2 * fog_steps * num_textures * tex_w * column_len
+        column_base = np.where(wall_type != 0, column_base, miss_base + darken * column_len)
+        
+        # Verticale texture sampling voor alle rays en rijen tegelijk:
+        # rij boven de muur -> 0 (plafond), op de muur -> 1..tex_h, eronder -> tex_h + 1 (vloer)
+        step = ((tex_h - 0.001) / heights).astype(np.float32)
+        rows = np.arange(view.height, dtype=np.float32)
+        sample = rows[None, :] * step[:, None]
+        sample += (1 - tops * step).astype(np.float32)[:, None]
+        indices = sample.astype(np.int32)
+        np.clip(indices, 0, tex_h + 1, out=indices)
+        indices += column_base.astype(np.int32)[:, None]
+        
+        # Rays naar scherm kolommen (view.scale pixels breed)
+        frame = np.take(texel_table, indices)
+        if view.scale > 1:
+            frame = np.repeat(frame, view.scale, axis=0)
+        if frame.shape[0] < view.width:
+            # Rest van het scherm: alleen plafond en vloer
+            background = np.where(np.arange(view.height) < horizon, texel_table[0], texel_table[tex_h + 1])
+            padding = np.broadcast_to(background, (view.width - frame.shape[0], view.height))
+            frame = np.concatenate((frame, padding))
+            
+        pygame.surfarray.blit_array(screen, frame)
+        
+    def _get_texel_table(self, screen):
+        """
+        Platte tabel met alle voorberekende texel kolommen van het thema, elk
+        met een plafond pixel ervoor en een vloer pixel erachter, plus twee
+        fallback kolommen; al omgezet naar het pixel formaat van screen
+        """
+        shaded_atlas = self.textures.shaded_atlas
+        key = (screen.get_bitsize(), screen.get_masks())
+        if self._texel_atlas is shaded_atlas and self._texel_key == key:
+            return self._texel_table
+            
+        tex_h = shaded_atlas.shape[4]
+        columns = shaded_atlas.reshape(-1, tex_h, 3)
+        
+        # Ray zonder hit: grijze kolom op MAX_DEPTH (fog 1.0), verticaal en horizontaal
+        miss_color = (150, 150, 150)
+        miss_fog = 1 - 0.7
+        miss_columns = np.array([
+            [int(c * miss_fog) for c in miss_color],
+            [int(int(c * 0.7) * miss_fog) for c in miss_color],
+        ], dtype=np.uint8)
+        columns = np.concatenate((columns, np.repeat(miss_columns[:, None, :], tex_h, axis=1)))
+        
+        table = np.empty((len(columns), tex_h + 2, 3), dtype=np.uint8)
+        table[:, 0] = CEILING_COLOR
+        table[:, 1:-1] = columns
+        table[:, -1] = FLOOR_COLOR
+        
+        self._texel_table = pygame.surfarray.map_array(screen, table.reshape(-1, 1, 3))[:, 0]
+        self._texel_atlas = shaded_atlas
+        self._texel_key = key
+        return self._texel_table
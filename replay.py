@@ -0,0 +1,224 @@
+"""
+Replay - Sessies opnemen en exact opnieuw afspelen
+De Recorder schrijft de seed, elke render frame (speltijd) en de input van
+elke simulatie stap naar een compact binair log (gzip). De replayer start
+een Game met dezelfde seed, voert dezelfde frames door Game.advance met de
+opgenomen input, en vergelijkt een digest van de eindtoestand: bij een
+deterministische run is die bit voor bit gelijk.
+
+Gebruik:
+    python main.py --record sessie.dmr
+    python headless.py --script run.json --record sessie.dmr
+    python replay.py sessie.dmr [--render]
+"""
+import os
+import sys
+
+if __name__ == "__main__":
+    # Afspelen gebeurt zonder venster; moet gezet zijn voordat settings pygame initialiseert
+    os.environ.setdefault('DOOMIE_HEADLESS', '1')
+
+import gzip
+import struct
+import hashlib
+import argparse
+import time
+import pygame
+from settings import *
+from controls import InputFrame, HeldKeys, KEYDOWN, MOUSEDOWN, QUIT
+
+MAGIC = b'DMRP'
+VERSION = 1
+
+# Header: magic, versie, seed, start level, simulatie rate, vlaggen
+HEADER = struct.Struct('<4sHIBHB')
+FLAG_SKIP_STORY = 1
+
+# Records: een tag byte gevolgd door de inhoud
+TAG_FRAME = b'F'  # Render frame: speltijd in ms
+TAG_STEP = b'S'  # Simulatie stap: toetsen, muis, knoppen, aantal events
+TAG_END = b'E'  # Einde: digest van de eindtoestand
+FRAME = struct.Struct('<d')
+STEP = struct.Struct('<HddBB')
+EVENT = struct.Struct('<Bi')
+
+# Toetsen die de simulatie als ingedrukt uitleest (een bit per toets)
+RECORDED_KEYS = (pygame.K_w, pygame.K_s, pygame.K_a, pygame.K_d,
+                 pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE)
+EVENT_CODES = {KEYDOWN: 0, MOUSEDOWN: 1, QUIT: 2}
+EVENT_TYPES = {code: event_type for event_type, code in EVENT_CODES.items()}
+
+
+def state_digest(game):
+    """SHA-1 van de toestand die de simulatie bepaalt (tijd, speler, vijanden)"""
+    digest = hashlib.sha1()
+    player = game.player
+    digest.update(struct.pack('<qBdddd', game.game_clock.get_ticks(), game.current_level,
+                              player.x, player.y, player.angle, player.pitch))
+    digest.update(struct.pack('<di', game.player_health, game.health_packs_inventory))
+    for enemy in game.enemy_manager.enemies:
+        digest.update(struct.pack('<ddd', enemy.x, enemy.y, enemy.health))
+        digest.update(enemy.state.encode())
+    return digest.hexdigest()
+
+
+class Recorder:
+    """Schrijft de input van een Game sessie naar een replay log"""
+
+    def __init__(self, path, game):
+        self.file = gzip.open(path, 'wb')
+        self.path = path
+        self.frames = 0
+        self.steps = 0
+        flags = FLAG_SKIP_STORY if game.skip_story else 0
+        self.file.write(HEADER.pack(MAGIC, VERSION, game.seed, game.current_level, SIM_RATE, flags))
+
+    def record_frame(self, frame_dt):
+        """Begin van een render frame met frame_dt ms speltijd"""
+        self.file.write(TAG_FRAME + FRAME.pack(frame_dt))
+        self.frames += 1
+
+    def record_step(self, dt, frame):
+        """Input van een simulatie stap (dt volgt uit de frame en hoeft niet mee)"""
+        keys = 0
+        for bit, key in enumerate(RECORDED_KEYS):
+            if frame.keys[key]:
+                keys |= 1 << bit
+        buttons = 0
+        for bit, pressed in enumerate(frame.mouse_buttons[:3]):
+            if pressed:
+                buttons |= 1 << bit
+        dx, dy = frame.mouse_rel
+        self.file.write(TAG_STEP + STEP.pack(keys, dx, dy, buttons, len(frame.events)))
+        for event_type, value in frame.events:
+            self.file.write(EVENT.pack(EVENT_CODES[event_type], value or 0))
+        self.steps += 1
+
+    def close(self, game):
+        """Sluit het log af met de digest van de eindtoestand"""
+        self.file.write(TAG_END + bytes.fromhex(state_digest(game)))
+        self.file.close()
+        print(f"Recorded {self.frames} frames / {self.steps} steps to {self.path}")
+
+
+def read_log(path):
+    """Lees een replay log: (header dict, lijst van (frame_dt, [InputFrame]), digest of None)"""
+    with gzip.open(path, 'rb') as f:
+        data = f.read()
+
+    magic, version, seed, level, sim_rate, flags = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} replay log")
+    header = {
+        'seed': seed,
+        'level': level,
+        'sim_rate': sim_rate,
+        'skip_story': bool(flags & FLAG_SKIP_STORY),
+    }
+
+    frames = []
+    digest = None
+    offset = HEADER.size
+    while offset < len(data):
+        tag = data[offset:offset + 1]
+        offset += 1
+        if tag == TAG_FRAME:
+            frames.append((FRAME.unpack_from(data, offset)[0], []))
+            offset += FRAME.size
+        elif tag == TAG_STEP:
+            keys, dx, dy, buttons, event_count = STEP.unpack_from(data, offset)
+            offset += STEP.size
+            events = []
+            for _ in range(event_count):
+                code, value = EVENT.unpack_from(data, offset)
+                offset += EVENT.size
+                event_type = EVENT_TYPES[code]
+                events.append((event_type, None if event_type == QUIT else value))
+            held = HeldKeys(key for bit, key in enumerate(RECORDED_KEYS) if keys & (1 << bit))
+            mouse_buttons = tuple(bool(buttons & (1 << bit)) for bit in range(3))
+            frames[-1][1].append(InputFrame(held, (dx, dy), mouse_buttons, events))
+        elif tag == TAG_END:
+            digest = data[offset:offset + 20].hex()
+            offset += 20
+        else:
+            raise ValueError(f"Corrupt replay log {path} at byte {offset - 1}")
+    return header, frames, digest
+
+
+class ReplayInput:
+    """Input bron die de opgenomen stappen van de huidige frame teruggeeft"""
+
+    def __init__(self):
+        self.pending = []
+
+    def load(self, steps):
+        self.pending = list(reversed(steps))
+
+    def poll(self, dt):
+        return self.pending.pop() if self.pending else InputFrame()
+
+    def reset_mouse(self):
+        pass
+
+
+def replay(path, render=False):
+    """Speel een log af; geeft een dict met resultaten (en of de digest klopt) terug"""
+    from main import Game  # Hier pas: main importeert de Recorder uit deze module
+
+    header, frames, expected = read_log(path)
+    if header['sim_rate'] != SIM_RATE:
+        print(f"Warning: log was recorded at {header['sim_rate']} Hz, simulating at {SIM_RATE} Hz")
+
+    replay_input = ReplayInput()
+    game = Game(replay_input, seed=header['seed'], deterministic=True, skip_story=header['skip_story'])
+    if header['level'] != game.current_level:
+        game._load_level(header['level'])
+
+    frame_times = []
+    desync_frame = None
+    start = time.perf_counter()
+    for index, (frame_dt, steps) in enumerate(frames):
+        frame_start = time.perf_counter()
+        replay_input.load(steps)
+        alpha = game.advance(frame_dt)
+        if render:
+            game.draw(alpha)
+        frame_times.append((time.perf_counter() - frame_start) * 1000)
+        if replay_input.pending and desync_frame is None:
+            desync_frame = index  # Minder stappen dan bij de opname
+    wall_time = time.perf_counter() - start
+
+    digest = state_digest(game)
+    return {
+        'frames': len(frames),
+        'wall_seconds': wall_time,
+        'max_frame_ms': max(frame_times) if frame_times else 0.0,
+        'digest': digest,
+        'expected_digest': expected,
+        'match': digest == expected and desync_frame is None,
+        'desync_frame': desync_frame,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded DOOMIE session")
+    parser.add_argument('log', help="Replay log (.dmr)")
+    parser.add_argument('--render', action='store_true', help="Ook offscreen renderen (zelfde frames als de opname)")
+    args = parser.parse_args()
+
+    result = replay(args.log, args.render)
+    print(f"\nReplayed {result['frames']} frames in {result['wall_seconds']:.2f}s "
+          f"(slowest frame {result['max_frame_ms']:.1f} ms)")
+    if result['desync_frame'] is not None:
+        print(f"DESYNC: frame {result['desync_frame']} ran fewer steps than recorded")
+    if result['expected_digest'] is None:
+        print(f"Final state {result['digest']} (log has no end digest)")
+    elif result['match']:
+        print(f"MATCH: final state {result['digest']}")
+    else:
+        print(f"MISMATCH: final state {result['digest']}, recorded {result['expected_digest']}")
+    return 0 if result['match'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
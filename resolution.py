@@ -0,0 +1,77 @@
+"""
+Interne render resolutie voor de 3D view
+De 3D view kan op een fractie van de native resolutie gerenderd worden en
+wordt daarna opgeschaald; HUD en minimap blijven op native resolutie.
+"""
+import math
+from collections import deque
+from settings import *
+
+
+class RenderView:
+    """Afmetingen en raycast waarden van de 3D view op een render schaal"""
+
+    def __init__(self, render_scale=1.0):
+        self.render_scale = render_scale
+        self.width = max(2, int(WIDTH * render_scale))
+        self.height = max(2, int(HEIGHT * render_scale))
+        self.half_width = self.width // 2
+        self.half_height = self.height // 2
+
+        # Zelfde afleiding als in settings.py, maar voor de interne resolutie
+        self.num_rays = self.width // 2
+        self.delta_angle = FOV / self.num_rays
+        self.screen_dist = self.half_width / math.tan(HALF_FOV)
+        self.scale = self.width // self.num_rays
+
+        # Pitch van de speler is in native pixels
+        self.pitch_scale = self.height / HEIGHT
+
+    @property
+    def size(self):
+        return (self.width, self.height)
+
+    @property
+    def is_native(self):
+        return self.width == WIDTH and self.height == HEIGHT
+
+
+class DynamicResolution:
+    """
+    Past de render schaal aan op basis van gemeten frame tijd
+    Omlaag als het gemiddelde boven het budget zit, omhoog als er ruim over is
+    """
+
+    def __init__(self, max_scale=RENDER_SCALE, min_scale=DYNAMIC_RES_MIN_SCALE):
+        self.max_scale = max_scale
+        self.min_scale = min(min_scale, max_scale)
+        self.render_scale = max_scale
+        self.budget_ms = FRAME_BUDGET_MS
+        self.frame_times = deque(maxlen=DYNAMIC_RES_SAMPLES)
+
+    def update(self, frame_ms):
+        """
+        Registreer de duur van een frame
+        Geeft True terug als render_scale veranderd is
+        """
+        self.frame_times.append(frame_ms)
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return False
+
+        average = sum(self.frame_times) / len(self.frame_times)
+        new_scale = self.render_scale
+
+        if average > self.budget_ms:
+            new_scale = max(self.min_scale, self.render_scale - DYNAMIC_RES_STEP)
+        elif average < self.budget_ms * 0.7:
+            new_scale = min(self.max_scale, self.render_scale + DYNAMIC_RES_STEP)
+
+        # Opnieuw meten na een wijziging (en na elk vol venster)
+        self.frame_times.clear()
+
+        if abs(new_scale - self.render_scale) < 0.001:
+            return False
+
+        self.render_scale = round(new_scale, 2)
+        print(f"Render schaal aangepast naar {self.render_scale:.2f} (gemiddeld {average:.1f} ms)")
+        return True
@@ -0,0 +1,107 @@
+"""
+AI scheduler - Level-of-detail voor vijand updates
+Vijanden worden per frame ingedeeld in buckets (engaged, near, far, dormant)
+op basis van hun state en afstand tot de speler. Engaged vijanden krijgen
+elke frame een update; de rest alleen als hun interval om is, met de
+opgespaarde dt. Zijn er meer updates dan het frame budget toelaat, dan
+schuiven de overgebleven vijanden door naar de volgende frame (round-robin).
+"""
+import time
+from settings import *
+
+ENGAGED = 'engaged'
+NEAR = 'near'
+FAR = 'far'
+DORMANT = 'dormant'
+
+# States waarin een vijand met de speler bezig is of een animatie afspeelt
+# (waarden van EnemyState; enemy.py importeert deze module, dus geen import terug)
+ENGAGED_STATES = ('alert', 'chase', 'attack', 'hurt', 'dying')
+
+
+class AIScheduler:
+    """Bepaalt welke vijanden deze frame een update krijgen, en met welke dt"""
+
+    INTERVALS = {
+        NEAR: AI_NEAR_INTERVAL,
+        FAR: AI_FAR_INTERVAL,
+        DORMANT: AI_DORMANT_INTERVAL,
+    }
+
+    def __init__(self, budget_ms=AI_FRAME_BUDGET_MS):
+        self.budget_ms = budget_ms  # None = geen budget (deterministische runs)
+        self.pending_dt = {}  # vijand -> opgespaarde dt sinds zijn laatste update
+        self.cursor = 0  # Round-robin startpunt voor de niet-engaged vijanden
+        self.bucket_counts = {ENGAGED: 0, NEAR: 0, FAR: 0, DORMANT: 0}
+        self.updates = 0  # Aantal vijand updates in de laatste frame
+        self.deferred = 0  # Aantal vijanden dat door het budget moest wachten
+
+    def classify(self, enemy, player):
+        """Bucket van een vijand op basis van state en afstand"""
+        if enemy.state in ENGAGED_STATES or hasattr(enemy, 'is_boss'):
+            return ENGAGED
+
+        dx = player.x - enemy.x
+        dy = player.y - enemy.y
+        distance_sq = dx*dx + dy*dy
+        if distance_sq < AI_NEAR_DISTANCE * AI_NEAR_DISTANCE:
+            return NEAR
+        if distance_sq < AI_FAR_DISTANCE * AI_FAR_DISTANCE:
+            return FAR
+        return DORMANT
+
+    def schedule(self, enemies, dt, player):
+        """
+        Generator: (vijand, dt) voor elke vijand die nu een update krijgt
+        Het budget wordt gemeten tussen de yields, dus inclusief het werk van de aanroeper
+        """
+        start = time.perf_counter()
+        counts = {ENGAGED: 0, NEAR: 0, FAR: 0, DORMANT: 0}
+        engaged = []
+        waiting = []
+        for enemy in enemies:
+            if enemy.state == 'dead':
+                self.pending_dt.pop(enemy, None)
+                continue
+
+            pending = self.pending_dt.get(enemy, 0) + dt
+            bucket = self.classify(enemy, player)
+            counts[bucket] += 1
+            if bucket == ENGAGED:
+                engaged.append((enemy, pending))
+            else:
+                self.pending_dt[enemy] = pending
+                waiting.append((enemy, pending, self.INTERVALS[bucket]))
+        self.bucket_counts = counts
+
+        # Engaged vijanden altijd, ongeacht het budget
+        self.updates = 0
+        for enemy, pending in engaged:
+            self.pending_dt[enemy] = 0
+            self.updates += 1
+            yield enemy, min(pending, AI_MAX_STEP_MS)
+
+        # De rest in round-robin volgorde zolang het budget het toelaat
+        self.deferred = 0
+        count = len(waiting)
+        if not count:
+            return
+        first = self.cursor % count
+        progressed = False
+        for offset in range(count):
+            enemy, pending, interval = waiting[(first + offset) % count]
+            if pending < interval:
+                continue
+            # Minstens een update per frame, anders kan de rij nooit leeglopen
+            if (progressed and self.budget_ms is not None
+                    and (time.perf_counter() - start) * 1000 > self.budget_ms):
+                # Budget op: hier gaat de volgende frame verder, de rest spaart dt op
+                self.cursor = (first + offset) % count
+                self.deferred = sum(1 for k in range(offset, count)
+                                    if waiting[(first + k) % count][1] >= waiting[(first + k) % count][2])
+                return
+            self.pending_dt[enemy] = 0
+            self.updates += 1
+            progressed = True
+            yield enemy, min(pending, AI_MAX_STEP_MS)
+        self.cursor = first
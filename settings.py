@@ -1,14 +1,30 @@
 # Game Settings
+import os
 import math
 import pygame
 
+# Headless simulatie: geen venster, geen muis grab (DOOMIE_HEADLESS=1, zie headless.py)
+HEADLESS = os.environ.get('DOOMIE_HEADLESS', '0') not in ('', '0')
+HEADLESS_RESOLUTION = (1280, 720)  # Offscreen resolutie, aan te passen met DOOMIE_RESOLUTION=BxH
+if HEADLESS:
+    # Dummy drivers: SDL opent geen venster en heeft geen display of geluid nodig
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
 # Initialiseer pygame om scherminfo te krijgen
 pygame.init()
-_display_info = pygame.display.Info()
 
-# Scherm instellingen (automatische fullscreen resolutie)
-WIDTH = _display_info.current_w
-HEIGHT = _display_info.current_h
+# Scherm instellingen (automatische fullscreen resolutie, headless een vaste)
+if HEADLESS:
+    _resolution = os.environ.get('DOOMIE_RESOLUTION')
+    if _resolution:
+        WIDTH, HEIGHT = (int(size) for size in _resolution.lower().split('x'))
+    else:
+        WIDTH, HEIGHT = HEADLESS_RESOLUTION
+else:
+    _display_info = pygame.display.Info()
+    WIDTH = _display_info.current_w
+    HEIGHT = _display_info.current_h
 HALF_WIDTH = WIDTH // 2
 HALF_HEIGHT = HEIGHT // 2
 FPS = 60
@@ -27,11 +43,74 @@ NUM_RAYS = WIDTH // 2
 HALF_NUM_RAYS = NUM_RAYS // 2
 DELTA_ANGLE = FOV / NUM_RAYS
 MAX_DEPTH = 20
+RAYCAST_BACKEND = 'numpy'  # 'numpy' (alle rays tegelijk) of 'python' (per ray)
 
 # Muur instellingen
 SCREEN_DIST = HALF_WIDTH / math.tan(HALF_FOV)
 SCALE = WIDTH // NUM_RAYS
 
+# Textuur kolom cache (geschaalde muurkolommen hergebruiken tussen frames)
+TEXTURE_CACHE_MAX_BYTES = 8 * 1024 * 1024  # Geheugenplafond van de cache
+TEXTURE_CACHE_MAX_ENTRIES = 2048  # Klein houden: SDL ruimt een vrijgegeven surface op in O(aantal surfaces)
+TEXTURE_CACHE_HEIGHT_STEP = 2  # Kolomhoogtes worden op deze stap (pixels) afgerond
+FOG_LEVELS = 8  # Aantal fog stappen (elke stap is een voorberekende textuur variant)
+WALL_RENDER_MODE = 'surfarray'  # 'surfarray' (hele frame in een numpy buffer) of 'blit' (per kolom)
+
+# Render resolutie (alleen de 3D view, HUD en minimap blijven native)
+RENDER_SCALE = 1.0  # Fractie van de native resolutie voor de 3D view (0.5 = halve breedte en hoogte)
+DYNAMIC_RESOLUTION = False  # Render schaal automatisch verlagen als frames over budget gaan
+DYNAMIC_RES_MIN_SCALE = 0.5  # Laagste render schaal in dynamische modus
+DYNAMIC_RES_STEP = 0.1  # Stapgrootte per aanpassing
+DYNAMIC_RES_SAMPLES = 30  # Aantal frames waarover gemiddeld wordt
+FRAME_BUDGET_MS = 1000 / FPS  # Frame tijd budget in milliseconden
+
+# Spatial index (vijanden, projectielen, pickups, bots)
+SPATIAL_CELL_SIZE = 1.0  # Celgrootte in tiles
+PICKUP_QUERY_RADIUS = 1.5  # Zoekradius voor pickups (groter dan de grootste pickup afstand)
+
+# Zichtlijn
+VISIBILITY_DOORS_BLOCK = False  # Gesloten deuren blokkeren zicht (voorheen niet: alleen muren)
+
+# Projectielen
+PROJECTILE_POOL_SIZE = 256  # Begin capaciteit van de projectiel arrays (groeit x2 als hij vol is)
+FIREBALL_GLOW_STEPS = 16  # Voorgebouwde vuurbal frames voor de pulserende glow
+
+# AI level-of-detail (vijanden ver van de speler minder vaak updaten)
+AI_NEAR_DISTANCE = 14.0  # Binnen deze afstand: near bucket (ruim boven detection_range)
+AI_FAR_DISTANCE = 24.0  # Binnen deze afstand: far bucket, daarbuiten dormant
+AI_NEAR_INTERVAL = 50  # ms tussen updates in de near bucket
+AI_FAR_INTERVAL = 200  # ms tussen updates in de far bucket
+AI_DORMANT_INTERVAL = 500  # ms tussen updates in de dormant bucket
+AI_MAX_STEP_MS = 500  # Grootste dt per update (kleiner dan een muur dik is bij de hoogste snelheid)
+AI_FRAME_BUDGET_MS = 2.0  # Tijd per frame voor niet-engaged vijanden, de rest schuift door
+
+# Simulatie met vaste stap, los van de render frame rate
+SIM_RATE = 125  # Simulatie stappen per seconde (125: een stap is precies 8 ms, geen afrondingsdrift)
+SIM_DT = 1000 / SIM_RATE  # ms speltijd per stap
+MAX_SIM_STEPS = 12  # Max inhaalstappen per render frame (daarna loopt het spel trager i.p.v. vast)
+
+# Speltijd (game_clock.py)
+TIME_SCALE = 1.0  # 0.5 = slow motion, 2.0 = dubbele snelheid
+GAME_CLOCK_START = 10000  # ms; timers met een begintijd van 0 zijn bij de start al verlopen
+GAME_CLOCK_MAX_DT = 100  # Langste frame in ms dat de simulatie in een keer krijgt
+
+# Frame profiler (profiler.py, F3 overlay / F4 trace)
+PROFILER_HISTORY = 120  # Aantal frames in de rollende gemiddelden en de grafiek
+PROFILER_TRACE_SECONDS = 5.0  # Zoveel seconden gaan er mee in een trace dump
+PROFILER_REFRESH_MS = 250  # Overlay tekst niet elke frame opnieuw renderen
+PROFILER_PANEL_WIDTH = 360
+PROFILER_PANEL_X = 10
+PROFILER_PANEL_Y = 160  # Onder de HUD tekst links, boven de minimap
+
+# Instrumentatie (instrument.py), standaard uit
+INSTRUMENT = os.environ.get('DOOMIE_INSTRUMENT', '')  # 'file:PAD' of 'udp://host:port' (statsd)
+INSTRUMENT_FLUSH_MS = 1000  # Interval waarin de waarden worden opgeteld en verstuurd
+INSTRUMENT_PREFIX = 'doomie'  # Voorvoegsel van de statsd namen
+
+# Asset cache (gegenereerde texturen en sprites op schijf bewaren tussen starts)
+ASSET_CACHE_ENABLED = True
+ASSET_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.asset_cache')
+
 # Kleuren
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
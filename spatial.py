@@ -0,0 +1,153 @@
+"""
+Spatial hash - Uniform grid index voor entities in de wereld
+Vijanden, drops, pickups en bots worden per tile bijgehouden,
+zodat afstand- en schietlijn queries alleen naburige cellen bekijken in
+plaats van elke lijst helemaal door te lopen.
+"""
+import math
+from settings import *
+
+
+class SpatialHash:
+    """
+    Grid met cellen van cell_size tiles: (soort, cel x, cel y) -> entities
+    Een entity is elk object met .x en .y; de soort ('enemy', 'drop', ...)
+    wordt bij insert opgegeven.
+    """
+
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (soort, cx, cy) -> dict van entities (dict houdt invoegvolgorde vast)
+        self.entity_cells = {}  # entity -> (soort, cx, cy)
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, entity, kind):
+        """Voeg een entity toe onder een soort"""
+        if entity in self.entity_cells:
+            self.remove(entity)
+        key = (kind,) + self._cell(entity.x, entity.y)
+        self.cells.setdefault(key, {})[entity] = None
+        self.entity_cells[entity] = key
+
+    def move(self, entity):
+        """Werk de cel van een entity bij na beweging (niets te doen binnen dezelfde cel)"""
+        old_key = self.entity_cells.get(entity)
+        if old_key is None:
+            return
+        cx, cy = self._cell(entity.x, entity.y)
+        if old_key[1] == cx and old_key[2] == cy:
+            return
+
+        self._discard(old_key, entity)
+        new_key = (old_key[0], cx, cy)
+        self.cells.setdefault(new_key, {})[entity] = None
+        self.entity_cells[entity] = new_key
+
+    def remove(self, entity):
+        """Haal een entity uit de index (geen fout als hij er niet in zit)"""
+        key = self.entity_cells.pop(entity, None)
+        if key is not None:
+            self._discard(key, entity)
+
+    def _discard(self, key, entity):
+        bucket = self.cells.get(key)
+        if bucket is not None:
+            bucket.pop(entity, None)
+            if not bucket:
+                del self.cells[key]
+
+    def __contains__(self, entity):
+        return entity in self.entity_cells
+
+    def count(self, kind=None):
+        """Aantal entities in de index (van een soort of totaal)"""
+        if kind is None:
+            return len(self.entity_cells)
+        return sum(len(bucket) for key, bucket in self.cells.items() if key[0] == kind)
+
+    def query_radius(self, kind, x, y, radius):
+        """Entities van een soort binnen radius van (x, y), dichtstbijzijnde eerst"""
+        min_cx, min_cy = self._cell(x - radius, y - radius)
+        max_cx, max_cy = self._cell(x + radius, y + radius)
+        radius_sq = radius * radius
+
+        found = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = self.cells.get((kind, cx, cy))
+                if not bucket:
+                    continue
+                for entity in bucket:
+                    dx = entity.x - x
+                    dy = entity.y - y
+                    dist_sq = dx*dx + dy*dy
+                    if dist_sq <= radius_sq:
+                        found.append((dist_sq, entity))
+
+        found.sort(key=lambda item: item[0])
+        return [entity for _, entity in found]
+
+    def query_ray(self, kind, x, y, angle, max_distance, width=0.5):
+        """
+        Entities van een soort die binnen width van een straal liggen
+        (vanaf (x, y) in richting angle, tot max_distance), dichtstbijzijnde eerst
+        """
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+        pad = int(math.ceil(width / self.cell_size))
+
+        found = []
+        seen = set()
+        for cx, cy in self._ray_cells(x, y, cos_a, sin_a, max_distance + width):
+            for ncx in range(cx - pad, cx + pad + 1):
+                for ncy in range(cy - pad, cy + pad + 1):
+                    if (ncx, ncy) in seen:
+                        continue
+                    seen.add((ncx, ncy))
+                    bucket = self.cells.get((kind, ncx, ncy))
+                    if not bucket:
+                        continue
+                    for entity in bucket:
+                        dx = entity.x - x
+                        dy = entity.y - y
+                        along = dx * cos_a + dy * sin_a
+                        across = abs(dy * cos_a - dx * sin_a)
+                        if along >= 0 and across <= width and along <= max_distance + width:
+                            found.append((dx*dx + dy*dy, entity))
+
+        found.sort(key=lambda item: item[0])
+        return [entity for _, entity in found]
+
+    def _ray_cells(self, x, y, cos_a, sin_a, max_distance):
+        """Cellen die een straal doorkruist (grid DDA), in volgorde"""
+        size = self.cell_size
+        cx, cy = self._cell(x, y)
+        step_x = 1 if cos_a > 0 else -1
+        step_y = 1 if sin_a > 0 else -1
+
+        if cos_a != 0:
+            next_x = (cx + (1 if step_x > 0 else 0)) * size
+            t_max_x = (next_x - x) / cos_a
+            t_delta_x = size / abs(cos_a)
+        else:
+            t_max_x = t_delta_x = float('inf')
+        if sin_a != 0:
+            next_y = (cy + (1 if step_y > 0 else 0)) * size
+            t_max_y = (next_y - y) / sin_a
+            t_delta_y = size / abs(sin_a)
+        else:
+            t_max_y = t_delta_y = float('inf')
+
+        t = 0.0
+        while t <= max_distance:
+            yield cx, cy
+            if t_max_x < t_max_y:
+                t = t_max_x
+                t_max_x += t_delta_x
+                cx += step_x
+            else:
+                t = t_max_y
+                t_max_y += t_delta_y
+                cy += step_y
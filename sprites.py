@@ -4,7 +4,10 @@ Met mensachtige vijanden en loopanimaties
 """
 import pygame
 import math
+import numpy as np
 from settings import *
+from asset_cache import cached_surface
+from profiler import count
 
 
 # Kleur schemes voor verschillende vijand types
@@ -582,6 +585,165 @@ def create_friendly_bot_used_sprite(size=64):
     return create_friendly_bot_sprite(size=size, active=False)
 
 
+def create_enemy_bullet_sprite(color):
+    """Maak kogel sprite"""
+    size = 16
+    sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+    cx, cy = size // 2, size // 2
+    
+    # Glow
+    pygame.draw.circle(sprite, (*color[:3], 80), (cx, cy), 6)
+    # Core
+    pygame.draw.circle(sprite, color, (cx, cy), 4)
+    pygame.draw.circle(sprite, (255, 255, 255), (cx, cy), 2)
+    
+    return sprite
+
+
+def create_fireball_sprite(glow_step=0):
+    """Maak grote vuurbal sprite met pulserende glow (glow_step van 0 tot FIREBALL_GLOW_STEPS - 1)"""
+    size = 64
+    sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+    cx, cy = size // 2, size // 2
+    
+    # Buitenste glow: alpha 50-110 afhankelijk van de puls
+    glow_pulse = glow_step / (FIREBALL_GLOW_STEPS - 1)
+    pygame.draw.circle(sprite, (255, 100, 0, int(50 + glow_pulse * 60)), (cx, cy), 28)
+    
+    core = pygame.Surface((size, size), pygame.SRCALPHA)
+    for r in range(6, 0, -1):
+        alpha = 80 - r * 10
+        pygame.draw.circle(core, (255, 80, 0, alpha), (cx, cy), 20 + r * 4)
+    
+    pygame.draw.circle(core, (255, 150, 30), (cx, cy), 18)
+    pygame.draw.circle(core, (255, 200, 50), (cx, cy), 14)
+    pygame.draw.circle(core, (255, 255, 100), (cx, cy), 10)
+    pygame.draw.circle(core, (255, 255, 200), (cx, cy), 6)
+    pygame.draw.circle(core, (255, 255, 255), (cx, cy), 3)
+    sprite.blit(core, (0, 0))
+    
+    return sprite
+
+
+def create_drop_sprite(drop_type, color, alpha=255):
+    """Maak drop sprite (alpha < 255 voor de knipperende versie)"""
+    size = 24
+    sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+    cx, cy = size // 2, size // 2
+    
+    if drop_type == 'health':
+        # Groen kruis
+        pygame.draw.rect(sprite, color, (cx - 2, cy - 8, 4, 16))
+        pygame.draw.rect(sprite, color, (cx - 8, cy - 2, 16, 4))
+        pygame.draw.rect(sprite, (100, 255, 100), (cx - 1, cy - 7, 2, 14))
+    elif drop_type == 'ammo':
+        # Gele kogels
+        pygame.draw.ellipse(sprite, color, (cx - 6, cy - 8, 5, 16))
+        pygame.draw.ellipse(sprite, color, (cx + 1, cy - 8, 5, 16))
+        pygame.draw.ellipse(sprite, (255, 255, 150), (cx - 5, cy - 7, 3, 10))
+    elif drop_type == 'health_pack':
+        # Rode doos met kruis
+        pygame.draw.rect(sprite, (200, 50, 50), (cx - 8, cy - 6, 16, 12))
+        pygame.draw.rect(sprite, (255, 255, 255), (cx - 2, cy - 4, 4, 8))
+        pygame.draw.rect(sprite, (255, 255, 255), (cx - 6, cy - 1, 12, 2))
+        
+    # Glow effect
+    glow = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(glow, (*color, 50), (cx, cy), 10)
+    sprite.blit(glow, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+    
+    if alpha < 255:
+        sprite.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+    
+    return sprite
+
+
+# Gedeelde sprite frames: (kleurschema, grootte, frame) -> Surface
+# Elke frame wordt een keer per proces gerasterd en gedeeld door alle instanties en levels
+_sprite_registry = {}
+
+# Volgorde van de walk animatie (idle, walk 1, idle, walk 2)
+WALK_CYCLE = (0, 1, 0, 2)
+
+
+def _shared_sprite(key, builder, *args):
+    """Haal een sprite uit de registry, bouw hem bij het eerste gebruik"""
+    sprite = _sprite_registry.get(key)
+    if sprite is None:
+        sprite = cached_surface(builder, *args)
+        # Zelfde pixel formaat als het scherm blit sneller (kan pas na set_mode)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+        _sprite_registry[key] = sprite
+    return sprite
+
+
+def get_enemy_walk_frames(color_scheme='red', size=64):
+    """
+    Gedeelde walk frames voor een vijand
+    De surfaces worden gedeeld: niet aanpassen, eerst .copy() gebruiken
+    """
+    return [_shared_sprite((color_scheme, size, frame), create_humanoid_sprite, color_scheme, size, frame)
+            for frame in WALK_CYCLE]
+
+
+def get_hurt_enemy_sprite(size=64):
+    """Gedeelde hurt flash sprite (zelfde voor alle kleuren)"""
+    return _shared_sprite((None, size, 'hurt'), create_hurt_enemy_sprite, size)
+
+
+def get_dead_enemy_sprite(color_scheme='red'):
+    """Gedeelde dode vijand sprite"""
+    return _shared_sprite((color_scheme, 64, 'dead'), create_dead_enemy_sprite, color_scheme)
+
+
+def get_boss_walk_frames():
+    """Gedeelde walk frames voor de boss"""
+    return [_shared_sprite(('boss', 128, frame), create_boss_sprite, frame) for frame in WALK_CYCLE]
+
+
+def get_dead_boss_sprite():
+    """Gedeelde dode boss sprite"""
+    return _shared_sprite(('boss', 128, 'dead'), create_dead_boss_sprite)
+
+
+def get_enemy_bullet_sprite(color):
+    """Gedeelde kogel sprite per kleur"""
+    return _shared_sprite(('bullet', 16, tuple(color)), create_enemy_bullet_sprite, tuple(color))
+
+
+def get_fireball_frames():
+    """Gedeelde vuurbal frames, een per glow stap"""
+    return [_shared_sprite(('fireball', 64, step), create_fireball_sprite, step)
+            for step in range(FIREBALL_GLOW_STEPS)]
+
+
+def get_drop_sprite(drop_type, color, faded=False):
+    """Gedeelde drop sprite (faded = halve alpha voor het knipperen voor het verdwijnen)"""
+    alpha = 128 if faded else 255
+    return _shared_sprite((drop_type, 24, alpha), create_drop_sprite, drop_type, tuple(color), alpha)
+
+
+# Gedeelde fonts: grootte -> Font (een Font maken laadt en parset het font bestand)
+_font_registry = {}
+
+
+def get_font(size):
+    """Gedeeld standaard font in een grootte"""
+    font = _font_registry.get(size)
+    if font is None:
+        font = pygame.font.Font(None, size)
+        _font_registry[size] = font
+    return font
+
+
+# Fog kleur per fog stap voor BLEND_RGBA_MULT (voorberekend i.p.v. per kolom)
+SPRITE_FOG_COLORS = [
+    (int(255 * (1 - fog_bucket / FOG_LEVELS * 0.6)),) * 3 + (255,)
+    for fog_bucket in range(FOG_LEVELS + 1)
+]
+
+
 class SpriteRenderer:
     """Rendert sprites in de 3D wereld"""
     
@@ -651,15 +813,18 @@ class SpriteRenderer:
         delta_angle = sprite_data['delta_angle']
         surface = sprite_data['surface']
         scale = sprite_data['scale']
-        pitch = sprite_data.get('pitch', 0)
         y_offset = sprite_data.get('y_offset', 0.0)
         
-        screen_x = HALF_WIDTH + delta_angle * HALF_WIDTH / HALF_FOV
+        # Afmetingen van de interne render resolutie (zie RayCaster.view)
+        view = raycaster.view
+        pitch = sprite_data.get('pitch', 0) * view.pitch_scale
         
-        sprite_height = (SCREEN_DIST / distance) * scale
+        screen_x = view.half_width + delta_angle * view.half_width / HALF_FOV
+        
+        sprite_height = (view.screen_dist / distance) * scale
         sprite_width = sprite_height * (surface.get_width() / surface.get_height())
         
-        max_size = HEIGHT * 1.5
+        max_size = view.height * 1.5
         if sprite_height > max_size:
             sprite_height = max_size
             sprite_width = sprite_height * (surface.get_width() / surface.get_height())
@@ -670,34 +835,34 @@ class SpriteRenderer:
             except:
                 return
             
+            # Distance fog een keer voor de hele sprite (scaled is altijd een nieuwe surface)
+            # BLEND_RGBA_MULT met alpha 255 laat transparante pixels ongemoeid
+            fog_factor = min(1, distance / MAX_DEPTH)
+            if fog_factor > 0.1:
+                scaled.fill(SPRITE_FOG_COLORS[int(fog_factor * FOG_LEVELS)], special_flags=pygame.BLEND_RGBA_MULT)
+            
             # y_offset wordt geschaald op basis van afstand voor perspectief
-            screen_y_offset = (y_offset * SCREEN_DIST / distance)
+            screen_y_offset = (y_offset * view.screen_dist / distance)
             
             x = screen_x - sprite_width / 2
-            y = HALF_HEIGHT + pitch - sprite_height / 2 + screen_y_offset
+            y = view.half_height + pitch - sprite_height / 2 + screen_y_offset
             
             sprite_left = int(max(0, x))
-            sprite_right = int(min(WIDTH, x + sprite_width))
+            sprite_right = int(min(view.width, x + sprite_width))
+            if sprite_left >= sprite_right:
+                return
+            
+            # Kolommen waar de sprite voor de muur staat (z-buffer van de raycaster),
+            # als aaneengesloten stukken: een area blit per stuk i.p.v. per kolom
+            visible = raycaster.depth_buffer[sprite_left:sprite_right] > distance
+            edges = np.flatnonzero(np.diff(visible, prepend=False, append=False))
+            spans = edges.tolist()
+            
+            height = int(sprite_height)
+            for start, end in zip(spans[::2], spans[1::2]):
+                col = sprite_left + start
+                screen.blit(scaled, (col, y), (int(col - x), 0, end - start, height))
             
-            for col in range(sprite_left, sprite_right):
-                ray_idx = int((col / WIDTH) * NUM_RAYS)
-                if 0 <= ray_idx < len(raycaster.ray_results):
-                    wall_depth = raycaster.ray_results[ray_idx]['depth']
-                    if distance < wall_depth:
-                        src_x = int((col - x) / sprite_width * surface.get_width())
-                        src_x = max(0, min(surface.get_width() - 1, src_x))
-                        
-                        col_surface = scaled.subsurface((int(col - x), 0, 1, int(sprite_height)))
-                        
-                        fog_factor = min(1, distance / MAX_DEPTH)
-                        if fog_factor > 0.1:
-                            # Maak een kopie om de originele sprite niet aan te passen
-                            col_surface = col_surface.copy()
-                            # Pas fog alleen toe op niet-transparante pixels
-                            # door BLEND_RGBA_MULT te gebruiken
-                            fog_surf = pygame.Surface((1, int(sprite_height)), pygame.SRCALPHA)
-                            darkness = int(255 * (1 - fog_factor * 0.6))
-                            fog_surf.fill((darkness, darkness, darkness, 255))
-                            col_surface.blit(fog_surf, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-                        
-                        screen.blit(col_surface, (col, y))
+            count('sprites')
+            count('columns', len(spans) // 2)
+            count('surfaces')  # De geschaalde sprite
@@ -2,12 +2,42 @@
 Textuur systeem - Genereert procedurele texturen voor muren en deuren
 """
 import pygame
+import threading
+import numpy as np
+from collections import OrderedDict
 from settings import *
+from asset_cache import cached_surface
+from profiler import count
 
 # Textuur grootte
 TEXTURE_SIZE = 256
 HALF_TEXTURE_SIZE = TEXTURE_SIZE // 2
 
+# Texturen die in de 3D view gerenderd worden (muur types + deur)
+WALL_TEXTURE_IDS = (1, 2, 3, 4, 5, 6, 'door')
+
+
+def create_shade_lut():
+    """
+    Maak een lookup table voor schaduw en fog: lut[darken, fog_bucket, waarde]
+    Zelfde resultaat als BLEND_RGB_SUB (50, 50, 50) gevolgd door een zwarte
+    fog laag met alpha fog_bucket / FOG_LEVELS * 180
+    """
+    values = np.arange(256, dtype=np.int32)
+    lut = np.empty((2, FOG_LEVELS + 1, 256), dtype=np.uint8)
+    
+    for darken in (0, 1):
+        base = np.maximum(0, values - 50) if darken else values
+        for fog_bucket in range(FOG_LEVELS + 1):
+            alpha = int(fog_bucket / FOG_LEVELS * 180)
+            lut[darken, fog_bucket] = base * (255 - alpha) // 255
+            
+    return lut
+
+
+# Gedeelde lookup table, per kleurkanaal toepasbaar
+SHADE_LUT = create_shade_lut()
+
 
 def create_brick_texture(base_color, mortar_color=(60, 50, 45)):
     """Maak een baksteen textuur"""
@@ -63,21 +93,21 @@ def create_stone_texture(base_color):
     texture.fill(base_color)
     
     import random
-    random.seed(42)  # Consistente textuur
+    rng = random.Random(42)  # Consistente textuur (eigen generator, veilig in een worker thread)
     
     # Voeg variatie toe
     for _ in range(500):
-        x = random.randint(0, TEXTURE_SIZE - 1)
-        y = random.randint(0, TEXTURE_SIZE - 1)
-        size = random.randint(2, 8)
-        variation = random.randint(-40, 40)
+        x = rng.randint(0, TEXTURE_SIZE - 1)
+        y = rng.randint(0, TEXTURE_SIZE - 1)
+        size = rng.randint(2, 8)
+        variation = rng.randint(-40, 40)
         color = tuple(max(0, min(255, c + variation)) for c in base_color)
         pygame.draw.circle(texture, color, (x, y), size)
     
     # Voeg scheuren toe
     for _ in range(10):
-        start = (random.randint(0, TEXTURE_SIZE), random.randint(0, TEXTURE_SIZE))
-        end = (start[0] + random.randint(-50, 50), start[1] + random.randint(-50, 50))
+        start = (rng.randint(0, TEXTURE_SIZE), rng.randint(0, TEXTURE_SIZE))
+        end = (start[0] + rng.randint(-50, 50), start[1] + rng.randint(-50, 50))
         dark = tuple(max(0, c - 50) for c in base_color)
         pygame.draw.line(texture, dark, start, end, 2)
     
@@ -210,7 +240,7 @@ def create_lava_texture():
     texture = pygame.Surface((TEXTURE_SIZE, TEXTURE_SIZE))
     
     import random
-    random.seed(666)  # Devil's seed
+    rng = random.Random(666)  # Devil's seed (eigen generator, veilig in een worker thread)
     
     # Base lava color
     base_color = (180, 60, 20)
@@ -218,29 +248,29 @@ def create_lava_texture():
     
     # Lava stromen
     for _ in range(150):
-        x = random.randint(0, TEXTURE_SIZE - 1)
-        y = random.randint(0, TEXTURE_SIZE - 1)
-        size = random.randint(10, 40)
+        x = rng.randint(0, TEXTURE_SIZE - 1)
+        y = rng.randint(0, TEXTURE_SIZE - 1)
+        size = rng.randint(10, 40)
         
         # Bright hot spots
-        bright = random.randint(200, 255)
+        bright = rng.randint(200, 255)
         hot_color = (bright, bright // 2, 0)
         pygame.draw.circle(texture, hot_color, (x, y), size)
     
     # Donkere korstjes
     for _ in range(80):
-        x = random.randint(0, TEXTURE_SIZE - 1)
-        y = random.randint(0, TEXTURE_SIZE - 1)
-        size = random.randint(5, 20)
+        x = rng.randint(0, TEXTURE_SIZE - 1)
+        y = rng.randint(0, TEXTURE_SIZE - 1)
+        size = rng.randint(5, 20)
         dark_color = (60, 20, 10)
         pygame.draw.circle(texture, dark_color, (x, y), size)
     
     # Gloeiende aderen
     for _ in range(20):
-        start = (random.randint(0, TEXTURE_SIZE), random.randint(0, TEXTURE_SIZE))
-        end = (start[0] + random.randint(-80, 80), start[1] + random.randint(-80, 80))
-        glow = (255, random.randint(150, 200), random.randint(0, 50))
-        pygame.draw.line(texture, glow, start, end, random.randint(2, 6))
+        start = (rng.randint(0, TEXTURE_SIZE), rng.randint(0, TEXTURE_SIZE))
+        end = (start[0] + rng.randint(-80, 80), start[1] + rng.randint(-80, 80))
+        glow = (255, rng.randint(150, 200), rng.randint(0, 50))
+        pygame.draw.line(texture, glow, start, end, rng.randint(2, 6))
     
     return texture
 
@@ -258,7 +288,7 @@ def create_hell_brick_texture():
     mortar_size = 4
     
     import random
-    random.seed(999)
+    rng = random.Random(999)  # Eigen generator, veilig in een worker thread
     
     for row in range(TEXTURE_SIZE // brick_height):
         offset = (brick_width // 2) if row % 2 else 0
@@ -268,9 +298,9 @@ def create_hell_brick_texture():
             x = col * brick_width + offset
             
             # Donkere rode bakstenen met variatie
-            base_r = random.randint(60, 100)
-            base_g = random.randint(15, 30)
-            base_b = random.randint(10, 25)
+            base_r = rng.randint(60, 100)
+            base_g = rng.randint(15, 30)
+            base_b = rng.randint(10, 25)
             color = (base_r, base_g, base_b)
             
             brick_rect = pygame.Rect(
@@ -282,13 +312,13 @@ def create_hell_brick_texture():
             pygame.draw.rect(texture, color, brick_rect)
             
             # Gloeiende scheuren
-            if random.random() < 0.3:
-                glow = (255, random.randint(80, 150), 0)
-                crack_x = brick_rect.x + random.randint(5, brick_width - 10)
-                crack_y = brick_rect.y + random.randint(2, brick_height - 5)
+            if rng.random() < 0.3:
+                glow = (255, rng.randint(80, 150), 0)
+                crack_x = brick_rect.x + rng.randint(5, brick_width - 10)
+                crack_y = brick_rect.y + rng.randint(2, brick_height - 5)
                 pygame.draw.line(texture, glow, 
                                (crack_x, crack_y),
-                               (crack_x + random.randint(-15, 15), crack_y + random.randint(-10, 10)), 2)
+                               (crack_x + rng.randint(-15, 15), crack_y + rng.randint(-10, 10)), 2)
     
     return texture
 
@@ -355,7 +385,7 @@ def create_rusty_pipe_texture():
     texture = pygame.Surface((TEXTURE_SIZE, TEXTURE_SIZE))
     
     import random
-    random.seed(777)
+    rng = random.Random(777)  # Eigen generator, veilig in een worker thread
     
     # Basis roestig metaal
     base_color = (100, 70, 50)
@@ -379,10 +409,10 @@ def create_rusty_pipe_texture():
     
     # Roest vlekken
     for _ in range(30):
-        x = pipe_x + random.randint(10, pipe_width - 20)
-        y = random.randint(0, TEXTURE_SIZE)
-        size = random.randint(3, 12)
-        rust = (random.randint(100, 140), random.randint(50, 70), random.randint(20, 40))
+        x = pipe_x + rng.randint(10, pipe_width - 20)
+        y = rng.randint(0, TEXTURE_SIZE)
+        size = rng.randint(3, 12)
+        rust = (rng.randint(100, 140), rng.randint(50, 70), rng.randint(20, 40))
         pygame.draw.circle(texture, rust, (x, y), size)
     
     # Pijp ringen
@@ -405,11 +435,11 @@ def create_tapestry_texture():
     
     # Stof textuur effect
     import random
-    random.seed(123)
+    rng = random.Random(123)  # Eigen generator, veilig in een worker thread
     for _ in range(800):
-        x = random.randint(0, TEXTURE_SIZE - 1)
-        y = random.randint(0, TEXTURE_SIZE - 1)
-        variation = random.randint(-15, 15)
+        x = rng.randint(0, TEXTURE_SIZE - 1)
+        y = rng.randint(0, TEXTURE_SIZE - 1)
+        variation = rng.randint(-15, 15)
         color = tuple(max(0, min(255, c + variation)) for c in base_color)
         texture.set_at((x, y), color)
     
@@ -546,79 +576,144 @@ class TextureManager:
     def __init__(self, theme='dungeon'):
         self.textures = {}
         self.theme = theme
-        self.all_themes = {}
-        self.load_all_themes()
+        self.all_themes = {}  # Thema's die nu in het geheugen zitten
+        
+        # Achtergrond prefetch van het volgende thema
+        self.prefetch_threads = {}
+        self.prefetched_themes = {}
+        self.prefetch_lock = threading.Lock()
+        
+        # LRU cache met geschaalde textuur kolommen
+        self.column_cache = OrderedDict()
+        self.column_cache_bytes = 0
+        self.column_cache_max_bytes = TEXTURE_CACHE_MAX_BYTES
+        self.column_cache_max_entries = TEXTURE_CACHE_MAX_ENTRIES
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Voorberekende donkere/fog varianten van de thema texturen
+        self.shaded_textures = {}
+        
         self.set_theme(theme)
         
     def load_all_themes(self):
-        """Laad texturen voor alle thema's"""
-        # ===========================================
-        # DUNGEON THEME - Klassieke kerker
-        # ===========================================
-        dungeon = {}
-        brick_texture = create_brick_texture((150, 50, 50))
-        dungeon[1] = brick_texture
-        dungeon[2] = create_tapestry_texture()
-        dungeon[3] = create_torch_wall_texture()
-        dungeon[4] = create_stone_texture((70, 65, 60))
-        dungeon[5] = create_metal_texture((80, 85, 90))
-        dungeon[6] = create_stone_texture((50, 50, 60))  # Placeholder
-        dungeon['door'] = create_door_texture()
-        dungeon['door_side'] = brick_texture
-        dungeon['floor_color'] = (40, 35, 30)
-        dungeon['ceiling_color'] = (30, 25, 25)
-        self.all_themes['dungeon'] = dungeon
-        
-        # ===========================================
-        # INDUSTRIAL THEME - Verlaten fabriek
-        # ===========================================
-        industrial = {}
-        metal_base = create_industrial_wall_texture()
-        industrial[1] = metal_base
-        industrial[2] = create_rusty_pipe_texture()
-        industrial[3] = create_metal_texture((70, 75, 80))
-        industrial[4] = create_industrial_wall_texture()
-        industrial[5] = create_metal_texture((90, 95, 100))
-        industrial[6] = create_stone_texture((60, 60, 65))
-        industrial['door'] = create_metal_door_texture()
-        industrial['door_side'] = metal_base
-        industrial['floor_color'] = (45, 45, 50)
-        industrial['ceiling_color'] = (35, 35, 40)
-        self.all_themes['industrial'] = industrial
+        """Laad texturen voor alle thema's (normaal gebeurt dit per thema, bij set_theme)"""
+        for theme_name in THEME_BUILDERS:
+            self._load_theme(theme_name)
+            
+    def _load_theme(self, theme_name):
+        """Zorg dat een thema geladen is; gebruikt een klaar prefetch resultaat als dat er is"""
+        if theme_name in self.all_themes:
+            return self.all_themes[theme_name]
+            
+        worker = self.prefetch_threads.pop(theme_name, None)
+        if worker:
+            # Prefetch is nog bezig: afwachten in plaats van dubbel bouwen
+            worker.join()
+            
+        with self.prefetch_lock:
+            theme = self.prefetched_themes.pop(theme_name, None)
+        if theme is None:
+            theme = THEME_BUILDERS[theme_name]()
+            
+        # Converteer texturen voor snellere rendering (alleen op de main thread)
+        for key, value in theme.items():
+            if isinstance(value, pygame.Surface):
+                theme[key] = value.convert()
+                
+        self.all_themes[theme_name] = theme
+        return theme
         
-        # ===========================================
-        # HELL THEME - Vulkanische onderwereld
-        # ===========================================
-        hell = {}
-        hell_brick = create_hell_brick_texture()
-        hell[1] = hell_brick
-        hell[2] = create_hell_brick_texture()
-        hell[3] = create_torch_wall_texture()  # Re-use torch
-        hell[4] = create_hell_brick_texture()
-        hell[5] = create_stone_texture((50, 30, 30))
-        hell[6] = create_lava_texture()  # LAVA!
-        hell['door'] = create_hell_door_texture()
-        hell['door_side'] = hell_brick
-        hell['floor_color'] = (50, 25, 20)
-        hell['ceiling_color'] = (40, 15, 15)
-        self.all_themes['hell'] = hell
+    def prefetch_theme(self, theme_name):
+        """Genereer een thema alvast in een worker thread (bijv. voor het volgende level)"""
+        if theme_name not in THEME_BUILDERS or theme_name in self.all_themes:
+            return
+        if theme_name in self.prefetch_threads:
+            return
+            
+        # Een oude prefetch die niet meer nodig is hoeft niet in het geheugen te blijven
+        with self.prefetch_lock:
+            for other in list(self.prefetched_themes):
+                if other != theme_name:
+                    del self.prefetched_themes[other]
+                    self.prefetch_threads.pop(other, None)
+                    
+        worker = threading.Thread(target=self._prefetch_worker, args=(theme_name,), daemon=True)
+        self.prefetch_threads[theme_name] = worker
+        worker.start()
         
-        # Converteer alle texturen voor snellere rendering
-        for theme_name in self.all_themes:
-            for key in self.all_themes[theme_name]:
-                if isinstance(self.all_themes[theme_name][key], pygame.Surface):
-                    self.all_themes[theme_name][key] = self.all_themes[theme_name][key].convert()
-    
+    def _prefetch_worker(self, theme_name):
+        """Bouw een thema buiten de main thread (convert gebeurt later in _load_theme)"""
+        try:
+            theme = THEME_BUILDERS[theme_name]()
+        except Exception as e:
+            print(f"Prefetch van thema {theme_name} mislukt: {e}")
+            return
+        with self.prefetch_lock:
+            self.prefetched_themes[theme_name] = theme
+            
+    def _evict_themes(self):
+        """Houd alleen het actieve thema en prefetches in het geheugen"""
+        for theme_name in list(self.all_themes):
+            if theme_name != self.theme:
+                del self.all_themes[theme_name]
+                
     def set_theme(self, theme):
-        """Wissel naar een ander thema"""
-        if theme in self.all_themes:
+        """Wissel naar een ander thema (wordt geladen als het nog niet in het geheugen zit)"""
+        if theme in THEME_BUILDERS:
             self.theme = theme
-            self.textures = self.all_themes[theme]
             print(f"Texture theme set to: {theme}")
         else:
             print(f"Unknown theme: {theme}, using dungeon")
             self.theme = 'dungeon'
-            self.textures = self.all_themes['dungeon']
+            
+        self.textures = self._load_theme(self.theme)
+        self._evict_themes()
+        self._build_shaded_textures()
+        
+    def _build_shaded_textures(self):
+        """
+        Bereken bij het laden van een thema alle schaduw/fog varianten van de
+        muur texturen, zodat renderen alleen nog een kant-en-klare kolom kiest
+        """
+        self.shaded_textures = {}
+        self.clear_column_cache()
+        
+        # Atlas met alle muur texturen in surfarray volgorde: [textuur, x, y, rgb]
+        atlas = np.stack([
+            pygame.surfarray.array3d(self.get_texture(texture_id))
+            for texture_id in WALL_TEXTURE_IDS
+        ])
+        
+        # shaded_atlas[darken, fog_bucket] = atlas door de lookup table
+        self.shaded_atlas = np.empty((2, FOG_LEVELS + 1) + atlas.shape, dtype=np.uint8)
+        for darken in (0, 1):
+            for fog_bucket in range(FOG_LEVELS + 1):
+                np.take(SHADE_LUT[darken, fog_bucket], atlas, out=self.shaded_atlas[darken, fog_bucket])
+                
+        # Map waarde -> atlas index (onbekende types vallen terug op textuur 1, net als get_texture)
+        self.atlas_lookup = np.zeros(256, dtype=np.int32)
+        for index, texture_id in enumerate(WALL_TEXTURE_IDS):
+            if texture_id == 'door':
+                self.atlas_door_index = index
+            else:
+                self.atlas_lookup[texture_id] = index
+        self.atlas_lookup[[v for v in range(256) if v not in WALL_TEXTURE_IDS]] = WALL_TEXTURE_IDS.index(1)
+                    
+    def get_shaded_texture(self, texture_id, darken=False, fog_bucket=0):
+        """Haal een voorberekende schaduw/fog variant van een textuur op"""
+        if texture_id not in WALL_TEXTURE_IDS:
+            texture_id = 1
+            
+        key = (texture_id, darken, fog_bucket)
+        shaded = self.shaded_textures.get(key)
+        if shaded is None:
+            # Surface pas maken als de blit renderer hem nodig heeft
+            shaded = self.get_texture(texture_id).copy()
+            atlas_index = WALL_TEXTURE_IDS.index(texture_id)
+            pygame.surfarray.blit_array(shaded, self.shaded_atlas[int(darken), fog_bucket, atlas_index])
+            self.shaded_textures[key] = shaded
+        return shaded
             
     def get_floor_color(self):
         """Haal vloerkleur op voor huidige thema"""
@@ -632,34 +727,78 @@ class TextureManager:
         """Haal een textuur op"""
         return self.textures.get(texture_id, self.textures[1])
     
-    def get_texture_column(self, texture_id, offset, height, darken=False):
+    def get_texture_column(self, texture_id, offset, height, darken=False, fog=0.0, width=SCALE):
         """
         Haal een verticale kolom uit een textuur en schaal deze
         offset: 0.0 - 1.0 positie in de textuur
         height: gewenste hoogte van de kolom
         darken: maak de kolom donkerder (voor schaduw effect)
-        """
-        texture = self.get_texture(texture_id)
+        fog: 0.0 - 1.0 distance fog factor
+        width: breedte van de kolom in pixels
         
+        Resultaten worden in een LRU cache bewaard; de teruggegeven surface
+        wordt gedeeld en mag dus niet aangepast worden.
+        """
+        if height <= 0:
+            return None
+            
         # Bereken x positie in textuur
         tex_x = int(offset * TEXTURE_SIZE) % TEXTURE_SIZE
         
+        # Hoogte en fog afronden zodat bijna gelijke kolommen de cache delen
+        step = TEXTURE_CACHE_HEIGHT_STEP
+        scaled_height = max(step, int(height) // step * step)
+        fog_bucket = int(fog * FOG_LEVELS) if fog > 0.1 else 0
+        
+        key = (self.theme, texture_id, tex_x, width, scaled_height, darken, fog_bucket)
+        column = self.column_cache.get(key)
+        if column is not None:
+            self.cache_hits += 1
+            self.column_cache.move_to_end(key)
+            return column
+            
+        self.cache_misses += 1
+        count('surfaces')
+        column = self._build_texture_column(texture_id, tex_x, width, scaled_height, darken, fog_bucket)
+        
+        self.column_cache[key] = column
+        self.column_cache_bytes += column.get_width() * column.get_height() * column.get_bytesize()
+        
+        # Oudste kolommen weggooien als we boven het plafond zitten
+        while len(self.column_cache) > 1 and (self.column_cache_bytes > self.column_cache_max_bytes or
+                                              len(self.column_cache) > self.column_cache_max_entries):
+            _, old_column = self.column_cache.popitem(last=False)
+            self.column_cache_bytes -= old_column.get_width() * old_column.get_height() * old_column.get_bytesize()
+            
+        return column
+        
+    def _build_texture_column(self, texture_id, tex_x, width, height, darken, fog_bucket):
+        """Schaal een kolom uit de voorberekende variant (cache miss)"""
+        texture = self.get_shaded_texture(texture_id, darken, fog_bucket)
+        
         # Haal kolom uit textuur
         column = texture.subsurface((tex_x, 0, 1, TEXTURE_SIZE))
         
         # Schaal naar gewenste hoogte
-        if height > 0:
-            scaled = pygame.transform.scale(column, (SCALE, int(height)))
-            
-            if darken:
-                # Maak donkerder voor schaduw effect
-                dark_surface = pygame.Surface(scaled.get_size())
-                dark_surface.fill((50, 50, 50))
-                scaled.blit(dark_surface, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
-            
-            return scaled
+        return pygame.transform.scale(column, (width, height))
+        
+    def clear_column_cache(self):
+        """Leeg de textuur kolom cache"""
+        self.column_cache.clear()
+        self.column_cache_bytes = 0
         
-        return None
+    def get_cache_stats(self):
+        """Statistieken van de textuur kolom cache"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0,
+            'entries': len(self.column_cache),
+            'bytes': self.column_cache_bytes,
+            'max_bytes': self.column_cache_max_bytes,
+            'max_entries': self.column_cache_max_entries,
+        }
 
 
 def create_metal_door_texture():
@@ -759,3 +898,64 @@ def create_hell_door_texture():
     
     return texture
 
+
+# ===========================================
+# Thema builders (worden pas aangeroepen als een thema nodig is)
+# ===========================================
+
+def build_dungeon_theme():
+    """DUNGEON THEME - Klassieke kerker"""
+    dungeon = {}
+    brick_texture = cached_surface(create_brick_texture, (150, 50, 50))
+    dungeon[1] = brick_texture
+    dungeon[2] = cached_surface(create_tapestry_texture)
+    dungeon[3] = cached_surface(create_torch_wall_texture)
+    dungeon[4] = cached_surface(create_stone_texture, (70, 65, 60))
+    dungeon[5] = cached_surface(create_metal_texture, (80, 85, 90))
+    dungeon[6] = cached_surface(create_stone_texture, (50, 50, 60))  # Placeholder
+    dungeon['door'] = cached_surface(create_door_texture)
+    dungeon['door_side'] = brick_texture
+    dungeon['floor_color'] = (40, 35, 30)
+    dungeon['ceiling_color'] = (30, 25, 25)
+    return dungeon
+
+
+def build_industrial_theme():
+    """INDUSTRIAL THEME - Verlaten fabriek"""
+    industrial = {}
+    metal_base = cached_surface(create_industrial_wall_texture)
+    industrial[1] = metal_base
+    industrial[2] = cached_surface(create_rusty_pipe_texture)
+    industrial[3] = cached_surface(create_metal_texture, (70, 75, 80))
+    industrial[4] = cached_surface(create_industrial_wall_texture)
+    industrial[5] = cached_surface(create_metal_texture, (90, 95, 100))
+    industrial[6] = cached_surface(create_stone_texture, (60, 60, 65))
+    industrial['door'] = cached_surface(create_metal_door_texture)
+    industrial['door_side'] = metal_base
+    industrial['floor_color'] = (45, 45, 50)
+    industrial['ceiling_color'] = (35, 35, 40)
+    return industrial
+
+
+def build_hell_theme():
+    """HELL THEME - Vulkanische onderwereld"""
+    hell = {}
+    hell_brick = cached_surface(create_hell_brick_texture)
+    hell[1] = hell_brick
+    hell[2] = cached_surface(create_hell_brick_texture)
+    hell[3] = cached_surface(create_torch_wall_texture)  # Re-use torch
+    hell[4] = cached_surface(create_hell_brick_texture)
+    hell[5] = cached_surface(create_stone_texture, (50, 30, 30))
+    hell[6] = cached_surface(create_lava_texture)  # LAVA!
+    hell['door'] = cached_surface(create_hell_door_texture)
+    hell['door_side'] = hell_brick
+    hell['floor_color'] = (50, 25, 20)
+    hell['ceiling_color'] = (40, 15, 15)
+    return hell
+
+
+THEME_BUILDERS = {
+    'dungeon': build_dungeon_theme,
+    'industrial': build_industrial_theme,
+    'hell': build_hell_theme,
+}
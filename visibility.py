@@ -0,0 +1,119 @@
+"""
+Zichtlijn service - Exacte grid traversal (Amanatides & Woo)
+Vervangt het bemonsteren van punten langs de lijn: elke tile die de lijn
+raakt wordt precies een keer bekeken. Resultaten voor vijanden worden per
+tick onthouden per (bron tile, doel tile, deur epoch).
+"""
+from settings import *
+from map import get_active_tiles, TILE_BLOCKS_LOS, TILE_DOOR
+from profiler import count
+
+
+def _blocks(tile_x, tile_y, tile_map, door_manager):
+    """Blokkeert deze tile het zicht? Muren altijd, deuren alleen als dat aan staat"""
+    flags = tile_map.flags_at(tile_x, tile_y)
+    if flags & TILE_BLOCKS_LOS:
+        return True
+    if flags & TILE_DOOR and VISIBILITY_DOORS_BLOCK and door_manager:
+        door = door_manager.get_door(tile_x, tile_y)
+        return door is not None and not door.can_pass()
+    return False
+
+
+def line_of_sight(x0, y0, x1, y1, tile_map=None, door_manager=None):
+    """
+    True als er geen blokkerende tile tussen (x0, y0) en (x1, y1) ligt
+    De tiles van begin- en eindpunt tellen niet mee
+    """
+    if tile_map is None:
+        tile_map = get_active_tiles()
+    tile_x, tile_y = int(x0), int(y0)
+    end_x, end_y = int(x1), int(y1)
+    dx = x1 - x0
+    dy = y1 - y0
+
+    step_x = 1 if dx > 0 else -1
+    step_y = 1 if dy > 0 else -1
+
+    # Afstand (in t, 0..1 over de lijn) tot de volgende verticale/horizontale grid lijn
+    if dx != 0:
+        t_max_x = ((tile_x + (1 if dx > 0 else 0)) - x0) / dx
+        t_delta_x = abs(1 / dx)
+    else:
+        t_max_x = t_delta_x = float('inf')
+    if dy != 0:
+        t_max_y = ((tile_y + (1 if dy > 0 else 0)) - y0) / dy
+        t_delta_y = abs(1 / dy)
+    else:
+        t_max_y = t_delta_y = float('inf')
+
+    for _ in range(abs(end_x - tile_x) + abs(end_y - tile_y)):
+        if t_max_x < t_max_y:
+            tile_x += step_x
+            t_max_x += t_delta_x
+        elif t_max_y < t_max_x:
+            tile_y += step_y
+            t_max_y += t_delta_y
+        else:
+            # Precies door een hoekpunt: diagonaal doorstappen
+            tile_x += step_x
+            tile_y += step_y
+            t_max_x += t_delta_x
+            t_max_y += t_delta_y
+
+        if tile_x == end_x and tile_y == end_y:
+            return True
+        if _blocks(tile_x, tile_y, tile_map, door_manager):
+            return False
+
+    return True
+
+
+class Visibility:
+    """Zichtlijn queries met memo per tick (gedeeld door alle vijanden)"""
+
+    def __init__(self, door_manager=None, tile_map=None):
+        self.door_manager = door_manager
+        self.tile_map = tile_map
+        self.memo = {}
+        self.hits = 0
+        self.misses = 0
+
+    def begin_tick(self):
+        """Vergeet de resultaten van de vorige tick"""
+        self.memo.clear()
+
+    def has_line_of_sight(self, x0, y0, x1, y1):
+        """
+        Zichtlijn tussen de tiles van twee punten (van tile midden naar tile midden),
+        onthouden voor de rest van de tick
+        """
+        count('los')
+        source = (int(x0), int(y0))
+        target = (int(x1), int(y1))
+        if source == target:
+            return True
+
+        # Symmetrisch: A -> B is hetzelfde als B -> A
+        if target < source:
+            source, target = target, source
+        epoch = self.door_manager.epoch if self.door_manager else 0
+        key = (source, target, epoch)
+
+        visible = self.memo.get(key)
+        if visible is None:
+            self.misses += 1
+            visible = line_of_sight(source[0] + 0.5, source[1] + 0.5, target[0] + 0.5, target[1] + 0.5,
+                                    self.tile_map, self.door_manager)
+            self.memo[key] = visible
+        else:
+            self.hits += 1
+        return visible
+
+    def visible_from(self, sources, x, y):
+        """Batch: zichtlijn van elke (x, y) bron in sources naar een doel, als lijst bools"""
+        return [self.has_line_of_sight(source_x, source_y, x, y) for source_x, source_y in sources]
+
+    def trace(self, x0, y0, x1, y1):
+        """Exacte zichtlijn tussen twee punten zonder memo (bijv. voor schoten van de speler)"""
+        return line_of_sight(x0, y0, x1, y1, self.tile_map, self.door_manager)
@@ -4,6 +4,7 @@ Wapen Systeem - Meerdere wapens met schieten en animatie
 import pygame
 import math
 from settings import *
+from game_clock import get_ticks
 
 
 def create_pistol_sprite():
@@ -108,15 +109,15 @@ def create_machinegun_fire_sprite():
     pygame.draw.circle(sprite, (255, 220, 100), flash_center, 15)
     pygame.draw.circle(sprite, (255, 255, 200), flash_center, 8)
     
-    # Sparks
+    # Sparks (eigen generator: de globale random van de simulatie niet opnieuw seeden)
     import random
-    random.seed(pygame.time.get_ticks() // 50)
+    rng = random.Random(get_ticks() // 50)
     for _ in range(6):
-        angle = random.uniform(0, 2 * math.pi)
-        dist = random.randint(20, 40)
+        angle = rng.uniform(0, 2 * math.pi)
+        dist = rng.randint(20, 40)
         sx = flash_center[0] + int(math.cos(angle) * dist)
         sy = flash_center[1] + int(math.sin(angle) * dist * 0.5)
-        pygame.draw.circle(sprite, (255, 200, 50), (sx, sy), random.randint(2, 4))
+        pygame.draw.circle(sprite, (255, 200, 50), (sx, sy), rng.randint(2, 4))
     
     return sprite
 
@@ -221,7 +222,7 @@ class Pistol:
         self.bob_speed = 0.012
         
     def update(self, dt, is_moving=False):
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         if self.state == 'firing':
             if current_time - self.animation_start > self.fire_duration:
@@ -237,7 +238,7 @@ class Pistol:
             return False
         if self.state != 'idle':
             return False
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         if current_time - self.last_fire < self.fire_rate:
             return False
         return True
@@ -246,7 +247,7 @@ class Pistol:
         if not self.can_fire():
             return False
         self.ammo -= 1
-        self.last_fire = pygame.time.get_ticks()
+        self.last_fire = get_ticks()
         self.animation_start = self.last_fire
         self.state = 'firing'
         return True
@@ -294,7 +295,7 @@ class MachineGun:
         self.shake_offset = 0
         
     def update(self, dt, is_moving=False):
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         if self.state == 'firing':
             if current_time - self.animation_start > self.fire_duration:
@@ -311,7 +312,7 @@ class MachineGun:
     def can_fire(self):
         if self.ammo <= 0:
             return False
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         if current_time - self.last_fire < self.fire_rate:
             return False
         return True
@@ -320,7 +321,7 @@ class MachineGun:
         if not self.can_fire():
             return False
         self.ammo -= 1
-        self.last_fire = pygame.time.get_ticks()
+        self.last_fire = get_ticks()
         self.animation_start = self.last_fire
         self.state = 'firing'
         # Random shake
@@ -370,7 +371,7 @@ class Shotgun:
         self.bob_speed = 0.01
         
     def update(self, dt, is_moving=False):
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         if self.state == 'firing':
             if current_time - self.animation_start > self.fire_duration:
@@ -390,7 +391,7 @@ class Shotgun:
             return False
         if self.state != 'idle':
             return False
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         if current_time - self.last_fire < self.fire_rate:
             return False
         return True
@@ -399,7 +400,7 @@ class Shotgun:
         if not self.can_fire():
             return False
         self.ammo -= 1
-        self.last_fire = pygame.time.get_ticks()
+        self.last_fire = get_ticks()
         self.animation_start = self.last_fire
         self.state = 'firing'
         return True
@@ -442,14 +443,14 @@ class WeaponManager:
         if 0 <= index < len(self.weapons) and index != self.current_index:
             self.current_index = index
             self.switching = True
-            self.switch_time = pygame.time.get_ticks()
+            self.switch_time = get_ticks()
             
     def next_weapon(self):
         next_idx = (self.current_index + 1) % len(self.weapons)
         self.switch_to(next_idx)
         
     def update(self, dt, is_moving=False):
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         if self.switching:
             if current_time - self.switch_time > self.switch_duration:
@@ -0,0 +1,39 @@
+"""
+World - Alles wat bij de map van een level hoort, op een plek
+Bij het laden van een level wordt een World gemaakt met de TileMap, de
+deuren, de spatial index, de zichtlijn service en het flow field. Game geeft
+deze door aan de speler, raycaster en managers, zodat per-map structuren
+een keer per level gebouwd worden en iedereen dezelfde map gebruikt.
+"""
+from settings import *
+from map import TileMap, set_active_map, get_active_map
+from door import DoorManager
+from spatial import SpatialHash
+from visibility import Visibility
+from pathfinding import FlowField
+
+
+class World:
+    """Per-level context: map, deuren en gedeelde indexen"""
+
+    def __init__(self, grid=None):
+        if grid is None:
+            grid = get_active_map()
+        self.grid = grid
+        self.tile_map = TileMap(grid)
+
+        # Module helpers (is_wall, get_active_tiles) volgen de map van dit level
+        set_active_map(self.tile_map)
+
+        self.door_manager = DoorManager(self.tile_map)
+        self.spatial = SpatialHash()
+        self.visibility = Visibility(self.door_manager, self.tile_map)
+        self.flow_field = FlowField(self.tile_map, self.door_manager)
+
+    @property
+    def width(self):
+        return self.tile_map.width
+
+    @property
+    def height(self):
+        return self.tile_map.height